@@ -1,3 +1,4 @@
 #!/bin/bash
 python -m grpc_tools.protoc --proto_path=. --python_out=. avninv/serde/tests/test_protobson.proto
-python -m grpc_tools.protoc --proto_path=. --python_out=. --grpc_python_out=. avninv/catalog/v1/catalog.proto
\ No newline at end of file
+python -m grpc_tools.protoc --proto_path=. --python_out=. --grpc_python_out=. avninv/catalog/v1/catalog.proto
+python -m grpc_tools.protoc --proto_path=. --python_out=. --grpc_python_out=. avninv/catalog/v1/admin.proto
@@ -2,18 +2,288 @@
 
 
 import argparse
+import asyncio
 import concurrent.futures
+import functools
+import secrets
 import signal
 import os
 
+from bson.objectid import ObjectId
 import grpc
-import pymongo
 import yaml
 
-from avninv.catalog.catalog import CatalogService
+from avninv.catalog.admin import CatalogAdminService
+from avninv.catalog.async_admin import AsyncCatalogAdminService
+from avninv.catalog.async_catalog import AsyncCatalogService
+from avninv.catalog.cache import PartCache, ResultMemo
+from avninv.catalog.database import DatabaseConfig, InvalidDatabaseConfig
+from avninv.catalog.catalog import (
+    CatalogService, DEFAULT_MAX_WATCHERS, DEFAULT_PAGE_SIZE, DEFAULT_SCHEMA_TTL, DEFAULT_STREAM_BATCH_SIZE,
+    MAX_PAGE_SIZE
+)
+from avninv.catalog.indexes import (
+    InvalidIndexSpec, index_models, index_plan, reconcile_in_background, summarize_explain
+)
+from avninv.catalog.interceptors import AsyncRpcInterceptor, RpcInterceptor
+from avninv.catalog.metrics import CatalogMetrics, serve_metrics
+from avninv.catalog.parts_collection import PartCollection
+from avninv.catalog.profiling import DEFAULT_CPU_SECONDS, Profiler, SIGNALS
+from avninv.catalog.supervisor import Supervisor
+from avninv.error.api_error import ApiError
+from avninv.catalog.v1.admin_pb2_grpc import add_CatalogAdminServicer_to_server
 from avninv.catalog.v1.catalog_pb2_grpc import add_CatalogServicer_to_server
 
 
+DEFAULT_SERVER_THREADS = 10
+DEFAULT_ADMIN_HOST = '127.0.0.1'
+ADMIN_THREADS = 2
+
+
+def _database(config):
+    return DatabaseConfig.from_config(config.get('database'))
+
+
+def _server_threads(config):
+    return config['server'].get('threads') or DEFAULT_SERVER_THREADS
+
+
+def _service_options(config):
+    catalog_config = config.get('catalog') or {}
+    cache_config = catalog_config.get('cache') or {}
+
+    return {
+        'page_token_secret': catalog_config.get('page_token_secret'),
+        'max_page_size': catalog_config.get('max_page_size', MAX_PAGE_SIZE),
+        'stream_batch_size': catalog_config.get('stream_batch_size', DEFAULT_STREAM_BATCH_SIZE),
+        'cache': PartCache(**cache_config) if cache_config.get('max_entries') else None,
+        'schema_ttl': catalog_config.get('schema_ttl', DEFAULT_SCHEMA_TTL),
+        'aggregate_memo': ResultMemo(catalog_config['aggregate_ttl']) if catalog_config.get('aggregate_ttl') else None,
+        'max_watchers': catalog_config.get('max_watchers')
+    }
+
+
+def _with_page_token_secret(config):
+    # Workers sharing the addresses serve pages of each other's listings, so they must sign tokens with the same
+    # secret: without one configured, it is drawn once before forking them
+    catalog_config = dict(config.get('catalog') or {})
+    if not catalog_config.get('page_token_secret'):
+        catalog_config['page_token_secret'] = secrets.token_urlsafe(32)
+    return {**config, 'catalog': catalog_config}
+
+
+def _index_models(config):
+    return index_models((config.get('catalog') or {}).get('indexes'))
+
+
+def _metrics(config, options, index):
+    metrics_config = (config.get('catalog') or {}).get('metrics') or {}
+    if not metrics_config.get('port'):
+        return None
+
+    metrics = CatalogMetrics()
+    if options['cache'] is not None:
+        metrics.watch_cache(options['cache'])
+
+    # Workers sharing the gRPC addresses cannot share a metrics port, so each serves its own on the next one
+    serve_metrics(metrics.registry, metrics_config['port'] + index, metrics_config.get('host', ''))
+    return metrics
+
+
+def _profiler(config):
+    profiling_config = (config.get('catalog') or {}).get('profiling') or {}
+    if not profiling_config.get('directory'):
+        return None
+
+    return Profiler(
+        profiling_config['directory'], slow_request_ms=profiling_config.get('slow_request_ms'),
+        cpu_seconds=profiling_config.get('cpu_seconds', DEFAULT_CPU_SECONDS)
+    )
+
+
+def _admin_address(config, profiler, index):
+    admin_config = (config.get('catalog') or {}).get('admin') or {}
+    if profiler is None or not admin_config.get('port'):
+        return None
+
+    # CatalogAdmin has no authentication, so it is only served apart from the API, by default to this host alone
+    return f'{admin_config.get("host", DEFAULT_ADMIN_HOST)}:{admin_config["port"] + index}'
+
+
+def _observers(metrics, profiler):
+    return [observer for observer in (metrics, profiler) if observer is not None]
+
+
+def _listening(config, admin_address):
+    listening = f'[{os.getpid()}] Listening on [{", ".join(config["server"]["addresses"])}]'
+    return f'{listening}, CatalogAdmin on {admin_address}' if admin_address else listening
+
+
+def _server_options(reuse_port):
+    # Lets several worker processes bind the same addresses, the kernel balancing connections between them
+    return [('grpc.so_reuseport', 1)] if reuse_port else None
+
+
+def serve(config, reuse_port=False, index=0):
+    options = _service_options(config)
+    metrics = _metrics(config, options, index)
+    profiler = _profiler(config)
+    observers = _observers(metrics, profiler)
+    admin_address = _admin_address(config, profiler, index)
+    database = _database(config)
+    threads = _server_threads(config)
+    if options['max_watchers'] is None:
+        # Watches hold their server thread until cancelled, so half of them are kept for the other RPCs
+        options['max_watchers'] = max(1, threads // 2)
+
+    # Each server thread handles one RPC at a time, so as many connections serve them without waiting for the pool
+    client = database.client(threads, event_listeners=[observer.command_listener for observer in observers])
+    service = CatalogService(
+        client['catalog']['parts'], schemas=client['catalog']['partschemas'], read_preference=database.reads(),
+        **options
+    )
+
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=threads)
+    server = grpc.server(
+        executor, options=_server_options(reuse_port), interceptors=[RpcInterceptor(observers)] if observers else None
+    )
+    if metrics:
+        metrics.watch_executor(executor)
+    add_CatalogServicer_to_server(service, server)
+    servers = [server]
+    if admin_address:
+        admin_server = grpc.server(concurrent.futures.ThreadPoolExecutor(max_workers=ADMIN_THREADS))
+        add_CatalogAdminServicer_to_server(CatalogAdminService(profiler), admin_server)
+        admin_server.add_insecure_port(admin_address)
+        servers.append(admin_server)
+
+    for address in config['server']['addresses']:
+        server.add_insecure_port(address)
+
+    for started in servers:
+        started.start()
+
+    def stop(*_):
+        for stopped in servers:
+            stopped.stop(0.5)
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, stop)
+    if profiler:
+        for signum in SIGNALS:
+            signal.signal(signum, profiler.handle_signal)
+
+    print(_listening(config, admin_address))
+    server.wait_for_termination()
+
+
+async def serve_async(config, reuse_port=False, index=0):
+    # Only --async needs motor, whose pinned version does not import on Python 3.11 and later
+    import motor.motor_asyncio
+
+    options = _service_options(config)
+    metrics = _metrics(config, options, index)
+    profiler = _profiler(config)
+    observers = _observers(metrics, profiler)
+    admin_address = _admin_address(config, profiler, index)
+    database = _database(config)
+    if options['max_watchers'] is None:
+        options['max_watchers'] = DEFAULT_MAX_WATCHERS
+
+    client = motor.motor_asyncio.AsyncIOMotorClient(
+        database.uri, event_listeners=[observer.command_listener for observer in observers],
+        **database.client_options()
+    )
+    service = AsyncCatalogService(
+        client['catalog']['parts'], schemas=client['catalog']['partschemas'], read_preference=database.reads(),
+        **options
+    )
+
+    server = grpc.aio.server(
+        # grpc.aio of the pinned grpcio only takes a tuple of interceptors
+        options=_server_options(reuse_port), interceptors=(AsyncRpcInterceptor(observers),) if observers else None
+    )
+    add_CatalogServicer_to_server(service, server)
+    servers = [server]
+    if admin_address:
+        admin_server = grpc.aio.server()
+        add_CatalogAdminServicer_to_server(AsyncCatalogAdminService(profiler), admin_server)
+        admin_server.add_insecure_port(admin_address)
+        servers.append(admin_server)
+
+    for address in config['server']['addresses']:
+        server.add_insecure_port(address)
+
+    for started in servers:
+        await started.start()
+
+    def stop():
+        for stopped in servers:
+            asyncio.ensure_future(stopped.stop(0.5))
+
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        asyncio.get_running_loop().add_signal_handler(signum, stop)
+    if profiler:
+        for signum in SIGNALS:
+            asyncio.get_running_loop().add_signal_handler(signum, profiler.handle_signal, signum)
+
+    print(f'{_listening(config, admin_address)} (async)')
+    await server.wait_for_termination()
+
+
+def run_worker(config, use_async, reuse_port, index=0):
+    # Runs after fork in multi-worker mode, so every worker creates its own Mongo client and gRPC server
+    models = _index_models(config)
+    if index == 0 and models:
+        reconcile_in_background(_database(config).uri, models)
+
+    if use_async:
+        asyncio.run(serve_async(config, reuse_port=reuse_port, index=index))
+    else:
+        serve(config, reuse_port=reuse_port, index=index)
+
+
+def _explained_queries(collection, filters, order_by):
+    parts = PartCollection(collection)
+    queries = [
+        ('GetPart', collection.find({'_id': ObjectId()}).limit(1)),
+        ('ListParts', parts.collection.list(limit=DEFAULT_PAGE_SIZE + 1)),
+    ]
+
+    for filter in filters or ([''] if order_by else []):
+        query, sort, _, _ = parts._list_query(None, filter, order_by)
+        cursor = parts.collection.list(limit=DEFAULT_PAGE_SIZE + 1, query=query, sort=sort)
+        queries.append((f'ListParts filter={filter!r} order_by={order_by!r}', cursor))
+
+    return queries
+
+
+def show_indexes(config, filters, order_by):
+    client = _database(config).client()
+    collection = client['catalog']['parts']
+    models = _index_models(config)
+
+    missing, stale, present = index_plan(collection, models)
+    print('Indexes:')
+    for model in models:
+        name = model.document['name']
+        print(f'  {name} {dict(model.document["key"])}: {"present" if name in present else "missing"}')
+    for name in stale:
+        print(f'  {name}: {"to be rebuilt" if name in missing else "to be dropped"}')
+
+    try:
+        queries = _explained_queries(collection, filters, order_by)
+    except ApiError as err:
+        print(err.message)
+        return -1
+
+    print('Queries:')
+    for label, cursor in queries:
+        summary = summarize_explain(cursor.explain())
+        print(f'  {label}: {summary["plan"]} (returned {summary["returned"]}, '
+              f'keys examined {summary["keys_examined"]}, documents examined {summary["docs_examined"]})')
+
+
 def main(args):
     if not os.path.exists(args.config):
         print(f'Could not find file {args.config}')
@@ -21,23 +291,52 @@ def main(args):
 
     config = yaml.load(open(args.config, 'r'), Loader=yaml.CLoader)
 
-    client = pymongo.MongoClient(config['database'][0])
-    service = CatalogService(client['catalog']['parts'])
+    try:
+        _index_models(config)
+    except InvalidIndexSpec as err:
+        print(f'Invalid index configuration: {err.message}')
+        return -1
 
-    server = grpc.server(concurrent.futures.ThreadPoolExecutor(max_workers=10))
-    add_CatalogServicer_to_server(service, server)
+    try:
+        _database(config)
+    except InvalidDatabaseConfig as err:
+        print(f'Invalid database configuration: {err.message}')
+        return -1
 
-    for address in config['server']['addresses']:
-        server.add_insecure_port(address)
+    threads = config['server'].get('threads')
+    if threads is not None and (not isinstance(threads, int) or threads < 1):
+        print(f'Invalid number of server threads {threads}')
+        return -1
 
-    server.start()
-    signal.signal(signal.SIGINT, lambda *_: server.stop(0.5))
+    if args.command == 'indexes':
+        return show_indexes(config, args.filter, args.order_by)
 
-    print(f'Listening on [{", ".join(config["server"]["addresses"])}]')
-    server.wait_for_termination()
+    if args.workers < 1:
+        print(f'Invalid number of workers {args.workers}')
+        return -1
+
+    if args.use_async:
+        try:
+            import motor.motor_asyncio  # noqa: F401
+        except (ImportError, AttributeError) as err:
+            # motor 2.x uses asyncio.coroutine, removed in Python 3.11
+            print(f'--async needs motor 2.x and Python 3.10 or earlier: {err}')
+            return -1
+
+    if args.workers == 1:
+        run_worker(config, args.use_async, reuse_port=False)
+    else:
+        worker = functools.partial(run_worker, _with_page_token_secret(config), args.use_async, True)
+        return Supervisor(worker, args.workers).run()
 
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
+    parser.add_argument('command', nargs='?', choices=['serve', 'indexes'], default='serve',
+                        help='serve the API, or print the index plan and how the service queries are executed')
     parser.add_argument('-c', '--config', required=True)
+    parser.add_argument('--async', dest='use_async', action='store_true', help='serve with grpc.aio and motor')
+    parser.add_argument('--workers', type=int, default=1, help='number of server processes sharing the addresses')
+    parser.add_argument('--filter', action='append', help='ListParts filter to explain with the indexes command')
+    parser.add_argument('--order-by', default='', help='ListParts ordering to explain with the indexes command')
     exit(main(parser.parse_args()) or 0)
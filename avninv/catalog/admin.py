@@ -0,0 +1,50 @@
+"""CatalogAdmin Service Implementation, triggering the Profiler of the serving process"""
+
+from avninv.catalog.v1.admin_pb2 import ProfileResponse
+from avninv.catalog.v1.admin_pb2_grpc import CatalogAdminServicer
+from avninv.error.api_error import ApiError, StatusCode
+
+
+class CatalogAdminService(CatalogAdminServicer):
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    @staticmethod
+    def _validate_threshold(request):
+        if not request.HasField('threshold_ms'):
+            return None
+        if request.threshold_ms < 0:
+            raise ApiError(StatusCode.INVALID_ARGUMENT, 'Invalid threshold_ms')
+        return request.threshold_ms
+
+    def _set_slow_request_threshold(self, request):
+        threshold = self._validate_threshold(request)
+        self.profiler.set_slow_request_threshold(threshold)
+        if threshold is None:
+            return ProfileResponse(message='Not logging slow requests')
+        return ProfileResponse(message=f'Logging requests slower than {threshold}ms')
+
+    @staticmethod
+    def _memory_response(path):
+        if path is None:
+            return ProfileResponse(message='Tracing memory allocations')
+        return ProfileResponse(path=path, message='Wrote memory snapshot')
+
+    def ProfileCpu(self, request, context):
+        try:
+            path = self.profiler.profile_cpu(request.seconds or None)
+            return ProfileResponse(path=path, message='Profiling CPU')
+        except ApiError as err:
+            context.abort(err.status, err.message)
+
+    def SnapshotMemory(self, request, context):
+        try:
+            return self._memory_response(self.profiler.snapshot_memory(stop=request.stop))
+        except ApiError as err:
+            context.abort(err.status, err.message)
+
+    def SetSlowRequestThreshold(self, request, context):
+        try:
+            return self._set_slow_request_threshold(request)
+        except ApiError as err:
+            context.abort(err.status, err.message)
@@ -0,0 +1,34 @@
+"""CatalogAdmin Service Implementation for grpc.aio servers"""
+
+import asyncio
+
+from avninv.catalog.admin import CatalogAdminService
+from avninv.catalog.v1.admin_pb2 import ProfileResponse
+from avninv.error.api_error import ApiError
+
+
+class AsyncCatalogAdminService(CatalogAdminService):
+    """Mirror of CatalogAdminService whose RPCs are coroutines"""
+
+    async def ProfileCpu(self, request, context):
+        try:
+            path = self.profiler.profile_cpu(request.seconds or None)
+            return ProfileResponse(path=path, message='Profiling CPU')
+        except ApiError as err:
+            await context.abort(err.status, err.message)
+
+    async def SnapshotMemory(self, request, context):
+        try:
+            # Snapshots walk every traced allocation, so they are taken off the event loop
+            path = await asyncio.get_running_loop().run_in_executor(
+                None, lambda: self.profiler.snapshot_memory(stop=request.stop)
+            )
+            return self._memory_response(path)
+        except ApiError as err:
+            await context.abort(err.status, err.message)
+
+    async def SetSlowRequestThreshold(self, request, context):
+        try:
+            return self._set_slow_request_threshold(request)
+        except ApiError as err:
+            await context.abort(err.status, err.message)
@@ -0,0 +1,82 @@
+"""Catalog Service Implementation for grpc.aio servers"""
+
+import functools
+
+from avninv.catalog.async_parts_collection import AsyncPartCollection
+from avninv.catalog.async_schema_collection import AsyncPartSchemaCollection
+from avninv.catalog.catalog import CatalogService
+from avninv.catalog.operation import run_async
+from avninv.catalog.v1.catalog_pb2 import StreamPartsResponse
+from avninv.error.api_error import ApiError
+
+
+def _async_rpc(serve):
+    """Coroutine of the unary RPC `serve` of CatalogService: grpc.aio runs any other handler in a thread"""
+    @functools.wraps(serve)
+    async def serve_async(self, request, context):
+        try:
+            return await run_async(serve.operation(self, request, context))
+        except ApiError as err:
+            await context.abort(err.status, err.message)
+    return serve_async
+
+
+class AsyncCatalogService(CatalogService):
+    """CatalogService whose RPCs are coroutines, running the same operations over async collections"""
+
+    collection_class = AsyncPartCollection
+    schema_collection_class = AsyncPartSchemaCollection
+
+    CreatePart = _async_rpc(CatalogService.CreatePart)
+    DeletePart = _async_rpc(CatalogService.DeletePart)
+    GetPart = _async_rpc(CatalogService.GetPart)
+    ListParts = _async_rpc(CatalogService.ListParts)
+    SearchParts = _async_rpc(CatalogService.SearchParts)
+    AggregateParts = _async_rpc(CatalogService.AggregateParts)
+    UpdatePart = _async_rpc(CatalogService.UpdatePart)
+    AdjustQuantity = _async_rpc(CatalogService.AdjustQuantity)
+    BatchGetParts = _async_rpc(CatalogService.BatchGetParts)
+    BatchCreateParts = _async_rpc(CatalogService.BatchCreateParts)
+    BatchUpdateParts = _async_rpc(CatalogService.BatchUpdateParts)
+    BatchAdjustQuantities = _async_rpc(CatalogService.BatchAdjustQuantities)
+    BatchDeleteParts = _async_rpc(CatalogService.BatchDeleteParts)
+    ListPartSchemas = _async_rpc(CatalogService.ListPartSchemas)
+    GetPartSchema = _async_rpc(CatalogService.GetPartSchema)
+    CreatePartSchema = _async_rpc(CatalogService.CreatePartSchema)
+    UpdatePartSchema = _async_rpc(CatalogService.UpdatePartSchema)
+    DeletePartSchema = _async_rpc(CatalogService.DeletePartSchema)
+
+    async def StreamParts(self, request, context):
+        try:
+            self._validate_parent(request.parent, require_org='main')
+            chunk_size = self._validate_page_size(request.chunk_size)
+
+            # A cancelled RPC cancels this task, which closes the generator and with it the cursor
+            parts = self.collection.list(batch_size=self.stream_batch_size, read_mask=request.read_mask.paths)
+            try:
+                chunk = []
+                async for part in parts:
+                    chunk.append(part)
+                    if len(chunk) == chunk_size:
+                        yield StreamPartsResponse(parts=chunk)
+                        chunk = []
+
+                if chunk:
+                    yield StreamPartsResponse(parts=chunk)
+            finally:
+                await parts.aclose()
+        except ApiError as err:
+            await context.abort(err.status, err.message)
+
+    async def WatchParts(self, request, context):
+        try:
+            self._validate_parent(request.parent, require_org='main')
+            with self._watching():
+                events = self.collection.watch(request.resume_token)
+                try:
+                    async for event in events:
+                        yield event
+                finally:
+                    await events.aclose()
+        except ApiError as err:
+            await context.abort(err.status, err.message)
@@ -0,0 +1,15 @@
+from avninv.catalog.collection import Collection
+from avninv.catalog.operation import run_async
+
+
+class AsyncCollection(Collection):
+    """Collection backed by a motor AsyncIOMotorCollection, whose operations return awaitables.
+
+    list() returns a motor cursor and watch() a motor change stream, both iterated with `async for`.
+    """
+
+    _run = staticmethod(run_async)
+
+    @staticmethod
+    def _to_list(cursor):
+        return cursor.to_list(None)
@@ -0,0 +1,35 @@
+from avninv.catalog.async_collection import AsyncCollection
+from avninv.catalog.operation import run_async
+from avninv.catalog.parts_collection import PartCollection
+from avninv.catalog.v1.catalog_pb2 import WatchPartsResponse
+
+
+class AsyncPartCollection(PartCollection):
+    """PartCollection over an AsyncCollection: its operations return awaitables, and list() and watch() are async
+    generators"""
+
+    collection_class = AsyncCollection
+    _run = staticmethod(run_async)
+
+    async def list(self, limit=None, after=None, batch_size=None, read_mask=None):
+        projection = self._projection(read_mask)
+
+        with self._translate_errors('list'):
+            bsons = self.collection.list(limit=limit, after=after, batch_size=batch_size, projection=projection)
+            try:
+                async for bson in bsons:
+                    yield self._to_part(bson)
+            finally:
+                await bsons.close()
+
+    async def watch(self, resume_token=''):
+        # A cancelled RPC cancels the task awaiting the next change, which closes the stream on the way out
+        resume_after = self._resume_after(resume_token)
+
+        with self._translate_errors('watch'):
+            async with self.collection.watch(resume_after) as stream:
+                yield WatchPartsResponse(resume_token=self._resume_token(stream.resume_token))
+                async for change in stream:
+                    event = self._event(change)
+                    if event is not None:
+                        yield event
@@ -0,0 +1,10 @@
+from avninv.catalog.async_collection import AsyncCollection
+from avninv.catalog.operation import run_async
+from avninv.catalog.schema_collection import PartSchemaCollection
+
+
+class AsyncPartSchemaCollection(PartSchemaCollection):
+    """PartSchemaCollection over an AsyncCollection; reads are served from the registry as they are in sync mode"""
+
+    collection_class = AsyncCollection
+    _run = staticmethod(run_async)
@@ -0,0 +1,126 @@
+"""In-process cache of converted parts"""
+
+import collections
+import threading
+import time
+
+
+# Rough per-entry overhead of the Python message object and bookkeeping on top of its serialized size
+_ENTRY_OVERHEAD = 256
+
+
+class PartCache:
+    """Bounded LRU cache of Part messages keyed by ObjectId.
+
+    Entries expire `ttl` seconds after being stored, and the least recently used ones are evicted once
+    there are more than `max_entries` of them or their estimated size exceeds `max_bytes`. Cached parts
+    are shared between callers and must not be modified.
+
+    Invalidation only reaches this process, so the TTL bounds how stale other workers can be.
+    """
+
+    def __init__(self, max_entries=10000, ttl=30.0, max_bytes=16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def generation(self):
+        """Token to pass to put() so that a part read before a concurrent invalidation is not cached"""
+        return self._generation
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[0] < time.monotonic():
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+    def put(self, key, part, generation):
+        size = part.ByteSize() + _ENTRY_OVERHEAD
+
+        with self._lock:
+            if generation != self._generation or size > self.max_bytes:
+                return
+
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (time.monotonic() + self.ttl, size, part)
+            self.size += size
+
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, keys):
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                if key in self._entries:
+                    self._remove(key)
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'bytes': self.size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self.size -= size
+
+
+class ResultMemo:
+    """Results of recent queries by key, each kept `ttl` seconds.
+
+    Writes do not invalidate entries: the TTL alone bounds how stale results get. Once there are `max_entries`, the
+    oldest entries are dropped. Results are shared between callers and must not be modified.
+    """
+
+    def __init__(self, ttl=10.0, max_entries=256):
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            return entry[1]
+
+    def put(self, key, result):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.monotonic() + self.ttl, result)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
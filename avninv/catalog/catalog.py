@@ -1,55 +1,442 @@
 """Catalog Service Implementation"""
 
+import contextlib
+import functools
+import hashlib
+import math
+import threading
+
 from google.protobuf.empty_pb2 import Empty
+from google.rpc.status_pb2 import Status
 
+from avninv.catalog.operation import run
+from avninv.catalog.page_token import PageTokens
 from avninv.catalog.parts_collection import PartCollection
-from avninv.catalog.v1.catalog_pb2 import ListPartResponse
+from avninv.catalog.schema_collection import PartSchemaCollection
+from avninv.catalog.schemas import SchemaRegistry
+from avninv.catalog.v1.catalog_pb2 import (
+    AggregatePartsResponse, BatchDeletePartsResponse, BatchPartResult, BatchPartsResponse, ListPartResponse,
+    ListPartSchemaResponse, Part, PartAttributeSchema, PartSchema, SearchPartsRequest, SearchPartsResponse,
+    StreamPartsResponse
+)
 from avninv.catalog.v1.catalog_pb2_grpc import CatalogServicer
 from avninv.error.api_error import ApiError, StatusCode
+from avninv.serde.protobson import FieldMaskTrie, InvalidFieldPath
 
 
-class CatalogService(CatalogServicer):
-    def __init__(self, collection):
-        self.collection = PartCollection(collection)
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+DEFAULT_STREAM_BATCH_SIZE = 100
+MAX_BATCH_SIZE = 1000
+MAX_SEARCH_PREDICATES = 16
+DEFAULT_SCHEMA_TTL = 30.0
+DEFAULT_MAX_WATCHERS = 1000
+# Quantities are stored as signed 64 bit integers, the widest BSON has
+MAX_QUANTITY = 2 ** 63 - 1
 
-    def CreatePart(self, request, context):
+
+def rpc(method):
+    """Unary RPC running the operation `method`, aborting the call with the ApiError it raises"""
+    @functools.wraps(method)
+    def serve(self, request, context):
         try:
-            self._validate_parent(request.parent, require_org='main')
-            id = self.collection.insert(request.part)
-            return self.collection.get(id)
+            return run(method(self, request, context))
         except ApiError as err:
             context.abort(err.status, err.message)
+    serve.operation = method
+    return serve
+
 
+class CatalogService(CatalogServicer):
+    collection_class = PartCollection
+    schema_collection_class = PartSchemaCollection
+
+    def __init__(self, collection, page_token_secret=None, max_page_size=MAX_PAGE_SIZE,
+                 stream_batch_size=DEFAULT_STREAM_BATCH_SIZE, cache=None, schemas=None, schema_ttl=DEFAULT_SCHEMA_TTL,
+                 read_preference=None, aggregate_memo=None, max_watchers=DEFAULT_MAX_WATCHERS):
+        self.collection = self.collection_class(
+            collection, cache=cache, read_preference=read_preference, memo=aggregate_memo
+        )
+        self.schemas = self.schema_collection_class(
+            schemas if schemas is not None else collection.database['partschemas'], SchemaRegistry(schema_ttl)
+        )
+        self.page_tokens = PageTokens(page_token_secret)
+        self.max_page_size = max_page_size
+        self.stream_batch_size = stream_batch_size
+        self.max_watchers = max_watchers
+        self.watchers = 0
+        self._watchers_lock = threading.Lock()
+
+    @rpc
+    def CreatePart(self, request, context):
+        self._validate_parent(request.parent, require_org='main')
+        yield self.schemas.refresh()
+        self._validate_part_schema(request.part)
+        return (yield self.collection.insert(request.part))
+
+    @rpc
     def DeletePart(self, request, context):
-        try:
-            _, oid = self._validate_name(request.name, require_org='main')
-            self.collection.delete(oid)
-            return Empty()
-        except ApiError as err:
-            context.abort(err.status, err.message)
+        _, oid = self._validate_name(request.name, require_org='main')
+        yield self.collection.delete(oid)
+        return Empty()
 
+    @rpc
     def GetPart(self, request, context):
+        _, oid = self._validate_name(request.name, require_org='main')
+        return (yield self.collection.get(
+            oid, read_mask=request.read_mask.paths, if_none_match=request.if_none_match
+        ))
+
+    @rpc
+    def ListParts(self, request, context):
+        page_size, after = self._validate_list_request(request)
+        parts, position = yield self.collection.list_page(
+            page_size, after=after, read_mask=request.read_mask.paths, filter=request.filter,
+            order_by=request.order_by
+        )
+        return ListPartResponse(
+            parts=parts, next_page_token=self._next_page_token(self._list_query(request), position)
+        )
+
+    @rpc
+    def SearchParts(self, request, context):
+        page_size, after = self._validate_search_request(request)
+        parts, position = yield self.collection.search_page(
+            page_size, request.predicates, after=after, read_mask=request.read_mask.paths, text=request.query
+        )
+        return SearchPartsResponse(
+            parts=parts, next_page_token=self._next_page_token(self._search_query(request), position)
+        )
+
+    @rpc
+    def AggregateParts(self, request, context):
+        self._validate_parent(request.parent, require_org='main')
+        if request.low_stock_quantity > MAX_QUANTITY:
+            raise ApiError(StatusCode.INVALID_ARGUMENT, f'low_stock_quantity is above {MAX_QUANTITY}')
+        groups = yield self.collection.aggregate(
+            request.group_by, filter=request.filter, low_stock_quantity=request.low_stock_quantity
+        )
+        return AggregatePartsResponse(groups=groups)
+
+    def StreamParts(self, request, context):
         try:
-            _, oid = self._validate_name(request.name, require_org='main')
-            return self.collection.get(oid)
+            self._validate_parent(request.parent, require_org='main')
+            chunk_size = self._validate_page_size(request.chunk_size)
+
+            # gRPC only pulls the next message once the previous one was handed to the transport, so at most
+            # one cursor batch and one chunk are held in memory. Closing the generator closes the cursor.
+            parts = self.collection.list(batch_size=self.stream_batch_size, read_mask=request.read_mask.paths)
+            with contextlib.closing(parts):
+                chunk = []
+                for part in parts:
+                    chunk.append(part)
+                    if len(chunk) == chunk_size:
+                        if not context.is_active():
+                            return
+                        yield StreamPartsResponse(parts=chunk)
+                        chunk = []
+
+                if chunk:
+                    yield StreamPartsResponse(parts=chunk)
         except ApiError as err:
             context.abort(err.status, err.message)
 
-    def ListParts(self, request, context):
+    def WatchParts(self, request, context):
         try:
             self._validate_parent(request.parent, require_org='main')
-            parts = list(self.collection.list())
-            return ListPartResponse(parts=parts)
+            with self._watching():
+                # Each watch holds a server thread, released within a poll of the client going away
+                yield from self.collection.watch(request.resume_token, is_active=context.is_active)
         except ApiError as err:
             context.abort(err.status, err.message)
 
+    @rpc
     def UpdatePart(self, request, context):
+        _, oid = self._validate_name(request.name, require_org='main')
+        yield self.schemas.refresh()
+        fields_mask = self._update_mask(Part.DESCRIPTOR, request.update_mask.paths)
+        schema_guard = self._validate_part_update(request.part, fields_mask)
+        version = self.collection.parse_etag(request.part.etag)
+        return (yield self.collection.update(
+            oid, request.part, fields_mask=fields_mask, schema_guard=schema_guard, version=version
+        ))
+
+    @rpc
+    def AdjustQuantity(self, request, context):
+        return (yield self.collection.adjust_quantity(*self._validate_adjustment(request)))
+
+    @rpc
+    def BatchGetParts(self, request, context):
+        validated = self._validate_batch(request.parent, request.names, self._validate_batch_name)
+        results = yield self.collection.get_many(self._valid_items(validated))
+        return self._batch_parts_response(validated, results)
+
+    @rpc
+    def BatchCreateParts(self, request, context):
+        yield self.schemas.refresh()
+        validated = self._validate_batch(request.parent, request.requests, self._validate_batch_create)
+        results = yield self.collection.insert_many(self._valid_items(validated))
+        return self._batch_parts_response(validated, results)
+
+    @rpc
+    def BatchUpdateParts(self, request, context):
+        yield self.schemas.refresh()
+        validated = self._validate_batch(request.parent, request.requests, self._validate_batch_update)
+        results = yield self.collection.update_many(self._valid_items(validated))
+        return self._batch_parts_response(validated, results)
+
+    @rpc
+    def BatchAdjustQuantities(self, request, context):
+        validated = self._validate_batch(request.parent, request.requests, self._validate_adjustment)
+        results = yield self.collection.adjust_quantities(self._valid_items(validated))
+        return self._batch_parts_response(validated, results)
+
+    @rpc
+    def BatchDeleteParts(self, request, context):
+        validated = self._validate_batch(request.parent, request.names, self._validate_batch_name)
+        results = yield self.collection.delete_many(self._valid_items(validated))
+        return self._batch_delete_response(validated, results)
+
+    @rpc
+    def ListPartSchemas(self, request, context):
+        page_size, after = self._validate_list_schemas_request(request)
+        yield self.schemas.refresh()
+        schemas, position = self.schemas.list_page(page_size, after=after)
+        return ListPartSchemaResponse(
+            part_schemas=schemas, next_page_token=self._next_page_token(self._list_schemas_query(request), position)
+        )
+
+    @rpc
+    def GetPartSchema(self, request, context):
+        _, oid = self._validate_schema_name(request.name, require_org='main')
+        yield self.schemas.refresh()
+        return self.schemas.get(oid)
+
+    @rpc
+    def CreatePartSchema(self, request, context):
+        self._validate_schema_parent(request.parent, require_org='main')
+        self._validate_schema(request.part_schema, None)
+        return (yield self.schemas.insert(request.part_schema))
+
+    @rpc
+    def UpdatePartSchema(self, request, context):
+        _, oid = self._validate_schema_name(request.name, require_org='main')
+        fields_mask = self._update_mask(PartSchema.DESCRIPTOR, request.update_mask.paths)
+        self._validate_schema(request.part_schema, fields_mask)
+        return (yield self.schemas.update(oid, request.part_schema, fields_mask=fields_mask))
+
+    @rpc
+    def DeletePartSchema(self, request, context):
+        _, oid = self._validate_schema_name(request.name, require_org='main')
+        if (yield self.collection.has_schema(request.name)):
+            raise ApiError(StatusCode.FAILED_PRECONDITION, 'Part schema is still used by parts')
+        deleted = yield self.schemas.delete(oid)
+
+        # Parts created with the schema between the check and its deletion keep it
+        if (yield self.collection.has_schema(request.name)):
+            yield self.schemas.restore(deleted)
+            raise ApiError(StatusCode.FAILED_PRECONDITION, 'Part schema is still used by parts')
+        return Empty()
+
+    @contextlib.contextmanager
+    def _watching(self):
+        with self._watchers_lock:
+            if self.watchers >= self.max_watchers:
+                raise ApiError(StatusCode.RESOURCE_EXHAUSTED, 'Too many watches of parts, retry later')
+            self.watchers += 1
         try:
-            _, oid = self._validate_name(request.name, require_org='main')
-            self.collection.update(oid, request.part, fields_mask=request.update_mask.paths)
-            return self.collection.get(oid)
-        except ApiError as err:
-            context.abort(err.status, err.message)
+            yield
+        finally:
+            with self._watchers_lock:
+                self.watchers -= 1
+
+    def _validate_part_schema(self, part):
+        validate = self.schemas.registry.validator(part.schema_name)
+        if validate is not None:
+            validate(part.attributes)
+
+    @staticmethod
+    def _update_mask(descriptor, paths):
+        try:
+            return FieldMaskTrie(descriptor, paths, indexed=True)
+        except InvalidFieldPath as err:
+            raise ApiError(StatusCode.INVALID_ARGUMENT, f'Invalid update mask: {err.message}')
+
+    def _validate_part_update(self, part, fields_mask):
+        """Validate the attributes written by an update against the schema `part` names, without reading the stored
+        part: the update instead comes with a guard on its stored schema_name, returned unless it is overwritten.
+
+        A path into an attribute has the whole attribute of `part` checked, so its name and unit must be sent along.
+        Changing to a registered schema takes a mask replacing every attribute: only those are checked against it.
+        """
+        touched = set(fields_mask.root.children) if fields_mask else {field.name for field, _ in part.ListFields()}
+        if not touched & {'schema_name', 'attributes'}:
+            return None
+
+        attributes = part.attributes
+        node = fields_mask.field('attributes')
+        if fields_mask and (node is None or not node.whole):
+            indexes = sorted(node.children) if node is not None else []
+            attributes = [part.attributes[index] for index in indexes if index < len(part.attributes)]
+
+        registry = self.schemas.registry
+        validate = registry.validator(part.schema_name)
+        if validate is not None:
+            validate(attributes)
+
+        if 'schema_name' not in touched:
+            return (part.schema_name, registry.names()) if registry.names() else None
+        if validate is None:
+            return None
+        if not fields_mask:
+            # Updates without mask set attributes by index, keeping the stored ones past those of `part`: these were
+            # only checked against the schema if the part already follows it
+            return part.schema_name, registry.names()
+        if node is None or not node.whole:
+            raise ApiError(StatusCode.INVALID_ARGUMENT, 'schema_name can only be changed along with every attribute')
+        return None
+
+    @staticmethod
+    def _validate_schema(schema, fields_mask):
+        if fields_mask and fields_mask.field('attributes') is None:
+            return
+
+        names = [attribute.attribute for attribute in schema.attributes]
+        if not all(names):
+            raise ApiError(StatusCode.INVALID_ARGUMENT, 'Schema attributes need a name')
+        if len(set(names)) != len(names):
+            raise ApiError(StatusCode.INVALID_ARGUMENT, 'Duplicate schema attribute')
+        if any(attribute.type not in PartAttributeSchema.Type.values() for attribute in schema.attributes):
+            raise ApiError(StatusCode.INVALID_ARGUMENT, 'Invalid schema attribute type')
+
+    def _validate_batch(self, parent, items, validate):
+        self._validate_parent(parent, require_org='main')
+        if len(items) > MAX_BATCH_SIZE:
+            raise ApiError(StatusCode.INVALID_ARGUMENT, f'Batches are limited to {MAX_BATCH_SIZE} items')
+
+        validated = []
+        for item in items:
+            try:
+                validated.append(validate(item))
+            except ApiError as err:
+                validated.append(err)
+        return validated
+
+    def _validate_batch_name(self, name):
+        return self._validate_name(name, require_org='main')[1]
+
+    def _validate_batch_create(self, request):
+        if request.parent:
+            self._validate_parent(request.parent, require_org='main')
+        self._validate_part_schema(request.part)
+        return request.part
+
+    def _validate_batch_update(self, request):
+        _, oid = self._validate_name(request.name, require_org='main')
+        fields_mask = self._update_mask(Part.DESCRIPTOR, request.update_mask.paths)
+        schema_guard = self._validate_part_update(request.part, fields_mask)
+        return oid, request.part, fields_mask, schema_guard, self.collection.parse_etag(request.part.etag)
+
+    def _validate_adjustment(self, request):
+        _, oid = self._validate_name(request.name, require_org='main')
+        max_quantity = request.max_quantity if request.HasField('max_quantity') else None
+        if max(request.min_quantity, max_quantity or 0) > MAX_QUANTITY:
+            raise ApiError(StatusCode.INVALID_ARGUMENT, f'Quantity bounds are above {MAX_QUANTITY}')
+        if max_quantity is not None and max_quantity < request.min_quantity:
+            raise ApiError(StatusCode.INVALID_ARGUMENT, 'max_quantity is below min_quantity')
+        return oid, request.delta, request.min_quantity, max_quantity, request.read_mask.paths
+
+    @staticmethod
+    def _valid_items(validated):
+        return [item for item in validated if not isinstance(item, ApiError)]
+
+    @staticmethod
+    def _merge_batch(validated, results):
+        results = iter(results)
+        return [item if isinstance(item, ApiError) else next(results) for item in validated]
+
+    @staticmethod
+    def _status(err=None):
+        if err is None:
+            return Status(code=StatusCode.OK.value[0])
+        return Status(code=err.status.value[0], message=err.message)
+
+    def _batch_parts_response(self, validated, results):
+        return BatchPartsResponse(results=[
+            BatchPartResult(status=self._status(result))
+            if isinstance(result, ApiError) else BatchPartResult(part=result)
+            for result in self._merge_batch(validated, results)
+        ])
+
+    def _batch_delete_response(self, validated, results):
+        return BatchDeletePartsResponse(statuses=[
+            self._status(result) for result in self._merge_batch(validated, results)
+        ])
+
+    def _validate_list_request(self, request):
+        self._validate_parent(request.parent, require_org='main')
+        page_size = self._validate_page_size(request.page_size)
+        after = self._decode_page_token(request.page_token, self._list_query(request))
+        return page_size, after
+
+    def _validate_search_request(self, request):
+        self._validate_parent(request.parent, require_org='main')
+        if not request.predicates and not request.query.strip():
+            raise ApiError(StatusCode.INVALID_ARGUMENT, 'Searches need a query or predicates')
+        if len(request.predicates) > MAX_SEARCH_PREDICATES:
+            raise ApiError(StatusCode.INVALID_ARGUMENT, f'Searches are limited to {MAX_SEARCH_PREDICATES} predicates')
+
+        for predicate in request.predicates:
+            if not predicate.attribute:
+                raise ApiError(StatusCode.INVALID_ARGUMENT, 'Predicates need an attribute')
+            if any(math.isnan(getattr(predicate, bound)) for bound in ('min_value', 'max_value')):
+                raise ApiError(StatusCode.INVALID_ARGUMENT, 'Invalid predicate bounds')
+            if predicate.HasField('min_value') and predicate.HasField('max_value') and \
+                    predicate.min_value > predicate.max_value:
+                raise ApiError(StatusCode.INVALID_ARGUMENT, 'Invalid predicate bounds')
+
+        page_size = self._validate_page_size(request.page_size)
+        after = self._decode_page_token(request.page_token, self._search_query(request))
+        return page_size, after
+
+    def _validate_list_schemas_request(self, request):
+        self._validate_schema_parent(request.parent, require_org='main')
+        page_size = self._validate_page_size(request.page_size)
+        after = self._decode_page_token(request.page_token, self._list_schemas_query(request))
+        return page_size, after
+
+    @staticmethod
+    def _list_schemas_query(request):
+        return {'parent': request.parent, 'collection': 'partschemas'}
+
+    @staticmethod
+    def _list_query(request):
+        return {'parent': request.parent, 'filter': request.filter, 'order_by': request.order_by}
+
+    @staticmethod
+    def _search_query(request):
+        search = SearchPartsRequest(predicates=request.predicates, query=request.query)
+        digest = hashlib.sha256(search.SerializeToString(deterministic=True)).digest()[:16]
+        return {'parent': request.parent, 'search': digest}
+
+    def _next_page_token(self, query, position):
+        # Tokens carry the query that issued them, and are only accepted along with the same query
+        return self.page_tokens.encode({**query, 'after': position}) if position is not None else ''
+
+    def _validate_page_size(self, page_size):
+        if page_size < 0:
+            raise ApiError(StatusCode.INVALID_ARGUMENT, 'Invalid page size')
+        return min(page_size or DEFAULT_PAGE_SIZE, self.max_page_size)
+
+    def _decode_page_token(self, page_token, query):
+        if not page_token:
+            return None
+
+        position = self.page_tokens.decode(page_token)
+        after = position.pop('after', None)
+        if position != query or after is None:
+            raise ApiError(StatusCode.INVALID_ARGUMENT, 'Invalid page token')
+        return after
 
     @staticmethod
     def _validate_path(tokens, hierarchy):
@@ -77,3 +464,21 @@ class CatalogService(CatalogServicer):
         if not valid:
             raise ApiError(StatusCode.INVALID_ARGUMENT, 'Invalid name')
         return tokens[1], tokens[3]
+
+    @staticmethod
+    def _validate_schema_parent(parent, require_org=None):
+        tokens = parent.split('/')
+        valid, _ = CatalogService._validate_path(tokens, ['orgs', require_org])
+
+        if not valid:
+            raise ApiError(StatusCode.INVALID_ARGUMENT, 'Invalid parent')
+        return tokens[1]
+
+    @staticmethod
+    def _validate_schema_name(name, require_org=None):
+        tokens = name.split('/')
+        valid, _ = CatalogService._validate_path(tokens, ['orgs', require_org, 'partschemas', None])
+
+        if not valid:
+            raise ApiError(StatusCode.INVALID_ARGUMENT, 'Invalid name')
+        return tokens[1], tokens[3]
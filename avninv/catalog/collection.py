@@ -1,4 +1,16 @@
 from bson.objectid import ObjectId
+from pymongo import DeleteOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, WriteError
+
+from avninv.catalog.operation import operation, run
+from avninv.serde.protobson import update_document_to_pipeline
+from avninv.serde.protoquery import keyset_query
+
+
+# Version of each document, bumped by every update. Documents are at version 0 until their first update.
+VERSION = '_v'
+# Changes reported by watch(): writes and deletions of whole documents, not of the collection itself
+WATCHED_OPERATIONS = ['insert', 'update', 'replace', 'delete']
 
 
 class InvalidOid(ValueError):
@@ -13,10 +25,29 @@ class DocumentNotFound(Exception):
         self.message = f'Could not find document with oid "{str(oid)}"'
 
 
+class ConditionFailed(Exception):
+    def __init__(self, oid):
+        self.oid = oid
+        self.message = f'Document with oid "{str(oid)}" does not match the update condition'
+
+
+class VersionMismatch(Exception):
+    def __init__(self, oid, version):
+        self.oid = oid
+        self.version = version
+        self.message = f'Document with oid "{str(oid)}" is not at version {version}'
+
+
 class Collection:
+    _run = staticmethod(run)
+
     def __init__(self, collection):
         self.db = collection
 
+    @staticmethod
+    def _to_list(cursor):
+        return list(cursor)
+
     def _validate_oid(self, oid):
         if not isinstance(oid, ObjectId):
             if not ObjectId.is_valid(oid):
@@ -25,37 +56,251 @@ class Collection:
             oid = ObjectId(oid)
         return oid
 
-    def update(self, oid, bson):
+    def _validate_oids(self, oids):
+        # Batch operations report invalid oids per item instead of failing the whole batch
+        results = []
+        for oid in oids:
+            try:
+                results.append(self._validate_oid(oid))
+            except InvalidOid as err:
+                results.append(err)
+        return results
+
+    @staticmethod
+    def _valid_oids(oids):
+        return [oid for oid in oids if isinstance(oid, ObjectId)]
+
+    @staticmethod
+    def _write_errors(err):
+        return {
+            error['index']: WriteError(error.get('errmsg'), error.get('code'), error)
+            for error in err.details.get('writeErrors', [])
+        }
+
+    @staticmethod
+    def _found(oids, documents):
+        found = {document['_id']: document for document in documents}
+        return [oid if isinstance(oid, Exception) else found.get(oid) or DocumentNotFound(oid) for oid in oids]
+
+    @staticmethod
+    def _deleted(oids, existing, errors):
+        errors = {existing[index]: error for index, error in errors.items()}
+        existing = set(existing)
+        return [
+            oid if isinstance(oid, Exception)
+            else errors.get(oid) or (None if oid in existing else DocumentNotFound(oid))
+            for oid in oids
+        ]
+
+    @staticmethod
+    def _updated(oids, documents, positions, errors):
+        results = Collection._found(oids, documents)
+        for index, error in errors.items():
+            results[positions[index]] = error
+        return results
+
+    def _update_operations(self, oids, bsons, conditions):
+        operations, positions = [], []
+        for position, (oid, bson, condition) in enumerate(zip(oids, bsons, conditions)):
+            command = self._update_command(bson)
+            if isinstance(oid, ObjectId) and command and not condition:
+                operations.append(UpdateOne({'_id': oid}, command))
+                positions.append(position)
+        return operations, positions
+
+    @operation
+    def _bulk_write(self, operations):
+        if not operations:
+            return {}
+        try:
+            yield self.db.bulk_write(operations, ordered=False)
+        except BulkWriteError as err:
+            return self._write_errors(err)
+        return {}
+
+    @staticmethod
+    def _update_command(bson):
+        # $pull conflicts with $set/$unset on the same array, so those updates are run as a pipeline instead
+        if bson['$pull']:
+            return update_document_to_pipeline(bson) + [
+                {'$set': {VERSION: {'$add': [{'$ifNull': [f'${VERSION}', 0]}, 1]}}}
+            ]
+
+        command = {operator: bson[operator] for operator in ('$set', '$unset') if bson[operator]}
+        if command:
+            command['$inc'] = {VERSION: 1}
+        return command
+
+    @staticmethod
+    def _update_query(oid, condition, version):
+        query = {'_id': oid, **(condition or {})}
+        if version is not None:
+            query[VERSION] = version if version else {'$exists': False}
+        return query
+
+    @staticmethod
+    def _update_failure(oid, version, stored):
+        if stored is None:
+            return DocumentNotFound(oid)
+        if version is not None and stored.get(VERSION, 0) != version:
+            return VersionMismatch(oid, version)
+        return ConditionFailed(oid)
+
+    @operation
+    def update(self, oid, bson, condition=None, version=None):
+        """Apply an update document to the document `oid`, only if it also matches the query `condition` and is at
+        `version` when given. Updates that change nothing still check both, without bumping the version."""
         oid = self._validate_oid(oid)
-        result = self.db.update_one(
-            {'_id': oid},
-            {
-                '$set': bson['$set'],
-                '$unset': bson['$unset']
-            }
-        )
+        command = self._update_command(bson)
+        query = self._update_query(oid, condition, version)
 
-        if result.matched_count == 0:
-            raise DocumentNotFound(oid)
+        if command:
+            result = yield self.db.find_one_and_update(query, command, return_document=ReturnDocument.AFTER)
+        else:
+            result = yield self.db.find_one(query)
 
-        self.db.update_one({'_id': oid}, {'$pull': bson['$pull']})
+        if result is None:
+            # Only failed updates pay for telling a missing document from one not matching the condition
+            stored = (yield self.db.find_one({'_id': oid}, [VERSION])) if condition or version is not None else None
+            raise self._update_failure(oid, version, stored)
+        return result
 
+    @operation
+    def increment(self, oid, increments, condition=None, projection=None):
+        """Add `increments`, by key, to the document `oid` in a single write, only if it matches the query
+        `condition`, and return the document as incremented"""
+        oid = self._validate_oid(oid)
+        result = yield self.db.find_one_and_update(
+            self._update_query(oid, condition, None), {'$inc': {**increments, VERSION: 1}}, projection=projection,
+            return_document=ReturnDocument.AFTER
+        )
+
+        if result is None:
+            stored = (yield self.db.find_one({'_id': oid}, [VERSION])) if condition else None
+            raise self._update_failure(oid, None, stored)
+        return result
+
+    @operation
     def delete(self, oid):
         oid = self._validate_oid(oid)
-        result = self.db.delete_one({"_id": oid})
+        result = yield self.db.delete_one({"_id": oid})
 
         if result.deleted_count == 0:
             raise DocumentNotFound(oid)
 
+    @operation
+    def pop(self, oid):
+        """Delete the document `oid` and return it"""
+        oid = self._validate_oid(oid)
+        bson = yield self.db.find_one_and_delete({'_id': oid})
+        if bson is None:
+            raise DocumentNotFound(oid)
+        return bson
+
+    @operation
     def insert(self, part):
-        return self.db.insert_one(part).inserted_id
+        return (yield self.db.insert_one(part)).inserted_id
 
-    def get(self, oid):
+    @operation
+    def get(self, oid, projection=None):
         oid = self._validate_oid(oid)
-        bson = self.db.find_one({"_id": oid})
+        bson = yield self.db.find_one({"_id": oid}, projection)
         if not bson:
             raise DocumentNotFound(oid)
         return bson
 
-    def list(self):
-        return self.db.find()
+    def list(self, limit=None, after=None, batch_size=None, projection=None, query=None, sort=None, skip=None):
+        # `after` is the position of the last document of the previous page, its values for each key of `sort`
+        sort = sort or [('_id', 1)]
+        if after is not None:
+            after = keyset_query(sort, after)
+            query = {'$and': [query, after]} if query else after
+
+        cursor = self.db.find(query or {}, projection).sort(sort)
+        if skip:
+            cursor = cursor.skip(skip)
+        if limit:
+            cursor = cursor.limit(limit)
+        if batch_size:
+            cursor = cursor.batch_size(batch_size)
+        return cursor
+
+    @operation
+    def fetch(self, **kwargs):
+        """Documents of list(**kwargs), all read at once"""
+        return (yield self._to_list(self.list(**kwargs)))
+
+    @operation
+    def count(self, query, limit=None):
+        return (yield self.db.count_documents(query, **({'limit': limit} if limit else {})))
+
+    @operation
+    def aggregate(self, pipeline):
+        return (yield self._to_list(self.db.aggregate(pipeline)))
+
+    def watch(self, resume_after=None, max_await_time_ms=None):
+        """Change stream of the documents inserted, updated and deleted after `resume_after`, or from now on. Changes
+        from updates hold the document as of reading them, or none when it was deleted since."""
+        return self.db.watch(
+            [{'$match': {'operationType': {'$in': WATCHED_OPERATIONS}}}], full_document='updateLookup',
+            resume_after=resume_after, max_await_time_ms=max_await_time_ms
+        )
+
+    @operation
+    def get_many(self, oids):
+        if not oids:
+            return []
+
+        oids = self._validate_oids(oids)
+        documents = yield self._to_list(self.db.find({'_id': {'$in': self._valid_oids(oids)}}))
+        return self._found(oids, documents)
+
+    @operation
+    def insert_many(self, bsons):
+        if not bsons:
+            return []
+
+        errors = {}
+        try:
+            yield self.db.insert_many(bsons, ordered=False)
+        except BulkWriteError as err:
+            errors = self._write_errors(err)
+
+        # insert_many assigns the _id of every document before sending them
+        return [errors.get(position, bson['_id']) for position, bson in enumerate(bsons)]
+
+    @operation
+    def update_many(self, oids, bsons, conditions=None):
+        """Apply each update document to its document, only if it matches its condition, failing with ConditionFailed
+        otherwise. Updates with a condition are applied one by one: a bulk write does not tell which of them matched."""
+        if not oids:
+            return []
+
+        oids = self._validate_oids(oids)
+        conditions = conditions or [None] * len(oids)
+        operations, positions = self._update_operations(oids, bsons, conditions)
+
+        errors = yield self._bulk_write(operations)
+        unconditional = self._valid_oids([oid for oid, condition in zip(oids, conditions) if not condition])
+        documents = (yield self._to_list(self.db.find({'_id': {'$in': unconditional}}))) if unconditional else []
+        results = self._updated(oids, documents, positions, errors)
+
+        for position, (oid, bson, condition) in enumerate(zip(oids, bsons, conditions)):
+            if condition and isinstance(oid, ObjectId):
+                try:
+                    results[position] = yield self.update(oid, bson, condition)
+                except (DocumentNotFound, ConditionFailed, WriteError) as err:
+                    results[position] = err
+        return results
+
+    @operation
+    def delete_many(self, oids):
+        if not oids:
+            return []
+
+        oids = self._validate_oids(oids)
+        existing = yield self._to_list(self.db.find({'_id': {'$in': self._valid_oids(oids)}}, ['_id']))
+        existing = [document['_id'] for document in existing]
+
+        errors = yield self._bulk_write([DeleteOne({'_id': oid}) for oid in existing])
+        return self._deleted(oids, existing, errors)
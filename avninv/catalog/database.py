@@ -0,0 +1,153 @@
+"""Mongo client settings of the catalog service, read from the `database` config section"""
+
+import importlib.util
+
+import pymongo
+from pymongo import read_preferences, uri_parser
+from pymongo.errors import ConfigurationError
+
+
+# Python modules pymongo needs for each wire compressor; it silently drops those it cannot load
+COMPRESSORS = {'zstd': 'zstandard', 'snappy': 'snappy', 'zlib': 'zlib'}
+READ_PREFERENCES = {
+    'primary': read_preferences.Primary,
+    'primaryPreferred': read_preferences.PrimaryPreferred,
+    'secondary': read_preferences.Secondary,
+    'secondaryPreferred': read_preferences.SecondaryPreferred,
+    'nearest': read_preferences.Nearest
+}
+# Smallest maxStalenessSeconds Mongo accepts
+MIN_MAX_STALENESS = 90
+
+_POOL_OPTIONS = {'max_size': 'maxPoolSize', 'min_size': 'minPoolSize', 'max_idle_ms': 'maxIdleTimeMS',
+                 'wait_queue_timeout_ms': 'waitQueueTimeoutMS'}
+_TIMEOUT_OPTIONS = {'connect_timeout_ms': 'connectTimeoutMS', 'socket_timeout_ms': 'socketTimeoutMS',
+                    'server_selection_timeout_ms': 'serverSelectionTimeoutMS'}
+_KEYS = {'uri', 'pool', 'compressors', 'retry_reads', 'retry_writes', 'reads', *_TIMEOUT_OPTIONS}
+
+
+class InvalidDatabaseConfig(ValueError):
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+def _mapping(section, name, keys):
+    if section is None:
+        return {}
+    if not isinstance(section, dict):
+        raise InvalidDatabaseConfig(f'Invalid {name}, expected a mapping')
+
+    unknown = set(section) - set(keys)
+    if unknown:
+        raise InvalidDatabaseConfig(f'Unknown {name} settings {", ".join(sorted(map(str, unknown)))}')
+    return section
+
+
+def _count(name, value, minimum=0):
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+        raise InvalidDatabaseConfig(f'Invalid {name} {value!r}, expected an integer of at least {minimum}')
+    return value
+
+
+def _flag(name, value):
+    if not isinstance(value, bool):
+        raise InvalidDatabaseConfig(f'Invalid {name} {value!r}, expected true or false')
+    return value
+
+
+class DatabaseConfig:
+    """Typed `database` config section, either the URI of the deployment alone, in a one item list, or a mapping:
+
+    uri: the Mongo connection string
+    pool: max_size, defaulting to the threads serving RPCs, min_size, max_idle_ms and wait_queue_timeout_ms
+    connect_timeout_ms, socket_timeout_ms, server_selection_timeout_ms
+    compressors: wire compressors by preference, among zstd, snappy and zlib
+    retry_reads, retry_writes: both on by default
+    reads: read_preference and max_staleness_seconds of GetPart, ListParts and AggregateParts; others use the primary,
+        as do GetPart reads filling the part cache
+    """
+
+    def __init__(self, uri, pool=None, timeouts=None, compressors=(), retry_reads=True, retry_writes=True,
+                 read_preference='primary', max_staleness_seconds=None):
+        self.uri = uri
+        self.pool = pool or {}
+        self.timeouts = timeouts or {}
+        self.compressors = list(compressors)
+        self.retry_reads = retry_reads
+        self.retry_writes = retry_writes
+        self.read_preference = read_preference
+        self.max_staleness_seconds = max_staleness_seconds
+
+    @classmethod
+    def from_config(cls, section):
+        """Parse and validate the `database` section, raising InvalidDatabaseConfig"""
+        if isinstance(section, list):
+            section = {'uri': section[0]} if len(section) == 1 else section
+        section = _mapping(section, 'database', _KEYS)
+
+        uri = section.get('uri')
+        if not isinstance(uri, str):
+            raise InvalidDatabaseConfig('Missing database uri')
+        try:
+            uri_parser.parse_uri(uri)
+        except (ConfigurationError, ValueError) as err:
+            raise InvalidDatabaseConfig(f'Invalid database uri: {err}')
+
+        pool = {
+            key: _count(f'pool {key}', value, minimum=1 if key == 'max_size' else 0)
+            for key, value in _mapping(section.get('pool'), 'pool', _POOL_OPTIONS).items()
+        }
+        timeouts = {key: _count(key, section.get(key), minimum=1) for key in _TIMEOUT_OPTIONS}
+
+        compressors = section.get('compressors') or []
+        if not isinstance(compressors, list):
+            raise InvalidDatabaseConfig('Invalid compressors, expected a list')
+        for compressor in compressors:
+            if compressor not in COMPRESSORS:
+                raise InvalidDatabaseConfig(
+                    f'Unknown compressor {compressor!r}, expected one of {", ".join(COMPRESSORS)}'
+                )
+            if importlib.util.find_spec(COMPRESSORS[compressor]) is None:
+                raise InvalidDatabaseConfig(f'Compressor {compressor} needs the {COMPRESSORS[compressor]} module')
+
+        reads = _mapping(section.get('reads'), 'reads', {'read_preference', 'max_staleness_seconds'})
+        read_preference = reads.get('read_preference') or 'primary'
+        if read_preference not in READ_PREFERENCES:
+            raise InvalidDatabaseConfig(
+                f'Invalid read_preference {read_preference!r}, expected one of {", ".join(READ_PREFERENCES)}'
+            )
+        max_staleness = _count('max_staleness_seconds', reads.get('max_staleness_seconds'), minimum=MIN_MAX_STALENESS)
+        if max_staleness is not None and read_preference == 'primary':
+            raise InvalidDatabaseConfig('max_staleness_seconds only applies to reads from secondaries')
+
+        return cls(
+            uri, pool=pool, timeouts=timeouts, compressors=compressors,
+            retry_reads=_flag('retry_reads', section.get('retry_reads', True)),
+            retry_writes=_flag('retry_writes', section.get('retry_writes', True)),
+            read_preference=read_preference, max_staleness_seconds=max_staleness
+        )
+
+    def client_options(self, threads=None):
+        """Keyword arguments of MongoClient, with a pool of `threads` connections unless its size is configured"""
+        options = {'retryReads': self.retry_reads, 'retryWrites': self.retry_writes}
+        if threads is not None:
+            options['maxPoolSize'] = threads
+        options.update((_POOL_OPTIONS[key], value) for key, value in self.pool.items() if value is not None)
+        options.update((_TIMEOUT_OPTIONS[key], value) for key, value in self.timeouts.items() if value is not None)
+        if self.compressors:
+            options['compressors'] = ','.join(self.compressors)
+        return options
+
+    def client(self, threads=None, **kwargs):
+        return pymongo.MongoClient(self.uri, **self.client_options(threads), **kwargs)
+
+    def reads(self):
+        """Read preference of GetPart, ListParts and AggregateParts, None to read from the primary like other RPCs"""
+        if self.read_preference == 'primary':
+            return None
+
+        max_staleness = self.max_staleness_seconds if self.max_staleness_seconds is not None else -1
+        return READ_PREFERENCES[self.read_preference](max_staleness=max_staleness)
@@ -0,0 +1,153 @@
+"""Declarative indexes of the parts collection"""
+
+import logging
+import threading
+
+import pymongo
+from pymongo import IndexModel
+from pymongo.errors import PyMongoError
+
+from avninv.catalog.v1.catalog_pb2 import Part
+from avninv.serde.protobson import InvalidFieldPath, protobuf_path_to_bson_path
+
+
+# Only indexes carrying this prefix are managed, so indexes created by hand are never dropped
+INDEX_PREFIX = 'avninv_'
+
+
+class InvalidIndexSpec(ValueError):
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+_DIRECTIONS = {'asc': pymongo.ASCENDING, 'desc': pymongo.DESCENDING, 'text': pymongo.TEXT}
+
+
+def _bson_key(path):
+    try:
+        return protobuf_path_to_bson_path(Part.DESCRIPTOR, path)
+    except InvalidFieldPath as err:
+        raise InvalidIndexSpec(err.message)
+
+
+def _index_key(field):
+    words = field.split()
+    if len(words) not in (1, 2) or (words[1:] and words[1] not in _DIRECTIONS):
+        raise InvalidIndexSpec(f'Invalid index field "{field}"')
+
+    return words[0], _bson_key(words[0]), _DIRECTIONS[words[1] if words[1:] else 'asc']
+
+
+def _index_options(entry):
+    options = {'unique': True} if entry.get('unique') else {}
+    if entry.get('weights'):
+        options['weights'] = {_bson_key(path): weight for path, weight in entry['weights'].items()}
+    if entry.get('default_language'):
+        options['default_language'] = entry['default_language']
+    return options
+
+
+def index_models(spec):
+    """Translate the `catalog.indexes` config, whose fields are Part field paths, into IndexModels on BSON keys.
+
+    Each entry lists its `fields`, optionally suffixed with `desc` or `text`, and may be `unique`. Text indexes
+    also take `weights`, by field path, and a `default_language`. Index names are derived from the fields, so
+    changing the fields of an entry replaces its index.
+    """
+    models = []
+
+    for entry in spec or []:
+        if not isinstance(entry, dict) or not entry.get('fields'):
+            raise InvalidIndexSpec(f'Invalid index {entry}, expected a list of fields')
+
+        keys = [_index_key(field) for field in entry['fields']]
+        name = INDEX_PREFIX + '_'.join(f'{path}_{direction}' for path, _, direction in keys)
+        models.append(IndexModel([(key, direction) for _, key, direction in keys], name=name, **_index_options(entry)))
+
+    return models
+
+
+def _text_matches(document, info):
+    weights = document.get('weights') or {}
+    return (
+        dict(info['weights']) == {key: weights.get(key, 1) for key, kind in document['key'].items() if kind == 'text'}
+        and info.get('default_language') == document.get('default_language', 'english')
+    )
+
+
+def _matches(model, info):
+    document = model.document
+    if bool(info.get('unique')) != bool(document.get('unique')):
+        return False
+
+    # Text indexes are described by their weighted fields rather than by their keys
+    if 'weights' in info:
+        return _text_matches(document, info)
+
+    keys = [(key, direction if isinstance(direction, str) else int(direction)) for key, direction in info['key']]
+    return keys == list(document['key'].items())
+
+
+def index_plan(collection, models):
+    """Compare the managed indexes of `collection` with `models`: names to create, to drop, and already in place"""
+    existing = {name: info for name, info in collection.index_information().items() if name.startswith(INDEX_PREFIX)}
+    declared = {model.document['name']: model for model in models}
+
+    stale = [name for name, info in existing.items() if name not in declared or not _matches(declared[name], info)]
+    missing = [name for name in declared if name not in existing or name in stale]
+    present = [name for name in declared if name not in missing]
+    return missing, stale, present
+
+
+def reconcile_indexes(collection, models):
+    """Create the declared indexes and drop the managed ones no longer declared as such. Idempotent."""
+    missing, stale, _ = index_plan(collection, models)
+
+    for name in stale:
+        logging.info(f'dropping index {name}')
+        collection.drop_index(name)
+
+    if missing:
+        logging.info(f'creating indexes {", ".join(missing)}')
+        collection.create_indexes([model for model in models if model.document['name'] in missing])
+
+    return missing, stale
+
+
+def reconcile_in_background(uri, models, database='catalog', collection='parts'):
+    """Reconcile indexes from a thread with its own client, so serving starts while they are built"""
+    def run():
+        client = pymongo.MongoClient(uri)
+        try:
+            reconcile_indexes(client[database][collection], models)
+        except PyMongoError as err:
+            logging.error(f'could not reconcile indexes: {str(err)}')
+        finally:
+            client.close()
+
+    thread = threading.Thread(target=run, name='catalog-indexes', daemon=True)
+    thread.start()
+    return thread
+
+
+def _stages(plan):
+    stages = []
+    while plan:
+        stages.append(f'{plan["stage"]} {plan["indexName"]}' if 'indexName' in plan else plan['stage'])
+        plan = plan.get('inputStage') or next(iter(plan.get('inputStages') or []), None)
+    return ' <- '.join(stages)
+
+
+def summarize_explain(explanation):
+    """Winning plan, as a chain of stages, and execution counts of a cursor's explain() output"""
+    winning = explanation['queryPlanner']['winningPlan']
+    stats = explanation.get('executionStats') or {}
+
+    return {
+        # Queries run by the slot based engine nest the classic plan one level down
+        'plan': _stages(winning.get('queryPlan', winning)),
+        'returned': stats.get('nReturned'),
+        'keys_examined': stats.get('totalKeysExamined'),
+        'docs_examined': stats.get('totalDocsExamined')
+    }
@@ -0,0 +1,129 @@
+"""Server interceptors notifying observers of the start and end of every RPC.
+
+Observers implement `start_rpc(method, request)`, returning any state, and `end_rpc(method, state, code)`, called
+with the name of the final status code once the response, or the last message of a stream, was produced.
+"""
+
+import asyncio
+
+import grpc
+
+
+def _method(handler_call_details):
+    return handler_call_details.method.rsplit('/', 1)[-1]
+
+
+def _code(context, failed, cancelled):
+    # Aborted RPCs raise once their code is set. Those the client cancelled or which ran past their deadline end
+    # without one, while other exceptions end them as UNKNOWN.
+    code = context.code()
+    if not code and cancelled:
+        remaining = context.time_remaining()
+        return 'DEADLINE_EXCEEDED' if remaining is not None and remaining <= 0 else 'CANCELLED'
+    if not code:
+        return 'UNKNOWN' if failed else 'OK'
+    if isinstance(code, grpc.StatusCode):
+        return code.name
+    return next((status.name for status in grpc.StatusCode if status.value[0] == code), str(code))
+
+
+def _handler_factory(handler):
+    if handler.unary_unary:
+        return grpc.unary_unary_rpc_method_handler, handler.unary_unary
+    if handler.unary_stream:
+        return grpc.unary_stream_rpc_method_handler, handler.unary_stream
+    if handler.stream_unary:
+        return grpc.stream_unary_rpc_method_handler, handler.stream_unary
+    return grpc.stream_stream_rpc_method_handler, handler.stream_stream
+
+
+class _Observed:
+    def __init__(self, observers):
+        self.observers = observers
+
+    def _start(self, method, request):
+        return [observer.start_rpc(method, request) for observer in self.observers]
+
+    def _end(self, method, states, context, failed, cancelled):
+        code = _code(context, failed, cancelled)
+        for observer, state in zip(self.observers, states):
+            observer.end_rpc(method, state, code)
+
+    def _wrapped(self, handler, handler_call_details):
+        method = _method(handler_call_details)
+        factory, behavior = _handler_factory(handler)
+        wrap = self._wrap_stream if handler.response_streaming else self._wrap_unary
+        return factory(
+            wrap(method, behavior), request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer
+        )
+
+
+class RpcInterceptor(_Observed, grpc.ServerInterceptor):
+    """Interceptor of a grpc.server notifying `observers` of each RPC"""
+
+    def intercept_service(self, continuation, handler_call_details):
+        handler = continuation(handler_call_details)
+        return self._wrapped(handler, handler_call_details) if handler is not None else None
+
+    def _wrap_unary(self, method, behavior):
+        def handle(request, context):
+            states = self._start(method, request)
+            failed = True
+            try:
+                response = behavior(request, context)
+                failed = False
+                return response
+            finally:
+                self._end(method, states, context, failed, not context.is_active())
+        return handle
+
+    def _wrap_stream(self, method, behavior):
+        def handle(request, context):
+            states = self._start(method, request)
+            failed = True
+            try:
+                yield from behavior(request, context)
+                failed = False
+            finally:
+                # Streams of cancelled calls are closed, or return once they see the call is no longer active
+                self._end(method, states, context, failed, not context.is_active())
+        return handle
+
+
+class AsyncRpcInterceptor(_Observed, grpc.aio.ServerInterceptor):
+    """RpcInterceptor for grpc.aio servers, whose RPCs are coroutines or async generators"""
+
+    async def intercept_service(self, continuation, handler_call_details):
+        handler = await continuation(handler_call_details)
+        return self._wrapped(handler, handler_call_details) if handler is not None else None
+
+    def _wrap_unary(self, method, behavior):
+        async def handle(request, context):
+            states = self._start(method, request)
+            failed, cancelled = True, False
+            try:
+                response = await behavior(request, context)
+                failed = False
+                return response
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            finally:
+                self._end(method, states, context, failed, cancelled)
+        return handle
+
+    def _wrap_stream(self, method, behavior):
+        async def handle(request, context):
+            states = self._start(method, request)
+            failed, cancelled = True, False
+            try:
+                async for response in behavior(request, context):
+                    yield response
+                failed = False
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            finally:
+                self._end(method, states, context, failed, cancelled)
+        return handle
@@ -0,0 +1,250 @@
+"""Prometheus metrics of the catalog service: RPCs, the Mongo commands they run and the serving resources.
+
+Metrics are kept in process and rendered in the Prometheus text format by a small HTTP server on their own port.
+"""
+
+import bisect
+import contextvars
+import http.server
+import logging
+import threading
+import time
+
+from pymongo import monitoring
+
+
+# Seconds, from cache hits to slow queries
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ROUND_TRIP_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34)
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Metric either updated by the code it measures, or read from `function` at each scrape"""
+
+    kind = None
+
+    def __init__(self, name, documentation, labels=(), function=None):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.function = function
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def render(self):
+        if self.function is not None:
+            value = self.function()
+            with self._lock:
+                self._values[()] = value
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            lines += self._samples(labels, value)
+        return lines
+
+    def _samples(self, labels, value):
+        return [f'{self.name}{_format_labels(self.labels, labels)} {_format_value(value)}']
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def inc(self, labels=(), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, labels=(), amount=1):
+        self.inc(labels, -amount)
+
+    def set(self, value, labels=()):
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, labels=()):
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                # Per bucket counts, then the sum of the observations
+                counts = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            counts[-1] += value
+
+    def _samples(self, labels, counts):
+        samples = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            bucket_labels = _format_labels(self.labels + ('le',), labels + (_format_value(bound),))
+            samples.append(f'{self.name}_bucket{bucket_labels} {cumulative}')
+
+        labels = _format_labels(self.labels, labels)
+        samples.append(f'{self.name}_sum{labels} {_format_value(counts[-1])}')
+        samples.append(f'{self.name}_count{labels} {cumulative}')
+        return samples
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def _register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labels=(), function=None):
+        return self._register(Counter(name, documentation, labels, function))
+
+    def gauge(self, name, documentation, labels=(), function=None):
+        return self._register(Gauge(name, documentation, labels, function))
+
+    def histogram(self, name, documentation, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labels, buckets))
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines += metric.render()
+        return '\n'.join(lines) + '\n'
+
+
+# Number of Mongo commands run by the current RPC. A new list is set by each RPC, so the commands pymongo runs on
+# its behalf, in the same thread or in a copy of its context, count towards it.
+_rpc_commands = contextvars.ContextVar('catalog_rpc_commands', default=None)
+
+
+class CatalogMetrics:
+    def __init__(self, registry=None):
+        self.registry = registry or Registry()
+
+        self.rpc_duration = self.registry.histogram(
+            'catalog_rpc_duration_seconds', 'Time to handle RPCs, until their last message for streams', ['method']
+        )
+        self.rpc_in_flight = self.registry.gauge('catalog_rpc_in_flight', 'RPCs being handled', ['method'])
+        self.rpc_total = self.registry.counter('catalog_rpc_total', 'RPCs handled, by status code', ['method', 'code'])
+        self.rpc_round_trips = self.registry.histogram(
+            'catalog_rpc_mongo_round_trips', 'Mongo commands run per RPC', ['method'], buckets=ROUND_TRIP_BUCKETS
+        )
+        self.command_duration = self.registry.histogram(
+            'catalog_mongo_command_duration_seconds', 'Time for Mongo to answer commands', ['command']
+        )
+        self.command_failures = self.registry.counter(
+            'catalog_mongo_command_failures_total', 'Mongo commands that failed', ['command']
+        )
+
+        self.command_listener = _CommandListener(self)
+
+    def watch_executor(self, executor):
+        # ThreadPoolExecutor keeps the calls waiting for a thread in a queue it does not expose otherwise
+        self.registry.gauge(
+            'catalog_executor_queue_depth', 'RPCs waiting for a server thread', function=executor._work_queue.qsize
+        )
+
+    def watch_cache(self, cache):
+        for key, documentation in [
+            ('entries', 'Parts in the GetPart cache'), ('bytes', 'Estimated size of the GetPart cache')
+        ]:
+            self.registry.gauge(f'catalog_cache_{key}', documentation, function=lambda key=key: cache.stats()[key])
+        for key, documentation in [
+            ('hits', 'GetPart cache hits'), ('misses', 'GetPart cache misses'), ('evictions', 'GetPart cache evictions')
+        ]:
+            self.registry.counter(
+                f'catalog_cache_{key}_total', documentation, function=lambda key=key: cache.stats()[key]
+            )
+
+    def start_rpc(self, method, request):
+        self.rpc_in_flight.inc((method,))
+        commands = [0]
+        return time.perf_counter(), commands, _rpc_commands.set(commands)
+
+    def end_rpc(self, method, started, code):
+        start, commands, token = started
+        try:
+            _rpc_commands.reset(token)
+        except ValueError:
+            # Streams closed from another context, once abandoned by their client
+            pass
+
+        self.rpc_in_flight.dec((method,))
+        self.rpc_duration.observe(time.perf_counter() - start, (method,))
+        self.rpc_total.inc((method, code))
+        self.rpc_round_trips.observe(commands[0], (method,))
+
+
+class _CommandListener(monitoring.CommandListener):
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    def started(self, event):
+        commands = _rpc_commands.get()
+        if commands is not None:
+            commands[0] += 1
+
+    def succeeded(self, event):
+        self.metrics.command_duration.observe(event.duration_micros / 1e6, (event.command_name,))
+
+    def failed(self, event):
+        self.metrics.command_duration.observe(event.duration_micros / 1e6, (event.command_name,))
+        self.metrics.command_failures.inc((event.command_name,))
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    registry = None
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+
+        body = self.registry.render().encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(registry, port, host=''):
+    """Serve `registry` at http://host:port/metrics from a daemon thread, returning the HTTP server"""
+    handler = type('MetricsHandler', (_MetricsHandler,), {'registry': registry})
+    server = http.server.ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+
+    threading.Thread(target=server.serve_forever, name='catalog-metrics', daemon=True).start()
+    logging.info(f'serving metrics on port {server.server_address[1]}')
+    return server
@@ -0,0 +1,40 @@
+"""Operations shared by the sync and async classes.
+
+An operation is a generator holding the logic of a method once: it yields each I/O call it makes and is sent back its
+result. Sync classes make the call while yielding it, so run() only hands results back; async classes yield the
+awaitables of their motor calls, which run_async() awaits.
+"""
+
+import functools
+import inspect
+
+
+def run(operation):
+    result = None
+    try:
+        while True:
+            result = operation.send(result)
+    except StopIteration as stop:
+        return stop.value
+
+
+async def run_async(operation):
+    result, error = None, None
+    while True:
+        try:
+            step = operation.throw(error) if error is not None else operation.send(result)
+        except StopIteration as stop:
+            return stop.value
+
+        try:
+            result, error = (await step if inspect.isawaitable(step) else step), None
+        except Exception as err:
+            result, error = None, err
+
+
+def operation(method):
+    """Make a method of the operation `method`, run by the `_run` of its class"""
+    @functools.wraps(method)
+    def run_operation(self, *args, **kwargs):
+        return self._run(method(self, *args, **kwargs))
+    return run_operation
@@ -0,0 +1,47 @@
+"""Opaque, tamper-evident page tokens"""
+
+import base64
+import binascii
+import hashlib
+import hmac
+import os
+
+import bson
+from bson.errors import BSONError
+
+from avninv.error.api_error import ApiError, StatusCode
+
+
+class PageTokens:
+    """Signs and verifies the resume position carried by page tokens.
+
+    Tokens are signed with `secret` so clients cannot forge a position. Without a secret a random
+    one is generated, which means tokens are only valid against the process that issued them.
+    """
+
+    _DIGEST_SIZE = 16
+
+    def __init__(self, secret=None):
+        self.secret = secret.encode() if secret else os.urandom(32)
+
+    def _sign(self, payload):
+        return hmac.new(self.secret, payload, hashlib.sha256).digest()[:self._DIGEST_SIZE]
+
+    def encode(self, position):
+        payload = bson.encode(position)
+        return base64.urlsafe_b64encode(self._sign(payload) + payload).rstrip(b'=').decode()
+
+    def decode(self, token):
+        try:
+            raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        except (binascii.Error, ValueError):
+            raise ApiError(StatusCode.INVALID_ARGUMENT, 'Invalid page token')
+
+        signature, payload = raw[:self._DIGEST_SIZE], raw[self._DIGEST_SIZE:]
+        if not hmac.compare_digest(signature, self._sign(payload)):
+            raise ApiError(StatusCode.INVALID_ARGUMENT, 'Invalid page token')
+
+        try:
+            return bson.decode(payload)
+        except BSONError:
+            raise ApiError(StatusCode.INVALID_ARGUMENT, 'Invalid page token')
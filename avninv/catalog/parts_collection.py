@@ -1,55 +1,620 @@
+import base64
+import contextlib
 import logging
+import re
 
-from pymongo.errors import PyMongoError
+from bson import decode as decode_bson, encode as encode_bson
+from bson.errors import InvalidBSON
+from bson.objectid import ObjectId
+from pymongo.errors import ConnectionFailure, OperationFailure, PyMongoError
 
-from avninv.catalog.v1.catalog_pb2 import Part
-from avninv.catalog.collection import Collection, DocumentNotFound, InvalidOid
+from avninv.catalog import profiling
+from avninv.catalog.v1.catalog_pb2 import (
+    AggregatePartsRequest, Part, PartAggregate, PartAttribute, WatchPartsResponse
+)
+from avninv.catalog.collection import (
+    VERSION, Collection, ConditionFailed, DocumentNotFound, InvalidOid, VersionMismatch
+)
+from avninv.catalog.operation import operation, run
 from avninv.error.api_error import ApiError, StatusCode
 from avninv.serde.protobson import (
-    protobuf_to_bson, protobuf_to_update_document, bson_to_protobuf
+    InvalidFieldPath, protobuf_mask_to_projection, protobuf_path_to_bson_path, protobuf_to_bson,
+    protobuf_to_update_document, bson_to_protobuf
 )
+from avninv.serde.protoquery import InvalidQuery, compile_filter, compile_order_by, sort_position
+
+
+# Fields that are derived rather than stored, and so cannot be queried
+_OUTPUT_ONLY = ('name', 'etag')
+
+_MANUFACTURER_PART_NUMBER = protobuf_path_to_bson_path(Part.DESCRIPTOR, 'manufacturer_part_number')
+_SCHEMA_NAME = protobuf_path_to_bson_path(Part.DESCRIPTOR, 'schema_name')
+_ATTRIBUTES = protobuf_path_to_bson_path(Part.DESCRIPTOR, 'attributes')
+_QUANTITY = protobuf_path_to_bson_path(Part.DESCRIPTOR, 'quantity')
+_SUPPLIER = protobuf_path_to_bson_path(Part.DESCRIPTOR, 'suppliers.supplier')
+_ATTRIBUTE, _UNIT, _NUMERIC_VALUE = (
+    protobuf_path_to_bson_path(PartAttribute.DESCRIPTOR, path) for path in ('attribute', 'unit', 'numeric_value')
+)
+
+_PREFIX_SORT = [(_MANUFACTURER_PART_NUMBER, 1), ('_id', 1)]
+
+# Expression of the key each part is grouped by, None for a single group. The distinct suppliers of a part are an
+# array, unwound into one document per supplier.
+_GROUP_KEYS = {
+    AggregatePartsRequest.GROUP_BY_UNSPECIFIED: None,
+    AggregatePartsRequest.SCHEMA_NAME: f'${_SCHEMA_NAME}',
+    AggregatePartsRequest.SUPPLIER: {'$setUnion': [{'$ifNull': [f'${_SUPPLIER}', []]}]}
+}
+_RELEVANCE_SORT = [('score', {'$meta': 'textScore'}), ('_id', 1)]
+
+_EVENT_TYPES = {
+    'insert': WatchPartsResponse.CREATED, 'update': WatchPartsResponse.UPDATED,
+    'replace': WatchPartsResponse.UPDATED, 'delete': WatchPartsResponse.DELETED
+}
+# Longest a watch waits for changes before checking whether its call is still active
+WATCH_POLL_MS = 1000
+# Mongo error codes of change streams resumed after history no longer in the oplog, and of servers without an oplog
+_HISTORY_LOST = (136, 280, 286)
+_NOT_REPLICA_SET = 40573
+
+
+def _all(conditions):
+    return conditions[0] if len(conditions) == 1 else {'$and': conditions}
 
 
 class PartCollection:
-    def __init__(self, collection):
-        self.collection = Collection(collection)
+    """Parts stored in `collection`. GetPart, ListParts and AggregateParts read with `read_preference` when it is set,
+    while every other read follows the writes to the primary, as do the GetPart reads of parts stored in `cache`.
+    AggregateParts results are reused from `memo` if any."""
+
+    collection_class = Collection
+    _run = staticmethod(run)
+
+    def __init__(self, collection, cache=None, read_preference=None, memo=None):
+        self.collection = self.collection_class(collection)
+        self.reads = self.collection
+        if read_preference is not None:
+            self.reads = self.collection_class(collection.with_options(read_preference=read_preference))
+        self.cache = cache
+        self.memo = memo
 
+    @staticmethod
+    def _to_api_error(err, operation):
+        if isinstance(err, DocumentNotFound):
+            return ApiError(StatusCode.NOT_FOUND, 'No such part')
+
+        if isinstance(err, InvalidOid):
+            return ApiError(StatusCode.INVALID_ARGUMENT, 'Invalid name')
+
+        if isinstance(err, ConditionFailed):
+            return ApiError(StatusCode.FAILED_PRECONDITION, 'The schema_name of the part differs from the update')
+
+        if isinstance(err, VersionMismatch):
+            return ApiError(StatusCode.ABORTED, 'The part was updated since its etag was read')
+
+        if isinstance(err, OperationFailure) and err.code in _HISTORY_LOST:
+            return ApiError(StatusCode.OUT_OF_RANGE, 'The resume_token expired, parts must be listed again')
+
+        if isinstance(err, OperationFailure) and err.code == _NOT_REPLICA_SET:
+            logging.error(f'cannot watch parts: {str(err)}')
+            return ApiError(StatusCode.FAILED_PRECONDITION, 'Watching parts requires a replica set')
+
+        if isinstance(err, ConnectionFailure):
+            # Includes waiting too long for a pooled connection: the client may retry elsewhere or later
+            logging.warning(f'database unavailable: {str(err)}')
+            return ApiError(StatusCode.UNAVAILABLE, 'Database unavailable')
+
+        logging.error(f'error running {operation} on parts: {str(err)}')
+        return ApiError(StatusCode.INTERNAL, 'Internal error')
+
+    @contextlib.contextmanager
+    def _translate_errors(self, operation):
+        try:
+            yield
+        except (DocumentNotFound, InvalidOid, ConditionFailed, VersionMismatch, PyMongoError) as err:
+            raise self._to_api_error(err, operation)
+
+    @operation
     def _safe_execute(self, method, *args, **kwargs):
+        with self._translate_errors(method.__name__):
+            return (yield method(*args, **kwargs))
+
+    @staticmethod
+    def _etag(bson):
+        return str(bson.get(VERSION, 0))
+
+    @staticmethod
+    def parse_etag(etag):
+        """Version of the part an etag was read from, None for no etag"""
+        if not etag:
+            return None
+        if not etag.isdigit():
+            raise ApiError(StatusCode.INVALID_ARGUMENT, 'Invalid etag')
+        return int(etag)
+
+    @staticmethod
+    def _to_part(bson):
+        part = profiling.converted(bson_to_protobuf, bson, Part)
+        part.name = f'orgs/main/parts/{str(bson["_id"])}'
+        part.etag = PartCollection._etag(bson)
+        return part
+
+    @staticmethod
+    def _projection(read_mask):
+        # Only the masked fields are fetched and converted; the name comes from _id, which Mongo always returns
+        if not read_mask or '*' in read_mask:
+            return None
+
+        try:
+            projection = protobuf_mask_to_projection(Part.DESCRIPTOR, read_mask)
+        except InvalidFieldPath:
+            raise ApiError(StatusCode.INVALID_ARGUMENT, 'Invalid read mask')
+        projection[VERSION] = 1
+        return projection
+
+    @operation
+    def _unmodified(self, oid, if_none_match):
+        """Name and etag of the part when its etag is `if_none_match`, looking it up in the cache or fetching the etag
+        alone"""
+        part, _, _ = self._cache_lookup(oid)
+        if part is None:
+            bson = yield self._safe_execute(self.reads.get, oid, [VERSION])
+            part = Part(name=f'orgs/main/parts/{str(bson["_id"])}', etag=self._etag(bson))
+        return Part(name=part.name, etag=part.etag) if part.etag == if_none_match else None
+
+    def _list_query(self, read_mask, filter, order_by):
+        try:
+            query = compile_filter(Part.DESCRIPTOR, filter, exclude=_OUTPUT_ONLY)
+            sort = compile_order_by(Part.DESCRIPTOR, order_by, exclude=_OUTPUT_ONLY)
+        except InvalidQuery as err:
+            raise ApiError(StatusCode.INVALID_ARGUMENT, err.message)
+
+        # The position of the last part is read from its sort keys, so they are fetched even when not requested
+        projection = self._projection(read_mask)
+        hidden = []
+        if projection is not None:
+            for key, _ in sort[:-1]:
+                if not any(key == path or key.startswith(f'{path}.') for path in projection):
+                    projection[key] = 1
+                    hidden.append(key)
+
+        return query, sort, projection, hidden
+
+    @staticmethod
+    def _search_query(predicates):
+        # A single $elemMatch per predicate keeps the name, unit and bounds on the same attribute, which lets
+        # Mongo intersect the bounds of an (attribute, unit, numeric_value) multikey index
+        conditions = []
+        for predicate in predicates:
+            match = {_ATTRIBUTE: predicate.attribute}
+            if predicate.unit:
+                match[_UNIT] = predicate.unit
+
+            bounds = {}
+            if predicate.HasField('min_value'):
+                bounds['$gte'] = predicate.min_value
+            if predicate.HasField('max_value'):
+                bounds['$lte'] = predicate.max_value
+            if bounds:
+                match[_NUMERIC_VALUE] = bounds
+
+            conditions.append({_ATTRIBUTES: {'$elemMatch': match}})
+
+        return _all(conditions)
+
+    @staticmethod
+    def _text_queries(predicates, text):
+        """Queries for the parts whose MPN starts with `text` when it is a single word, and for the other parts
+        matching every word of `text` in the text index"""
+        conditions = [PartCollection._search_query(predicates)] if predicates else []
+        words = text.replace('"', ' ').split()
+
+        # Quoting words makes each of them required rather than optional
+        search = {'$text': {'$search': ' '.join(f'"{word}"' for word in words)}}
+        if len(words) != 1:
+            return None, _all(conditions + [search])
+
+        # MPNs are matched as typed and uppercased; unlike a case insensitive regex, anchored prefixes use an index
+        prefix = {_MANUFACTURER_PART_NUMBER: {
+            '$in': [re.compile(f'^{re.escape(word)}') for word in dict.fromkeys([words[0], words[0].upper()])]
+        }}
+        return _all(conditions + [prefix]), _all(conditions + [search, {'$nor': [prefix]}])
+
+    @staticmethod
+    def _aggregate_pipeline(group_by, filter, low_stock_quantity):
+        if group_by not in _GROUP_KEYS:
+            raise ApiError(StatusCode.INVALID_ARGUMENT, 'Invalid group_by')
+        try:
+            query = compile_filter(Part.DESCRIPTOR, filter, exclude=_OUTPUT_ONLY)
+        except InvalidQuery as err:
+            raise ApiError(StatusCode.INVALID_ARGUMENT, err.message)
+
+        # Only the key and quantity of each part leave the first stages
+        key = _GROUP_KEYS[group_by]
+        pipeline = [{'$match': query}] if query else []
+        pipeline.append({'$project': {
+            '_id': 0, 'quantity': {'$ifNull': [f'${_QUANTITY}', 0]}, **({'key': key} if key is not None else {})
+        }})
+        if group_by == AggregatePartsRequest.SUPPLIER:
+            pipeline.append({'$unwind': {'path': '$key', 'preserveNullAndEmptyArrays': True}})
+
+        return pipeline + [
+            {'$group': {
+                '_id': '$key' if key is not None else None,
+                'part_count': {'$sum': 1},
+                'total_quantity': {'$sum': '$quantity'},
+                'low_stock_count': {'$sum': {'$cond': [{'$lt': ['$quantity', low_stock_quantity]}, 1, 0]}}
+            }},
+            {'$sort': {'_id': 1}}
+        ]
+
+    @staticmethod
+    def _aggregates(group_by, bsons):
+        groups = [
+            PartAggregate(
+                key=bson['_id'] or '', part_count=bson['part_count'], total_quantity=int(bson['total_quantity']),
+                low_stock_count=bson['low_stock_count']
+            )
+            for bson in bsons
+        ]
+        # Mongo has no group for an empty inventory, which still has a summary
+        if not groups and group_by == AggregatePartsRequest.GROUP_BY_UNSPECIFIED:
+            groups.append(PartAggregate())
+        return groups
+
+    @staticmethod
+    def _resume_token(change_id):
+        # Change ids are opaque documents, passed to clients as URL safe base64 of their BSON
+        if change_id is None:
+            return ''
+        return base64.urlsafe_b64encode(encode_bson(change_id)).decode()
+
+    @staticmethod
+    def _resume_after(resume_token):
+        if not resume_token:
+            return None
         try:
-            return method(*args, **kwargs)
+            return decode_bson(base64.urlsafe_b64decode(resume_token))
+        except (ValueError, InvalidBSON):
+            raise ApiError(StatusCode.INVALID_ARGUMENT, 'Invalid resume_token')
 
-        except DocumentNotFound:
-            raise ApiError(StatusCode.NOT_FOUND, 'No such part')
+    def _event(self, change):
+        """WatchPartsResponse of a change, None for the update of a part deleted before the change was read"""
+        event_type = _EVENT_TYPES[change['operationType']]
+        if event_type == WatchPartsResponse.DELETED:
+            part = Part(name=f'orgs/main/parts/{str(change["documentKey"]["_id"])}')
+        elif change.get('fullDocument') is not None:
+            part = self._to_part(change['fullDocument'])
+        else:
+            return None
+        return WatchPartsResponse(event_type=event_type, part=part, resume_token=self._resume_token(change['_id']))
 
-        except InvalidOid:
-            raise ApiError(StatusCode.INVALID_ARGUMENT, 'Invalid name')
+    def _memoized(self, key):
+        return self.memo.get(key) if self.memo is not None else None
 
-        except PyMongoError as err:
-            logging.error(f'error updating part: {str(err)}')
-            raise ApiError(StatusCode.INTERNAL, 'Internal error')
+    def _memoize(self, key, result):
+        if self.memo is not None:
+            self.memo.put(key, result)
 
-    def update(self, oid, part, fields_mask):
-        bson = protobuf_to_update_document(part, fields_mask)
-        self._safe_execute(self.collection.update, oid, bson)
+    def _offset_page(self, bsons, page_size, offset):
+        position = None
+        if len(bsons) > page_size:
+            bsons = bsons[:page_size]
+            position = offset + page_size
 
+        return [self._to_part(bson) for bson in bsons], position
+
+    @staticmethod
+    def _without(bson, keys):
+        for key in keys:
+            *parents, last = key.split('.')
+            document = bson
+            for parent in parents:
+                document = document.get(parent) if isinstance(document, dict) else None
+            if isinstance(document, dict):
+                document.pop(last, None)
+        return bson
+
+    def _page(self, bsons, page_size, sort, hidden):
+        # One extra document is fetched so a next page is detected without a separate count
+        position = None
+        if len(bsons) > page_size:
+            bsons = bsons[:page_size]
+            position = sort_position(sort, bsons[-1])
+
+        return [self._to_part(self._without(bson, hidden)) for bson in bsons], position
+
+    def _cache_lookup(self, oid):
+        # The generation is taken before reading from Mongo, so a concurrent invalidation prevents caching a stale part
+        if self.cache is None or not ObjectId.is_valid(oid):
+            return None, None, None
+
+        key = ObjectId(oid)
+        return self.cache.get(key), key, self.cache.generation()
+
+    def _cache_store(self, key, part, generation):
+        if key is not None:
+            self.cache.put(key, part, generation)
+
+    @contextlib.contextmanager
+    def _invalidating(self, oids):
+        # Invalidate even if the write failed: a missing part must not keep being served from the cache
+        try:
+            yield
+        finally:
+            if self.cache is not None:
+                self.cache.invalidate([ObjectId(oid) for oid in oids if ObjectId.is_valid(oid)])
+
+    def _to_results(self, results, operation):
+        # Batch operations return one document, id or exception per item; exceptions become per-item ApiErrors
+        return [
+            self._to_api_error(result, operation) if isinstance(result, Exception) else result for result in results
+        ]
+
+    @staticmethod
+    def _to_parts(results):
+        return [result if isinstance(result, ApiError) else PartCollection._to_part(result) for result in results]
+
+    @staticmethod
+    def _insert_documents(parts):
+        for part in parts:
+            part.name = ''
+            part.etag = ''
+        return [profiling.converted(protobuf_to_bson, part) for part in parts]
+
+    def _inserted(self, bsons, results):
+        # insert_many sets the _id of each document in place, failed or not
+        return [result if isinstance(result, ApiError) else self._to_part(bson) for bson, result in zip(bsons, results)]
+
+    @staticmethod
+    def _schema_condition(schema_guard):
+        """Condition on the stored schema_name of a part for an update validated against a schema to apply.
+
+        Guards are (schema_name, registered schema names): parts must name the same registered schema, or none.
+        """
+        if schema_guard is None:
+            return None
+
+        schema_name, registered = schema_guard
+        if schema_name in registered:
+            return {_SCHEMA_NAME: schema_name}
+        return {_SCHEMA_NAME: {'$nin': list(registered)}}
+
+    @operation
+    def update(self, oid, part, fields_mask, schema_guard=None, version=None):
+        """Update the part `oid`, only if it is still at `version` when given"""
+        part.etag = ''
+        bson = profiling.converted(protobuf_to_update_document, part, fields_mask)
+        profiling.note_update(bson)
+        condition = self._schema_condition(schema_guard)
+        with self._invalidating([oid]):
+            return self._to_part((yield self._safe_execute(self.collection.update, oid, bson, condition, version)))
+
+    @staticmethod
+    def _quantity_condition(delta, min_quantity, max_quantity):
+        # Parts of quantity 0 store none
+        quantity = {'$add': [{'$ifNull': [f'${_QUANTITY}', 0]}, delta]}
+        bounds = [{'$gte': [quantity, min_quantity]}]
+        if max_quantity is not None:
+            bounds.append({'$lte': [quantity, max_quantity]})
+        return {'$expr': _all(bounds)}
+
+    @staticmethod
+    def _adjusted_projection(read_mask):
+        projection = PartCollection._projection(read_mask)
+        if projection is not None:
+            projection[_QUANTITY] = 1
+        return projection
+
+    @operation
+    def adjust_quantity(self, oid, delta, min_quantity=0, max_quantity=None, read_mask=None):
+        """Add `delta` to the quantity of the part `oid` with a single $inc, only if the result stays within bounds"""
+        projection = self._adjusted_projection(read_mask)
+        condition = self._quantity_condition(delta, min_quantity, max_quantity)
+        profiling.note_update({'$inc': {_QUANTITY: delta}})
+
+        with self._invalidating([oid]), self._translate_errors('increment'):
+            try:
+                bson = yield self.collection.increment(oid, {_QUANTITY: delta}, condition, projection)
+            except ConditionFailed:
+                raise ApiError(StatusCode.FAILED_PRECONDITION, 'The adjusted quantity would be out of bounds')
+        return self._to_part(bson)
+
+    @operation
+    def _adjustment(self, adjustment):
+        try:
+            return (yield self.adjust_quantity(*adjustment))
+        except ApiError as err:
+            return err
+
+    @operation
+    def adjust_quantities(self, adjustments):
+        """Apply (oid, delta, min_quantity, max_quantity, read_mask) adjustments in order, one write each: a bulk
+        write does not tell which of its updates were within bounds"""
+        results = []
+        for adjustment in adjustments:
+            results.append((yield self._adjustment(adjustment)))
+        return results
+
+    @operation
     def delete(self, oid):
-        self._safe_execute(self.collection.delete, oid)
+        with self._invalidating([oid]):
+            yield self._safe_execute(self.collection.delete, oid)
 
+    @operation
     def insert(self, part):
         part.name = ''
-        bson = protobuf_to_bson(part)
-        return self._safe_execute(self.collection.insert, bson)
+        part.etag = ''
+        bson = profiling.converted(protobuf_to_bson, part)
+        # The inserted document is exactly what get() would read back, only missing its generated _id
+        bson['_id'] = yield self._safe_execute(self.collection.insert, bson)
+        return self._to_part(bson)
 
-    def get(self, oid):
-        bson = self._safe_execute(self.collection.get, oid)
-        part = bson_to_protobuf(bson, Part)
-        part.name = f'orgs/main/parts/{str(bson["_id"])}'
+    @operation
+    def get(self, oid, read_mask=None, if_none_match=''):
+        if if_none_match:
+            unmodified = yield self._unmodified(oid, if_none_match)
+            if unmodified is not None:
+                return unmodified
+
+        # Trimmed parts are neither served from nor stored in the cache, which only holds complete parts
+        projection = self._projection(read_mask)
+        if projection is not None:
+            return self._to_part((yield self._safe_execute(self.reads.get, oid, projection)))
+
+        part, key, generation = self._cache_lookup(oid)
+        if part is None:
+            # A lagging secondary could return a part invalidated already, which would then stay cached
+            reads = self.reads if key is None else self.collection
+            part = self._to_part((yield self._safe_execute(reads.get, oid)))
+            self._cache_store(key, part, generation)
         return part
 
-    def list(self):
-        bsons = self._safe_execute(self.collection.list)
+    def list(self, limit=None, after=None, batch_size=None, read_mask=None):
+        projection = self._projection(read_mask)
+
+        # find() is lazy, so errors surface while iterating and must be translated there too
+        with self._translate_errors('list'):
+            bsons = self.collection.list(limit=limit, after=after, batch_size=batch_size, projection=projection)
+            with contextlib.closing(bsons):
+                for bson in bsons:
+                    yield self._to_part(bson)
+
+    @operation
+    def list_page(self, page_size, after=None, read_mask=None, filter='', order_by=''):
+        """Return a page of parts matching `filter` and the position to pass as `after` for the next one, if any"""
+        query, sort, projection, hidden = self._list_query(read_mask, filter, order_by)
+
+        bsons = yield self._safe_execute(
+            self.reads.fetch, limit=page_size + 1, after=after, projection=projection, query=query, sort=sort
+        )
+        return self._page(bsons, page_size, sort, hidden)
+
+    @operation
+    def search_page(self, page_size, predicates, after=None, read_mask=None, text=''):
+        """Return a page of parts matching `predicates` and `text`, and the position of the next one if any.
+
+        Parts are ordered by _id, or by relevance with a `text` query, in which case positions are offsets.
+        """
+        projection = self._projection(read_mask)
+        if text:
+            return (yield self._text_search_page(page_size, predicates, text, after or 0, projection))
+
+        bsons = yield self._safe_execute(
+            self.collection.fetch, limit=page_size + 1, after=after, projection=projection,
+            query=self._search_query(predicates)
+        )
+        return self._page(bsons, page_size, [('_id', 1)], [])
+
+    @operation
+    def _text_search_page(self, page_size, predicates, text, offset, projection):
+        prefix_query, text_query = self._text_queries(predicates, text)
+
+        with self._translate_errors('text search'):
+            bsons = []
+            skip = offset
+            if prefix_query is not None:
+                bsons = yield self.collection.fetch(
+                    limit=page_size + 1, skip=offset, projection=projection, query=prefix_query, sort=_PREFIX_SORT
+                )
+                # Text matches come after every prefix match. Unless this page holds the last of those, counting the
+                # skipped prefix matches tells how many text matches to skip.
+                if not bsons and offset:
+                    skip = max(0, offset - (yield self.collection.count(prefix_query, limit=offset)))
+                else:
+                    skip = 0
+
+            if len(bsons) <= page_size:
+                bsons += yield self.collection.fetch(
+                    limit=page_size + 1 - len(bsons), skip=skip, projection=projection, query=text_query,
+                    sort=_RELEVANCE_SORT
+                )
+
+        return self._offset_page(bsons, page_size, offset)
+
+    @operation
+    def get_many(self, oids):
+        results = yield self._safe_execute(self.collection.get_many, oids)
+        return self._to_parts(self._to_results(results, 'get_many'))
 
+    @operation
+    def insert_many(self, parts):
+        bsons = self._insert_documents(parts)
+        results = yield self._safe_execute(self.collection.insert_many, bsons)
+        return self._inserted(bsons, self._to_results(results, 'insert_many'))
+
+    def _bulk_updates(self, updates):
+        oids = [oid for oid, _, _, _, _ in updates]
+        bsons = [
+            profiling.converted(protobuf_to_update_document, part, fields_mask)
+            for _, part, fields_mask, _, _ in updates
+        ]
         for bson in bsons:
-            part = bson_to_protobuf(bson, Part)
-            part.name = f'orgs/main/parts/{str(bson["_id"])}'
-            yield part
+            profiling.note_update(bson)
+        return oids, bsons, [self._schema_condition(schema_guard) for _, _, _, schema_guard, _ in updates]
+
+    @staticmethod
+    def _merge_updates(updates, versioned, bulk):
+        versioned, bulk = iter(versioned), iter(bulk)
+        return [next(bulk) if version is None else next(versioned) for _, _, _, _, version in updates]
+
+    @operation
+    def _versioned_update(self, update):
+        try:
+            return (yield self.update(*update))
+        except ApiError as err:
+            return err
+
+    @operation
+    def update_many(self, updates):
+        """Apply (oid, part, fields_mask, schema_guard, version) updates.
+
+        Updates of a given version are applied one by one, as are those with a schema guard by the collection: a bulk
+        write does not tell which of its updates matched.
+        """
+        versioned = []
+        for update in updates:
+            if update[4] is not None:
+                versioned.append((yield self._versioned_update(update)))
+        oids, bsons, conditions = self._bulk_updates([update for update in updates if update[4] is None])
+
+        with self._invalidating(oids):
+            results = yield self._safe_execute(self.collection.update_many, oids, bsons, conditions)
+            bulk = self._to_parts(self._to_results(results, 'update_many'))
+        return self._merge_updates(updates, versioned, bulk)
+
+    @operation
+    def aggregate(self, group_by, filter='', low_stock_quantity=0):
+        """PartAggregates of the parts matching `filter` by `group_by` key, computed by Mongo and memoized when the
+        collection has a memo"""
+        key = (group_by, filter, low_stock_quantity)
+        groups = self._memoized(key)
+        if groups is None:
+            pipeline = self._aggregate_pipeline(group_by, filter, low_stock_quantity)
+            groups = self._aggregates(group_by, (yield self._safe_execute(self.reads.aggregate, pipeline)))
+            self._memoize(key, groups)
+        return groups
+
+    def watch(self, resume_token='', is_active=None, poll_ms=WATCH_POLL_MS):
+        """Generate a WatchPartsResponse of the starting point of the watch, then one per change to the parts, until
+        `is_active` returns False. It is checked at least every `poll_ms`, changes or not."""
+        resume_after = self._resume_after(resume_token)
+
+        with self._translate_errors('watch'):
+            with self.collection.watch(resume_after, max_await_time_ms=poll_ms) as stream:
+                yield WatchPartsResponse(resume_token=self._resume_token(stream.resume_token))
+                while stream.alive and (is_active is None or is_active()):
+                    change = stream.try_next()
+                    event = self._event(change) if change is not None else None
+                    if event is not None:
+                        yield event
+
+    @operation
+    def has_schema(self, schema_name):
+        return bool((yield self._safe_execute(self.collection.count, {_SCHEMA_NAME: schema_name}, limit=1)))
+
+    @operation
+    def delete_many(self, oids):
+        with self._invalidating(oids):
+            results = yield self._safe_execute(self.collection.delete_many, oids)
+            return self._to_results(results, 'delete_many')
@@ -0,0 +1,243 @@
+"""On-demand profiling of a running catalog server: sampled CPU profiles, tracemalloc snapshots and a log of slow
+requests, all written to a directory of the pod rather than requiring a profiler to be attached.
+
+CPU profiles are written as folded stacks, one `frame;frame;... count` line per distinct stack, as read by
+flamegraph.pl or speedscope. Memory snapshots are tracemalloc dumps, loadable with tracemalloc.Snapshot.load, next to
+a text summary of their largest allocation sites.
+"""
+
+import collections
+import contextvars
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+
+from bson import json_util
+from pymongo import monitoring
+
+from avninv.error.api_error import ApiError, StatusCode
+
+
+DEFAULT_CPU_SECONDS = 30
+MAX_CPU_SECONDS = 600
+SAMPLE_INTERVAL = 0.005
+# Frames kept per traced allocation, and allocation sites listed in the summary of memory snapshots
+TRACEBACK_FRAMES = 10
+TOP_ALLOCATIONS = 50
+
+
+class _RequestTrace:
+    __slots__ = ('request_bytes', 'conversion', 'mongo', 'commands', 'updates')
+
+    def __init__(self, request_bytes):
+        self.request_bytes = request_bytes
+        self.conversion = 0.0
+        self.mongo = 0.0
+        self.commands = 0
+        self.updates = []
+
+
+# Trace of the current RPC, only set while slow requests are logged
+_trace = contextvars.ContextVar('catalog_request_trace', default=None)
+
+
+def converted(function, *args):
+    """Return function(*args), counting its time as protobson conversion time of the current RPC"""
+    trace = _trace.get()
+    if trace is None:
+        return function(*args)
+
+    start = time.perf_counter()
+    try:
+        return function(*args)
+    finally:
+        trace.conversion += time.perf_counter() - start
+
+
+def note_update(bson):
+    """Record the update document sent to Mongo by the current RPC"""
+    trace = _trace.get()
+    if trace is not None:
+        trace.updates.append(bson)
+
+
+def _request_bytes(request):
+    # Streaming requests are iterators, of no known size
+    byte_size = getattr(request, 'ByteSize', None)
+    return byte_size() if byte_size is not None else None
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+def _folded_stack(frame, thread_name):
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame))
+        frame = frame.f_back
+    names.append(thread_name)
+    return ';'.join(reversed(names))
+
+
+class Profiler:
+    """Profiling surface of a catalog server process, writing its output to `directory`.
+
+    Slow requests are logged when `slow_request_ms` is set, once the Profiler observes the RPCs through an
+    interceptor and the Mongo commands through its `command_listener`.
+    """
+
+    def __init__(self, directory, slow_request_ms=None, cpu_seconds=DEFAULT_CPU_SECONDS, interval=SAMPLE_INTERVAL):
+        self.directory = directory
+        self.slow_request_ms = slow_request_ms
+        self.cpu_seconds = cpu_seconds
+        self.interval = interval
+        self.command_listener = _CommandListener()
+
+        self._cpu_profile = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, kind, extension):
+        timestamp = time.strftime('%Y%m%dT%H%M%S')
+        return os.path.join(self.directory, f'{kind}-{os.getpid()}-{timestamp}.{extension}')
+
+    def set_slow_request_threshold(self, threshold_ms):
+        """Log the requests taking at least `threshold_ms`, or none when it is None"""
+        self.slow_request_ms = threshold_ms
+
+    def start_rpc(self, method, request):
+        if self.slow_request_ms is None:
+            return None
+
+        trace = _RequestTrace(_request_bytes(request))
+        return time.perf_counter(), trace, _trace.set(trace)
+
+    def end_rpc(self, method, started, code):
+        if started is None:
+            return
+
+        start, trace, token = started
+        elapsed = time.perf_counter() - start
+        try:
+            _trace.reset(token)
+        except ValueError:
+            pass
+
+        threshold = self.slow_request_ms
+        if threshold is not None and elapsed * 1e3 >= threshold:
+            self._log_slow_request(method, code, elapsed, trace)
+
+    def _log_slow_request(self, method, code, elapsed, trace):
+        entry = {
+            'time': time.time(), 'method': method, 'code': code, 'duration_ms': elapsed * 1e3,
+            'request_bytes': trace.request_bytes, 'conversion_ms': trace.conversion * 1e3,
+            'mongo_ms': trace.mongo * 1e3, 'mongo_commands': trace.commands, 'updates': trace.updates
+        }
+        line = json_util.dumps(entry) + '\n'
+        with self._lock:
+            with open(os.path.join(self.directory, f'slow-requests-{os.getpid()}.jsonl'), 'a') as log:
+                log.write(line)
+
+    def profile_cpu(self, seconds=None):
+        """Start sampling the stacks of every thread for `seconds` and return the path the profile will be written to
+        once done. Only one profile runs at a time."""
+        seconds = seconds or self.cpu_seconds
+        if not 0 < seconds <= MAX_CPU_SECONDS:
+            raise ApiError(StatusCode.INVALID_ARGUMENT, f'CPU profiles last up to {MAX_CPU_SECONDS} seconds')
+
+        with self._lock:
+            if self._cpu_profile is not None:
+                raise ApiError(StatusCode.FAILED_PRECONDITION, f'Already profiling to {self._cpu_profile}')
+            self._cpu_profile = path = self._path('cpu', 'folded')
+
+        threading.Thread(
+            target=self._sample, args=(path, seconds), name='catalog-cpu-profile', daemon=True
+        ).start()
+        logging.info(f'profiling CPU for {seconds}s to {path}')
+        return path
+
+    def _sample(self, path, seconds):
+        stacks = collections.Counter()
+        own = threading.get_ident()
+        deadline = time.monotonic() + seconds
+        try:
+            while time.monotonic() < deadline:
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for ident, frame in sys._current_frames().items():
+                    if ident != own:
+                        stacks[_folded_stack(frame, names.get(ident, str(ident)))] += 1
+                time.sleep(self.interval)
+
+            with open(path, 'w') as profile:
+                for stack, count in stacks.most_common():
+                    profile.write(f'{stack} {count}\n')
+            logging.info(f'wrote CPU profile {path}')
+        except OSError as err:
+            logging.error(f'could not write CPU profile {path}: {err}')
+        finally:
+            with self._lock:
+                self._cpu_profile = None
+
+    def snapshot_memory(self, stop=False):
+        """Start tracing allocations, or dump a snapshot of the allocations traced so far and return its path.
+
+        Tracing slows allocations and holds memory of its own, so it only runs once asked for, and until `stop`.
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEBACK_FRAMES)
+            logging.info('tracing memory allocations')
+            return None
+
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, '<frozen importlib._bootstrap*>')
+        ])
+        current, peak = tracemalloc.get_traced_memory()
+        if stop:
+            tracemalloc.stop()
+
+        path = self._path('memory', 'snapshot')
+        try:
+            snapshot.dump(path)
+            with open(f'{path}.txt', 'w') as summary:
+                summary.write(f'traced: {current} bytes, peak: {peak} bytes\n')
+                for stat in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]:
+                    summary.write(f'{stat}\n')
+        except OSError as err:
+            raise ApiError(StatusCode.INTERNAL, f'Could not write memory snapshot: {err}')
+
+        logging.info(f'wrote memory snapshot {path}')
+        return path
+
+    def handle_signal(self, signum, *_):
+        """Signal handler: SIGUSR1 profiles the CPU, SIGUSR2 starts tracing memory then takes a final snapshot"""
+        try:
+            if signum == signal.SIGUSR1:
+                self.profile_cpu()
+            else:
+                self.snapshot_memory(stop=True)
+        except ApiError as err:
+            logging.warning(err.message)
+
+
+SIGNALS = (signal.SIGUSR1, signal.SIGUSR2)
+
+
+class _CommandListener(monitoring.CommandListener):
+    def started(self, event):
+        trace = _trace.get()
+        if trace is not None:
+            trace.commands += 1
+
+    def succeeded(self, event):
+        trace = _trace.get()
+        if trace is not None:
+            trace.mongo += event.duration_micros / 1e6
+
+    def failed(self, event):
+        self.succeeded(event)
@@ -0,0 +1,112 @@
+import contextlib
+import logging
+
+from bson.objectid import ObjectId
+from pymongo.errors import ConnectionFailure, PyMongoError
+
+from avninv.catalog.collection import Collection, DocumentNotFound, InvalidOid
+from avninv.catalog.operation import operation, run
+from avninv.catalog.schemas import SchemaRegistry
+from avninv.catalog.v1.catalog_pb2 import PartSchema
+from avninv.error.api_error import ApiError, StatusCode
+from avninv.serde.protobson import bson_to_protobuf, protobuf_to_bson, protobuf_to_update_document
+
+
+class PartSchemaCollection:
+    """PartSchemas stored in their own collection and served from a SchemaRegistry kept up to date by writes"""
+
+    collection_class = Collection
+    _run = staticmethod(run)
+
+    def __init__(self, collection, registry=None):
+        self.collection = self.collection_class(collection)
+        self.registry = registry if registry is not None else SchemaRegistry()
+
+    @staticmethod
+    def _to_api_error(err, operation):
+        if isinstance(err, DocumentNotFound):
+            return ApiError(StatusCode.NOT_FOUND, 'No such part schema')
+
+        if isinstance(err, InvalidOid):
+            return ApiError(StatusCode.INVALID_ARGUMENT, 'Invalid name')
+
+        if isinstance(err, ConnectionFailure):
+            logging.warning(f'database unavailable: {str(err)}')
+            return ApiError(StatusCode.UNAVAILABLE, 'Database unavailable')
+
+        logging.error(f'error running {operation} on part schemas: {str(err)}')
+        return ApiError(StatusCode.INTERNAL, 'Internal error')
+
+    @contextlib.contextmanager
+    def _translate_errors(self, operation):
+        try:
+            yield
+        except (DocumentNotFound, InvalidOid, PyMongoError) as err:
+            raise self._to_api_error(err, operation)
+
+    @operation
+    def _safe_execute(self, method, *args, **kwargs):
+        with self._translate_errors(method.__name__):
+            return (yield method(*args, **kwargs))
+
+    @staticmethod
+    def _name(oid):
+        return f'orgs/main/partschemas/{str(ObjectId(oid))}'
+
+    @staticmethod
+    def _to_schema(bson):
+        schema = bson_to_protobuf(bson, PartSchema)
+        schema.name = PartSchemaCollection._name(bson['_id'])
+        return schema
+
+    @operation
+    def refresh(self, force=False):
+        """Reload every schema into the registry once it expired"""
+        if force or self.registry.stale():
+            bsons = yield self._safe_execute(self.collection.fetch)
+            self.registry.replace([self._to_schema(bson) for bson in bsons])
+
+    def get(self, oid):
+        if not ObjectId.is_valid(oid):
+            raise self._to_api_error(InvalidOid(oid), 'get')
+
+        schema = self.registry.get(self._name(oid))
+        if schema is None:
+            raise ApiError(StatusCode.NOT_FOUND, 'No such part schema')
+        return schema
+
+    def list_page(self, page_size, after=None):
+        """Return a page of schemas and the name to pass as `after` for the next one, if any"""
+        schemas, more = self.registry.list(page_size, after=after)
+        return schemas, schemas[-1].name if more else None
+
+    @operation
+    def insert(self, schema):
+        schema.name = ''
+        bson = protobuf_to_bson(schema)
+        bson['_id'] = yield self._safe_execute(self.collection.insert, bson)
+
+        schema = self._to_schema(bson)
+        self.registry.put(schema)
+        return schema
+
+    @operation
+    def update(self, oid, schema, fields_mask):
+        schema.name = ''
+        bson = protobuf_to_update_document(schema, fields_mask)
+
+        schema = self._to_schema((yield self._safe_execute(self.collection.update, oid, bson)))
+        self.registry.put(schema)
+        return schema
+
+    @operation
+    def delete(self, oid):
+        """Delete the schema `oid`, returning its document to restore() it"""
+        bson = yield self._safe_execute(self.collection.pop, oid)
+        self.registry.remove(self._name(oid))
+        return bson
+
+    @operation
+    def restore(self, bson):
+        yield self._safe_execute(self.collection.insert, bson)
+        self.registry.put(self._to_schema(bson))
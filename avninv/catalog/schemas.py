@@ -0,0 +1,121 @@
+"""In-process registry of part schemas and of the validators compiled from them"""
+
+import bisect
+import threading
+import time
+
+from avninv.catalog.v1.catalog_pb2 import PartAttributeSchema
+from avninv.error.api_error import ApiError, StatusCode
+
+
+# Check of an attribute value for each declared type, and how it is described in errors
+_TYPE_CHECKS = {
+    PartAttributeSchema.NUMERIC: (lambda attribute: attribute.HasField('numeric_value'), 'a numeric value'),
+    PartAttributeSchema.INTEGER: (
+        lambda attribute: attribute.HasField('numeric_value') and attribute.numeric_value.is_integer(),
+        'an integer value'
+    ),
+    PartAttributeSchema.STRING: (lambda attribute: bool(attribute.value), 'a string value'),
+}
+
+
+def is_schema_name(name):
+    tokens = name.split('/')
+    return len(tokens) == 4 and tokens[0] == 'orgs' and tokens[2] == 'partschemas' and all(tokens)
+
+
+def compile_validator(schema):
+    """Build a function checking a list of PartAttributes against `schema`, raising INVALID_ARGUMENT ApiErrors.
+
+    Attributes must be declared by the schema, in its unit when it declares one, and hold a value of its type.
+    Declared attributes may be missing.
+    """
+    declared = {
+        attribute.attribute: (attribute.unit, *_TYPE_CHECKS.get(attribute.type, (None, None)))
+        for attribute in schema.attributes
+    }
+
+    def validate(attributes):
+        for attribute in attributes:
+            if attribute.attribute not in declared:
+                raise ApiError(
+                    StatusCode.INVALID_ARGUMENT,
+                    f'Attribute "{attribute.attribute}" is not declared by schema "{schema.name}"'
+                )
+
+            unit, check, description = declared[attribute.attribute]
+            if unit and attribute.unit != unit:
+                raise ApiError(StatusCode.INVALID_ARGUMENT, f'Attribute "{attribute.attribute}" must be in {unit}')
+            if check is not None and not check(attribute):
+                raise ApiError(
+                    StatusCode.INVALID_ARGUMENT, f'Attribute "{attribute.attribute}" must have {description}'
+                )
+
+    return validate
+
+
+class SchemaRegistry:
+    """Every PartSchema by name, along with its compiled validator.
+
+    Schemas are few and rarely written, so they are all held in memory: writes made through this process update
+    the registry in place, and it expires `ttl` seconds after being loaded, bounding how long writes made by other
+    workers go unseen. Entries are shared between callers and must not be modified.
+    """
+
+    def __init__(self, ttl=30.0):
+        self.ttl = ttl
+
+        self._state = ({}, [])
+        self._expires = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._state[0])
+
+    def stale(self):
+        return self._expires is None or self._expires < time.monotonic()
+
+    def replace(self, schemas):
+        entries = {schema.name: (schema, compile_validator(schema)) for schema in schemas}
+        with self._lock:
+            self._set(entries)
+            self._expires = time.monotonic() + self.ttl
+
+    def put(self, schema):
+        with self._lock:
+            entries, _ = self._state
+            self._set({**entries, schema.name: (schema, compile_validator(schema))})
+
+    def remove(self, name):
+        with self._lock:
+            entries, _ = self._state
+            self._set({key: entry for key, entry in entries.items() if key != name})
+
+    def _set(self, entries):
+        # Readers never lock: they see either the previous or the new entries, swapped as a whole
+        self._state = (entries, sorted(entries))
+
+    def names(self):
+        return self._state[1]
+
+    def get(self, name):
+        entry = self._state[0].get(name)
+        return entry[0] if entry is not None else None
+
+    def list(self, limit, after=None):
+        """Schemas ordered by name, after the name `after` if given, and whether there are more"""
+        entries, names = self._state
+        start = bisect.bisect_right(names, after) if after is not None else 0
+
+        schemas = [entries[name][0] for name in names[start:start + limit]]
+        return schemas, start + limit < len(names)
+
+    def validator(self, schema_name):
+        """Validator of the attributes of parts naming `schema_name`, None for free-form schema names"""
+        if not is_schema_name(schema_name):
+            return None
+
+        entry = self._state[0].get(schema_name)
+        if entry is None:
+            raise ApiError(StatusCode.INVALID_ARGUMENT, f'Unknown schema "{schema_name}"')
+        return entry[1]
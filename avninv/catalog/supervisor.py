@@ -0,0 +1,111 @@
+"""Pre-fork supervisor running several catalog server processes"""
+
+import logging
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import time
+
+
+class Supervisor:
+    """Keeps `workers` forked processes running `target(index)` until told to stop.
+
+    Workers that exit on their own are restarted after `restart_delay` seconds, doubled for each of their exits
+    within the last `restart_window` seconds up to `max_restart_delay`. A worker exiting more than `max_restarts`
+    times within that window stops the supervisor, which then exits non-zero. SIGINT and SIGTERM are forwarded to
+    every worker so they can shut down gracefully; workers still alive `shutdown_timeout` seconds later are killed.
+    """
+
+    def __init__(self, target, workers, restart_delay=1.0, max_restart_delay=30.0, max_restarts=5,
+                 restart_window=300.0, shutdown_timeout=10.0):
+        self.target = target
+        self.workers = workers
+        self.restart_delay = restart_delay
+        self.max_restart_delay = max_restart_delay
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        self.shutdown_timeout = shutdown_timeout
+        self.failed = False
+
+        self._context = multiprocessing.get_context('fork')
+        self._processes = {}
+        self._exits = {}
+        self._stopping_since = None
+
+    def _run_worker(self, index):
+        # Forked children inherit the supervisor's handlers; let the worker install its own
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        self.target(index)
+
+    def _spawn(self, index):
+        process = self._context.Process(target=self._run_worker, args=(index,), name=f'catalog-worker-{index}')
+        process.start()
+        self._processes[index] = process
+
+    def _restart_delay(self, index, now):
+        """Seconds before restarting the worker `index` which exited `now`, None when it exited too often"""
+        exits = [when for when in self._exits.get(index, []) if now - when < self.restart_window] + [now]
+        self._exits[index] = exits
+        if len(exits) > self.max_restarts:
+            return None
+        return min(self.restart_delay * 2 ** (len(exits) - 1), self.max_restart_delay)
+
+    def stop(self, signum=signal.SIGTERM):
+        if self._stopping_since is None:
+            self._stopping_since = time.monotonic()
+
+        # Called from signal handlers, or other threads, while supervise() updates the processes
+        for process in list(self._processes.values()):
+            if process.is_alive():
+                os.kill(process.pid, signum)
+
+    def run(self):
+        signal.signal(signal.SIGINT, lambda signum, _: self.stop(signum))
+        signal.signal(signal.SIGTERM, lambda signum, _: self.stop(signum))
+        return self.supervise()
+
+    def supervise(self):
+        """Run the workers until they are stopped, returning the exit status of the supervisor"""
+        for index in range(self.workers):
+            self._spawn(index)
+
+        restarts = {}
+        while self._processes or restarts:
+            sentinels = {process.sentinel: index for index, process in self._processes.items()}
+            ready = multiprocessing.connection.wait(list(sentinels), timeout=0.5)
+
+            for sentinel in ready:
+                index = sentinels[sentinel]
+                process = self._processes.pop(index)
+                process.join()
+
+                if self._stopping_since is None:
+                    delay = self._restart_delay(index, time.monotonic())
+                    if delay is None:
+                        logging.error(
+                            f'worker {index} (pid {process.pid}) exited with {process.exitcode}, '
+                            f'{self.max_restarts + 1} times within {self.restart_window:g}s: stopping'
+                        )
+                        self.failed = True
+                        self.stop()
+                    else:
+                        logging.error(
+                            f'worker {index} (pid {process.pid}) exited with {process.exitcode}, '
+                            f'restarting in {delay:g}s'
+                        )
+                        restarts[index] = time.monotonic() + delay
+
+            for index, when in list(restarts.items()):
+                if self._stopping_since is not None:
+                    del restarts[index]
+                elif time.monotonic() >= when:
+                    del restarts[index]
+                    self._spawn(index)
+
+            if self._stopping_since is not None and time.monotonic() - self._stopping_since > self.shutdown_timeout:
+                for process in self._processes.values():
+                    process.kill()
+
+        return 1 if self.failed else 0
@@ -1,4 +1,6 @@
+import asyncio
 import concurrent.futures
+import threading
 import uuid
 import os
 
@@ -7,10 +9,20 @@ import pymongo
 import pytest
 import yaml
 
+from avninv.catalog.async_catalog import AsyncCatalogService
+from avninv.catalog.cache import PartCache
 from avninv.catalog.catalog import CatalogService
+from avninv.catalog.indexes import index_models, reconcile_indexes
 from avninv.catalog.v1.catalog_pb2_grpc import add_CatalogServicer_to_server, CatalogStub
 
 
+# Text queries fail without a text index
+TEST_INDEXES = [
+    {'fields': ['manufacturer_part_number text', 'suppliers.supplier_part_number text', 'description text'],
+     'weights': {'manufacturer_part_number': 10, 'suppliers.supplier_part_number': 5}, 'default_language': 'none'}
+]
+
+
 class ConfigNotFoundException(Exception):
     pass
 
@@ -23,20 +35,92 @@ def _get_config():
     raise ConfigNotFoundException
 
 
+class _AsyncServer:
+    """Runs an AsyncCatalogService on a grpc.aio server in its own event loop thread"""
+
+    def __init__(self, uri, collection, address):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.server, self.port = self._run(self._start(uri, collection, address))
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    async def _start(self, uri, collection, address):
+        import motor.motor_asyncio
+
+        client = motor.motor_asyncio.AsyncIOMotorClient(uri, serverSelectionTimeoutMS=1000)
+        server = grpc.aio.server()
+        database = client['catalog-test']
+        service = AsyncCatalogService(
+            database[collection], cache=PartCache(), schemas=database[f'{collection}-schemas']
+        )
+        add_CatalogServicer_to_server(service, server)
+        port = server.add_insecure_port(address)
+        await server.start()
+        return server, port
+
+    def stop(self, grace):
+        self._run(self.server.stop(grace))
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+
+@pytest.fixture
+def collection():
+    config = yaml.load(_get_config(), Loader=yaml.CLoader)
+    client = pymongo.MongoClient(config['database'][0], serverSelectionTimeoutMS=1000)
+    name = str(uuid.uuid4())
+
+    yield client['catalog-test'].create_collection(name)
+
+    client['catalog-test'].drop_collection(name)
+
+
 @pytest.fixture
-def service():
+def replica_set():
+    """Skips tests of change streams unless Mongo runs as a replica set. A single node one is started with
+    `mongod --replSet rs0`, then initiated with `rs.initiate()` from the mongo shell."""
+    config = yaml.load(_get_config(), Loader=yaml.CLoader)
+    client = pymongo.MongoClient(config['database'][0], serverSelectionTimeoutMS=1000)
+    if 'setName' not in client.admin.command('ismaster'):
+        pytest.skip('Mongo is not a replica set')
+
+
+@pytest.fixture(params=['sync', 'async'])
+def service(request):
+    if request.param == 'async':
+        try:
+            import motor.motor_asyncio  # noqa: F401
+        except (ImportError, AttributeError):
+            pytest.skip('motor 2.x does not import on Python 3.11 and later')
+
     config = yaml.load(_get_config(), Loader=yaml.CLoader)
     client = pymongo.MongoClient(config['database'][0], serverSelectionTimeoutMS=1000)
     collection = str(uuid.uuid4())
 
-    client['catalog-test'].create_collection(collection)
+    reconcile_indexes(client['catalog-test'].create_collection(collection), index_models(TEST_INDEXES))
+
+    if request.param == 'sync':
+        # WatchParts holds a thread while others serve the writes it watches
+        server = grpc.server(concurrent.futures.ThreadPoolExecutor(max_workers=2))
+        database = client['catalog-test']
+        service = CatalogService(database[collection], cache=PartCache(), schemas=database[f'{collection}-schemas'])
+        add_CatalogServicer_to_server(service, server)
+        port = server.add_insecure_port('127.0.0.1:0')
+        server.start()
+    else:
+        server = _AsyncServer(config['database'][0], collection, '127.0.0.1:0')
+        port = server.port
 
-    server = grpc.server(concurrent.futures.ThreadPoolExecutor(max_workers=1))
-    add_CatalogServicer_to_server(CatalogService(client['catalog-test'][collection]), server)
-    server.add_insecure_port('0.0.0.0:9321')
-    server.start()
+    # A port per server: channels share connections by address, so a new server on the port of a stopped one could
+    # be reached through a connection closed under it
+    channel = grpc.insecure_channel(f'127.0.0.1:{port}')
+    yield CatalogStub(channel)
 
-    yield CatalogStub(grpc.insecure_channel('0.0.0.0:9321'))
+    channel.close()
 
     server.stop(0)
     client['catalog-test'].drop_collection(collection)
+    client['catalog-test'].drop_collection(f'{collection}-schemas')
@@ -0,0 +1,85 @@
+import time
+
+from bson.objectid import ObjectId
+
+from avninv.catalog.cache import PartCache, ResultMemo
+from avninv.catalog.v1.catalog_pb2 import Part
+
+
+def test_PartCache_returns_stored_parts():
+    cache = PartCache()
+    key = ObjectId()
+    part = Part(description='RES 10K 0502')
+
+    assert cache.get(key) is None
+    cache.put(key, part, cache.generation())
+
+    assert cache.get(key) is part
+    assert cache.stats() == {'entries': 1, 'bytes': cache.size, 'hits': 1, 'misses': 1, 'evictions': 0}
+
+
+def test_PartCache_evicts_least_recently_used():
+    cache = PartCache(max_entries=2)
+    keys = [ObjectId() for _ in range(3)]
+
+    cache.put(keys[0], Part(description='0'), cache.generation())
+    cache.put(keys[1], Part(description='1'), cache.generation())
+    cache.get(keys[0])
+    cache.put(keys[2], Part(description='2'), cache.generation())
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]).description == '0'
+    assert cache.get(keys[2]).description == '2'
+    assert cache.evictions == 1
+
+
+def test_PartCache_respects_memory_budget():
+    part = Part(description='x' * 1000)
+    cache = PartCache(max_bytes=3 * part.ByteSize())
+
+    for _ in range(10):
+        cache.put(ObjectId(), part, cache.generation())
+
+    assert cache.size <= cache.max_bytes
+    assert len(cache) + cache.evictions == 10
+
+
+def test_PartCache_expires_entries():
+    cache = PartCache(ttl=0.01)
+    key = ObjectId()
+
+    cache.put(key, Part(), cache.generation())
+    time.sleep(0.02)
+
+    assert cache.get(key) is None
+    assert len(cache) == 0
+
+
+def test_PartCache_ignores_parts_read_before_an_invalidation():
+    cache = PartCache()
+    key = ObjectId()
+
+    generation = cache.generation()
+    cache.invalidate([key])
+    cache.put(key, Part(), generation)
+
+    assert cache.get(key) is None
+
+
+def test_ResultMemo_expires_results():
+    memo = ResultMemo(ttl=0.01)
+
+    memo.put('key', [1])
+    assert memo.get('key') == [1]
+    time.sleep(0.02)
+
+    assert memo.get('key') is None
+
+
+def test_ResultMemo_drops_oldest_results():
+    memo = ResultMemo(max_entries=2)
+
+    for key in range(3):
+        memo.put(key, key)
+
+    assert [memo.get(key) for key in range(3)] == [None, 1, 2]
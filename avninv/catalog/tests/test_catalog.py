@@ -1,13 +1,23 @@
+import types
 
 from google.protobuf.field_mask_pb2 import FieldMask
 import grpc
+from pymongo.errors import OperationFailure
 import pytest
 
+from avninv.catalog.cache import ResultMemo
 from avninv.catalog.catalog import CatalogService
+from avninv.catalog.collection import Collection, ConditionFailed, DocumentNotFound
+from avninv.catalog.parts_collection import PartCollection
 from avninv.catalog.v1.catalog_pb2 import (
-    CreatePartRequest, DeletePartRequest, GetPartRequest, PartAttribute, Part, PartSupplier, UpdatePartRequest
+    AdjustQuantityRequest, AggregatePartsRequest, BatchAdjustQuantitiesRequest, BatchCreatePartsRequest,
+    BatchDeletePartsRequest, BatchGetPartsRequest, BatchUpdatePartsRequest, CreatePartRequest, CreatePartSchemaRequest,
+    AttributePredicate, DeletePartRequest, DeletePartSchemaRequest, GetPartRequest, GetPartSchemaRequest,
+    ListPartRequest, ListPartSchemaRequest, PartAggregate, PartAttribute, PartAttributeSchema, Part, PartSchema,
+    PartSupplier, SearchPartsRequest, StreamPartsRequest, UpdatePartRequest, UpdatePartSchemaRequest,
+    WatchPartsRequest, WatchPartsResponse
 )
-from avninv.error.api_error import ApiError
+from avninv.error.api_error import ApiError, StatusCode
 
 
 @pytest.mark.parametrize("path,valid", [
@@ -67,6 +77,40 @@ def test_CreatePart(service):
     assert len(result.name.split('/')[-1]) == 24
 
 
+def test_CreatePart_returns_same_part_as_GetPart(service):
+    p1 = Part(
+        manufacturer_part_number='mfg_01',
+        schema_name='resistance',
+        description='RES 10K 0502',
+        quantity=3,
+        attributes=[
+            PartAttribute(
+                attribute='Resistance',
+                unit='Ohms',
+                numeric_value=10e3,
+                value='10k'
+            ),
+            PartAttribute(
+                attribute='Tolerance',
+                numeric_value=0
+            )
+        ],
+        suppliers=[
+            PartSupplier(
+                supplier='digikey',
+                supplier_part_number='DIG0001',
+                url='https://digikey.ca/wee'
+            )
+        ]
+    )
+
+    created = service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=p1))
+    fetched = service.GetPart(GetPartRequest(name=created.name))
+
+    assert created == fetched
+    assert created.SerializeToString() == fetched.SerializeToString()
+
+
 def test_GetPart(service):
     p1 = Part(
         manufacturer_part_number='mfg_01',
@@ -91,11 +135,42 @@ def test_GetPart(service):
 
     name = service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=p1)).name
     p1.name = name
+    p1.etag = '0'
 
     result = service.GetPart(GetPartRequest(name=name))
     assert result == p1
 
 
+def test_GetPart_with_read_mask(service):
+    part = Part(
+        manufacturer_part_number='mfg_01',
+        description='RES 10K 0502',
+        quantity=10,
+        attributes=[PartAttribute(attribute='Resistance', unit='Ohms', numeric_value=10e3, value='10k')]
+    )
+    name = service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=part)).name
+
+    result = service.GetPart(GetPartRequest(
+        name=name, read_mask=FieldMask(paths=['manufacturer_part_number', 'quantity', 'attributes.value'])
+    ))
+    assert result == Part(
+        name=name, manufacturer_part_number='mfg_01', quantity=10, attributes=[PartAttribute(value='10k')], etag='0'
+    )
+
+    # Cached or not, an unmasked read still returns the whole part
+    assert service.GetPart(GetPartRequest(name=name)).description == 'RES 10K 0502'
+
+
+def test_GetPart_returns_invalid_argument_if_read_mask_invalid(service):
+    name = service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=Part(description='part'))).name
+
+    try:
+        service.GetPart(GetPartRequest(name=name, read_mask=FieldMask(paths=['quantity.unknown'])))
+        assert False, 'Should have hit exception!'
+    except grpc.RpcError as error:
+        assert error.code() == grpc.StatusCode.INVALID_ARGUMENT, error.details()
+
+
 def test_GetPart_returns_not_found_if_part_doesnt_exist(service):
     try:
         service.GetPart(GetPartRequest(name='orgs/main/parts/' + '0' * 24))
@@ -215,6 +290,7 @@ def test_UpdatePart(service):
     result.name = ''
 
     assert result == Part(
+        etag='1',
         manufacturer_part_number='mfg_01',
         schema_name='resistance',
         description='RES 10K 0203',
@@ -238,3 +314,852 @@ def test_UpdatePart(service):
             )
         ]
     )
+
+
+def test_UpdatePart_returns_updated_part(service):
+    name = service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=Part(description='RES 10K 0502'))).name
+
+    result = service.UpdatePart(UpdatePartRequest(
+        name=name, part=Part(quantity=12), update_mask=FieldMask(paths=['quantity'])
+    ))
+
+    assert result == Part(name=name, description='RES 10K 0502', quantity=12, etag='1')
+    assert result == service.GetPart(GetPartRequest(name=name))
+
+
+def test_UpdatePart_returns_not_found_if_part_doesnt_exist(service):
+    try:
+        service.UpdatePart(UpdatePartRequest(
+            name='orgs/main/parts/' + '0' * 24, part=Part(quantity=12), update_mask=FieldMask(paths=['quantity'])
+        ))
+        assert False, 'Should have hit exception!'
+    except grpc.RpcError as error:
+        assert error.code() == grpc.StatusCode.NOT_FOUND, error.details()
+
+
+def test_UpdatePart_returns_invalid_argument_if_update_mask_invalid(service):
+    name = service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=Part(description='RES'))).name
+
+    for paths in [['unknown'], ['attributes.unit'], ['quantity.nested']]:
+        try:
+            service.UpdatePart(UpdatePartRequest(name=name, part=Part(quantity=12), update_mask=FieldMask(paths=paths)))
+            assert False, 'Should have hit exception!'
+        except grpc.RpcError as error:
+            assert error.code() == grpc.StatusCode.INVALID_ARGUMENT, error.details()
+
+
+def test_UpdatePart_with_etag(service):
+    part = Part(description='RES', attributes=[PartAttribute(attribute='Footprint'), PartAttribute(attribute='Pins')])
+    created = service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=part))
+    assert created.etag == '0'
+
+    def update(etag, paths):
+        return service.UpdatePart(UpdatePartRequest(
+            name=created.name, part=Part(quantity=3, etag=etag), update_mask=FieldMask(paths=paths)
+        ))
+
+    assert update('0', ['quantity']).etag == '1'
+    # Removing attributes runs the update as a pipeline, which bumps the version too
+    assert update('1', ['attributes.1']).etag == '2'
+    assert update('', ['quantity']).etag == '3'
+
+    # Stale etags fail, even for updates that change nothing
+    for paths in [['quantity'], []]:
+        with pytest.raises(grpc.RpcError) as error:
+            update('2', paths)
+        assert error.value.code() == grpc.StatusCode.ABORTED, error.value.details()
+
+    with pytest.raises(grpc.RpcError) as error:
+        update('"3"', ['quantity'])
+    assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT, error.value.details()
+
+    assert service.GetPart(GetPartRequest(name=created.name)) == Part(
+        name=created.name, description='RES', quantity=3, attributes=[PartAttribute(attribute='Footprint')], etag='3'
+    )
+
+
+def test_UpdatePart_appends_attributes_past_the_stored_ones(service):
+    part = Part(attributes=[PartAttribute(attribute='Footprint'), PartAttribute(attribute='Pins')])
+    name = service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=part)).name
+
+    # Setting index 2 of two stored attributes while removing index 5 runs as a pipeline
+    attributes = [PartAttribute(attribute=attribute) for attribute in ('Footprint', 'Pins', 'Package')]
+    updated = service.UpdatePart(UpdatePartRequest(
+        name=name, part=Part(attributes=attributes), update_mask=FieldMask(paths=['attributes.2', 'attributes.5'])
+    ))
+    assert list(updated.attributes) == attributes
+    assert list(service.GetPart(GetPartRequest(name=name)).attributes) == attributes
+
+
+def test_GetPart_with_if_none_match(service):
+    name = service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=Part(description='RES'))).name
+
+    # Uncached, then cached
+    for _ in range(2):
+        assert service.GetPart(GetPartRequest(name=name, if_none_match='0')) == Part(name=name, etag='0')
+
+    service.UpdatePart(UpdatePartRequest(name=name, part=Part(quantity=3), update_mask=FieldMask(paths=['quantity'])))
+    assert service.GetPart(GetPartRequest(name=name, if_none_match='0')) == Part(
+        name=name, description='RES', quantity=3, etag='1'
+    )
+
+    try:
+        service.GetPart(GetPartRequest(name='orgs/main/parts/' + '0' * 24, if_none_match='0'))
+        assert False, 'Should have hit exception!'
+    except grpc.RpcError as error:
+        assert error.code() == grpc.StatusCode.NOT_FOUND, error.details()
+
+
+def test_BatchUpdateParts_with_etags(service):
+    names = [
+        service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=Part(description=f'part {i}'))).name
+        for i in range(3)
+    ]
+
+    quantity = FieldMask(paths=['quantity'])
+    result = service.BatchUpdateParts(BatchUpdatePartsRequest(
+        parent='orgs/main/parts',
+        requests=[
+            UpdatePartRequest(name=names[0], part=Part(quantity=1, etag='1'), update_mask=quantity),
+            UpdatePartRequest(name=names[1], part=Part(quantity=2), update_mask=quantity),
+            UpdatePartRequest(name=names[2], part=Part(quantity=3, etag='0'), update_mask=quantity),
+            UpdatePartRequest(name=names[2], part=Part(quantity=4, etag='x'), update_mask=quantity)
+        ]
+    ))
+
+    assert [result.status.code for result in result.results] == [
+        grpc.StatusCode.ABORTED.value[0], 0, 0, grpc.StatusCode.INVALID_ARGUMENT.value[0]
+    ]
+    assert [(result.part.quantity, result.part.etag) for result in result.results[1:3]] == [(2, '1'), (3, '1')]
+
+
+def test_AggregateParts(service):
+    request = AggregatePartsRequest(parent='orgs/main/parts', low_stock_quantity=5)
+    assert list(service.AggregateParts(request).groups) == [PartAggregate()]
+
+    for part in [
+        Part(schema_name='resistor', quantity=100, suppliers=[PartSupplier(supplier='a'), PartSupplier(supplier='b')]),
+        Part(schema_name='resistor', quantity=2, suppliers=[PartSupplier(supplier='a'), PartSupplier(supplier='a')]),
+        Part(schema_name='capacitor', quantity=10, suppliers=[PartSupplier(supplier='b')]),
+        Part(quantity=0)
+    ]:
+        service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=part))
+
+    assert list(service.AggregateParts(request).groups) == [
+        PartAggregate(part_count=4, total_quantity=112, low_stock_count=2)
+    ]
+
+    request.group_by = AggregatePartsRequest.SCHEMA_NAME
+    assert list(service.AggregateParts(request).groups) == [
+        PartAggregate(key='', part_count=1, total_quantity=0, low_stock_count=1),
+        PartAggregate(key='capacitor', part_count=1, total_quantity=10),
+        PartAggregate(key='resistor', part_count=2, total_quantity=102, low_stock_count=1)
+    ]
+
+    # Parts listing a supplier twice still count once towards it
+    request.group_by = AggregatePartsRequest.SUPPLIER
+    assert list(service.AggregateParts(request).groups) == [
+        PartAggregate(key='', part_count=1, total_quantity=0, low_stock_count=1),
+        PartAggregate(key='a', part_count=2, total_quantity=102, low_stock_count=1),
+        PartAggregate(key='b', part_count=2, total_quantity=110)
+    ]
+
+    request.filter = 'schema_name = "resistor"'
+    assert [group.key for group in service.AggregateParts(request).groups] == ['a', 'b']
+
+
+@pytest.mark.parametrize('request_', [
+    AggregatePartsRequest(parent='orgs/wack/parts'),
+    AggregatePartsRequest(parent='orgs/main/parts', group_by=42),
+    AggregatePartsRequest(parent='orgs/main/parts', filter='quantity >'),
+    AggregatePartsRequest(parent='orgs/main/parts', low_stock_quantity=2 ** 63)
+])
+def test_AggregateParts_returns_invalid_argument(service, request_):
+    try:
+        service.AggregateParts(request_)
+        assert False, 'Should have hit exception!'
+    except grpc.RpcError as error:
+        assert error.code() == grpc.StatusCode.INVALID_ARGUMENT, error.details()
+
+
+def test_PartCollection_memoizes_aggregates(collection):
+    parts = PartCollection(collection, memo=ResultMemo(ttl=60))
+    parts.insert(Part(quantity=1))
+
+    groups = parts.aggregate(AggregatePartsRequest.GROUP_BY_UNSPECIFIED)
+    parts.insert(Part(quantity=2))
+
+    assert parts.aggregate(AggregatePartsRequest.GROUP_BY_UNSPECIFIED) is groups
+    assert parts.aggregate(AggregatePartsRequest.GROUP_BY_UNSPECIFIED, low_stock_quantity=5) == [
+        PartAggregate(part_count=2, total_quantity=3, low_stock_count=2)
+    ]
+
+
+def test_Collection_update_many_checks_conditions_as_it_writes(collection):
+    documents = Collection(collection)
+    oids = [documents.insert({'_3': 'resistor'}) for _ in range(3)]
+    missing = '0' * 24
+
+    def update(description):
+        return {'$set': {'_4': description}, '$unset': {}, '$pull': {}}
+
+    results = documents.update_many(
+        oids + [missing], [update('a'), update('b'), update('c'), update('d')],
+        [None, {'_3': 'resistor'}, {'_3': 'capacitor'}, {'_3': 'resistor'}]
+    )
+
+    assert [result.get('_4') for result in results[:2]] == ['a', 'b']
+    assert isinstance(results[2], ConditionFailed) and isinstance(results[3], DocumentNotFound)
+    assert documents.get(oids[2]) == {'_id': oids[2], '_3': 'resistor'}
+
+
+def test_PartCollection_logs_the_failed_operation(collection, caplog):
+    def count(query, limit=None):
+        raise OperationFailure('disk full')
+
+    parts = PartCollection(collection)
+    parts.collection.count = count
+    with pytest.raises(ApiError):
+        parts.has_schema('resistor')
+
+    assert 'error running count on parts: disk full' in caplog.text
+
+
+def test_ListParts_paginates(service):
+    names = [
+        service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=Part(description=f'part {i}'))).name
+        for i in range(5)
+    ]
+
+    pages = []
+    page_token = ''
+    while True:
+        result = service.ListParts(ListPartRequest(parent='orgs/main/parts', page_size=2, page_token=page_token))
+        pages.append([part.name for part in result.parts])
+        page_token = result.next_page_token
+        if not page_token:
+            break
+
+    assert pages == [names[0:2], names[2:4], names[4:5]]
+
+
+def test_ListParts_with_read_mask(service):
+    names = [
+        service.CreatePart(CreatePartRequest(
+            parent='orgs/main/parts', part=Part(description=f'part {i}', quantity=i)
+        )).name
+        for i in range(3)
+    ]
+
+    result = service.ListParts(ListPartRequest(
+        parent='orgs/main/parts', page_size=2, read_mask=FieldMask(paths=['quantity'])
+    ))
+    assert list(result.parts) == [
+        Part(name=names[0], quantity=0, etag='0'), Part(name=names[1], quantity=1, etag='0')
+    ]
+
+    result = service.ListParts(ListPartRequest(
+        parent='orgs/main/parts', page_token=result.next_page_token, read_mask=FieldMask(paths=['quantity'])
+    ))
+    assert list(result.parts) == [Part(name=names[2], quantity=2, etag='0')]
+
+
+def test_ListParts_with_filter_and_order_by(service):
+    parts = [
+        Part(manufacturer_part_number='R1', schema_name='resistor', quantity=5, suppliers=[PartSupplier(supplier='a')]),
+        Part(manufacturer_part_number='R2', schema_name='resistor', quantity=0, suppliers=[PartSupplier(supplier='b')]),
+        Part(manufacturer_part_number='R3', schema_name='resistor', quantity=5, suppliers=[PartSupplier(supplier='a')]),
+        Part(manufacturer_part_number='C1', schema_name='cap', quantity=9, suppliers=[PartSupplier(supplier='a')]),
+        Part(manufacturer_part_number='R4', schema_name='resistor', quantity=2)
+    ]
+    for part in parts:
+        service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=part))
+
+    request = ListPartRequest(
+        parent='orgs/main/parts', page_size=1, filter='schema_name = resistor AND quantity < 9',
+        order_by='quantity desc', read_mask=FieldMask(paths=['manufacturer_part_number'])
+    )
+
+    pages = []
+    while True:
+        result = service.ListParts(request)
+        pages.append([part.manufacturer_part_number for part in result.parts])
+        assert all(part.quantity == 0 for part in result.parts)
+        request.page_token = result.next_page_token
+        if not request.page_token:
+            break
+
+    assert pages == [['R1'], ['R3'], ['R4'], ['R2']]
+
+    result = service.ListParts(ListPartRequest(
+        parent='orgs/main/parts', filter='suppliers.supplier:a AND manufacturer_part_number = R*'
+    ))
+    assert [part.manufacturer_part_number for part in result.parts] == ['R1', 'R3']
+
+
+def test_ListParts_returns_invalid_argument_if_filter_invalid(service):
+    for request in [
+        ListPartRequest(parent='orgs/main/parts', filter='quantity = many'),
+        ListPartRequest(parent='orgs/main/parts', filter='name = "orgs/main/parts/1"'),
+        ListPartRequest(parent='orgs/main/parts', order_by='suppliers')
+    ]:
+        try:
+            service.ListParts(request)
+            assert False, 'Should have hit exception!'
+        except grpc.RpcError as error:
+            assert error.code() == grpc.StatusCode.INVALID_ARGUMENT, error.details()
+
+
+def test_ListParts_returns_invalid_argument_if_page_token_reused_with_other_filter(service):
+    for i in range(3):
+        service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=Part(description=f'part {i}')))
+
+    page_token = service.ListParts(ListPartRequest(parent='orgs/main/parts', page_size=1)).next_page_token
+
+    try:
+        service.ListParts(ListPartRequest(parent='orgs/main/parts', page_token=page_token, filter='quantity > 1'))
+        assert False, 'Should have hit exception!'
+    except grpc.RpcError as error:
+        assert error.code() == grpc.StatusCode.INVALID_ARGUMENT, error.details()
+
+
+def test_ListParts_returns_invalid_argument_if_page_token_tampered(service):
+    for i in range(3):
+        service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=Part(description=f'part {i}')))
+
+    page_token = service.ListParts(ListPartRequest(parent='orgs/main/parts', page_size=1)).next_page_token
+    tampered = page_token[:-2] + ('AA' if page_token[-2:] != 'AA' else 'BB')
+
+    for token in [tampered, 'notatoken']:
+        try:
+            service.ListParts(ListPartRequest(parent='orgs/main/parts', page_size=1, page_token=token))
+            assert False, 'Should have hit exception!'
+        except grpc.RpcError as error:
+            assert error.code() == grpc.StatusCode.INVALID_ARGUMENT, error.details()
+
+
+def test_ListParts_returns_invalid_argument_if_page_size_negative(service):
+    try:
+        service.ListParts(ListPartRequest(parent='orgs/main/parts', page_size=-1))
+        assert False, 'Should have hit exception!'
+    except grpc.RpcError as error:
+        assert error.code() == grpc.StatusCode.INVALID_ARGUMENT, error.details()
+
+
+def test_SearchParts(service):
+    def resistor(mpn, ohms, watts=0.25):
+        return Part(manufacturer_part_number=mpn, attributes=[
+            PartAttribute(attribute='Resistance', unit='Ohms', numeric_value=ohms),
+            PartAttribute(attribute='Power', unit='W', numeric_value=watts)
+        ])
+
+    for part in [
+        resistor('R1', 10e3), resistor('R2', 9.5e3, watts=1), resistor('R3', 4.7e3), resistor('R4', 10.5e3),
+        resistor('R5', 11e3), Part(manufacturer_part_number='C1', attributes=[
+            PartAttribute(attribute='Capacitance', unit='F', numeric_value=10e3),
+            PartAttribute(attribute='Resistance', unit='Ohms')
+        ])
+    ]:
+        service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=part))
+
+    request = SearchPartsRequest(
+        parent='orgs/main/parts', page_size=2, read_mask=FieldMask(paths=['manufacturer_part_number']),
+        predicates=[AttributePredicate(attribute='Resistance', unit='Ohms', min_value=9.5e3, max_value=10.5e3)]
+    )
+
+    pages = []
+    while True:
+        result = service.SearchParts(request)
+        pages.append([part.manufacturer_part_number for part in result.parts])
+        request.page_token = result.next_page_token
+        if not request.page_token:
+            break
+
+    assert pages == [['R1', 'R2'], ['R4']]
+
+    result = service.SearchParts(SearchPartsRequest(parent='orgs/main/parts', predicates=[
+        AttributePredicate(attribute='Resistance', max_value=10e3),
+        AttributePredicate(attribute='Power', unit='W', min_value=0.5)
+    ]))
+    assert [part.manufacturer_part_number for part in result.parts] == ['R2']
+
+
+def test_SearchParts_returns_invalid_argument_if_predicates_invalid(service):
+    for predicates in [
+        [],
+        [AttributePredicate(attribute='Resistance')] * 17,
+        [AttributePredicate(unit='Ohms', min_value=1)],
+        [AttributePredicate(attribute='Resistance', min_value=2, max_value=1)],
+        [AttributePredicate(attribute='Resistance', min_value=float('nan'))]
+    ]:
+        try:
+            service.SearchParts(SearchPartsRequest(parent='orgs/main/parts', predicates=predicates))
+            assert False, 'Should have hit exception!'
+        except grpc.RpcError as error:
+            assert error.code() == grpc.StatusCode.INVALID_ARGUMENT, error.details()
+
+
+def test_SearchParts_with_query(service):
+    for part in [
+        Part(manufacturer_part_number='RC0402FR-0710KL', description='RES 10k 1% 0402'),
+        Part(manufacturer_part_number='ERJ-2RKF1002X', description='RES SMD 10k OHM 0402 1/10W'),
+        Part(manufacturer_part_number='RC0603FR-0710KL', description='RES 10k 1% 0603'),
+        Part(manufacturer_part_number='CL05B104KO5NNNC', description='CAP 0.1uF 0402',
+             suppliers=[PartSupplier(supplier='digikey', supplier_part_number='1276-1001-1-ND')]),
+        Part(manufacturer_part_number='RC0402JR-070RL', description='RES 0 OHM 0402'),
+        Part(manufacturer_part_number='KIT-1', description='RC0402 series kit'),
+        Part(manufacturer_part_number='KIT-2', description='Kit of RC0402 resistors')
+    ]:
+        service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=part))
+
+    def search(query, page_size=0):
+        request = SearchPartsRequest(parent='orgs/main/parts', query=query, page_size=page_size)
+        pages = []
+        while True:
+            result = service.SearchParts(request)
+            pages.append([part.manufacturer_part_number for part in result.parts])
+            request.page_token = result.next_page_token
+            if not request.page_token:
+                return pages
+
+    assert sorted(search('10k 0402')[0]) == ['ERJ-2RKF1002X', 'RC0402FR-0710KL']
+    assert search('1276-1001-1-ND') == [['CL05B104KO5NNNC']]
+
+    # Single words also match the start of MPNs, as typed or uppercased. Those parts come first, in MPN order.
+    pages = search('rc0402', page_size=1)
+    assert pages[:2] == [['RC0402FR-0710KL'], ['RC0402JR-070RL']]
+    assert sorted(pages[2] + pages[3]) == ['KIT-1', 'KIT-2'] and len(pages) == 4
+
+
+def test_StreamParts(service):
+    names = [
+        service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=Part(description=f'part {i}'))).name
+        for i in range(5)
+    ]
+
+    chunks = [
+        [part.name for part in response.parts]
+        for response in service.StreamParts(StreamPartsRequest(parent='orgs/main/parts', chunk_size=2))
+    ]
+
+    assert chunks == [names[0:2], names[2:4], names[4:5]]
+
+
+def test_StreamParts_returns_invalid_argument_if_parent_invalid(service):
+    try:
+        list(service.StreamParts(StreamPartsRequest(parent='orgs/wack/parts')))
+        assert False, 'Should have hit exception!'
+    except grpc.RpcError as error:
+        assert error.code() == grpc.StatusCode.INVALID_ARGUMENT, error.details()
+
+
+def test_WatchParts(service, replica_set):
+    events = service.WatchParts(WatchPartsRequest(parent='orgs/main/parts'))
+    start = next(events)
+    assert start.event_type == WatchPartsResponse.EVENT_TYPE_UNSPECIFIED and start.resume_token
+
+    created = service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=Part(description='RES')))
+    created_event = next(events)
+    assert (created_event.event_type, created_event.part) == (WatchPartsResponse.CREATED, created)
+
+    updated = service.UpdatePart(UpdatePartRequest(
+        name=created.name, part=Part(quantity=3), update_mask=FieldMask(paths=['quantity'])
+    ))
+    event = next(events)
+    assert (event.event_type, event.part) == (WatchPartsResponse.UPDATED, updated)
+
+    service.DeletePart(DeletePartRequest(name=created.name))
+    event = next(events)
+    assert (event.event_type, event.part) == (WatchPartsResponse.DELETED, Part(name=created.name))
+    events.cancel()
+
+    # Resuming after the creation, the update of the part deleted since is skipped
+    resumed = service.WatchParts(WatchPartsRequest(parent='orgs/main/parts', resume_token=created_event.resume_token))
+    next(resumed)
+    event = next(resumed)
+    assert (event.event_type, event.part) == (WatchPartsResponse.DELETED, Part(name=created.name))
+    resumed.cancel()
+
+
+@pytest.mark.parametrize('request_', [
+    WatchPartsRequest(parent='orgs/wack/parts'),
+    WatchPartsRequest(parent='orgs/main/parts', resume_token='not a token'),
+    WatchPartsRequest(parent='orgs/main/parts', resume_token='AAAA')
+])
+def test_WatchParts_returns_invalid_argument(service, request_):
+    try:
+        next(service.WatchParts(request_))
+        assert False, 'Should have hit exception!'
+    except grpc.RpcError as error:
+        assert error.code() == grpc.StatusCode.INVALID_ARGUMENT, error.details()
+
+
+def test_WatchParts_limits_watches(collection):
+    service = CatalogService(collection, max_watchers=1)
+
+    with service._watching():
+        with pytest.raises(ApiError) as err:
+            with service._watching():
+                pass
+        assert err.value.status == StatusCode.RESOURCE_EXHAUSTED
+
+    with service._watching():
+        assert service.watchers == 1
+    assert service.watchers == 0
+
+
+def test_AdjustQuantity(service):
+    name = service.CreatePart(CreatePartRequest(
+        parent='orgs/main/parts', part=Part(description='RES', quantity=5)
+    )).name
+
+    assert service.AdjustQuantity(AdjustQuantityRequest(name=name, delta=-3)) == Part(
+        name=name, description='RES', quantity=2, etag='1'
+    )
+    assert service.AdjustQuantity(AdjustQuantityRequest(name=name, delta=8, max_quantity=10)).quantity == 10
+    # Fields outside the read mask are left out, but not the quantity
+    assert service.AdjustQuantity(AdjustQuantityRequest(
+        name=name, delta=-10, read_mask=FieldMask(paths=['manufacturer_part_number'])
+    )) == Part(name=name, etag='3')
+    assert service.AdjustQuantity(AdjustQuantityRequest(name=name, delta=4)).quantity == 4
+
+
+@pytest.mark.parametrize('request_', [
+    AdjustQuantityRequest(delta=-5),
+    AdjustQuantityRequest(delta=-3, min_quantity=2),
+    AdjustQuantityRequest(delta=7, max_quantity=10)
+])
+def test_AdjustQuantity_returns_failed_precondition_out_of_bounds(service, request_):
+    part = service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=Part(quantity=4)))
+    request_.name = part.name
+
+    try:
+        service.AdjustQuantity(request_)
+        assert False, 'Should have hit exception!'
+    except grpc.RpcError as error:
+        assert error.code() == grpc.StatusCode.FAILED_PRECONDITION, error.details()
+    assert service.GetPart(GetPartRequest(name=part.name)) == part
+
+
+@pytest.mark.parametrize('request_,code', [
+    (AdjustQuantityRequest(name='orgs/main/parts/' + '0' * 24, delta=1), grpc.StatusCode.NOT_FOUND),
+    (AdjustQuantityRequest(name='orgs/wack/parts/' + '0' * 24, delta=1), grpc.StatusCode.INVALID_ARGUMENT),
+    (AdjustQuantityRequest(name='orgs/main/parts/notanid', delta=1), grpc.StatusCode.INVALID_ARGUMENT),
+    (
+        AdjustQuantityRequest(name='orgs/main/parts/' + '0' * 24, delta=1, min_quantity=5, max_quantity=4),
+        grpc.StatusCode.INVALID_ARGUMENT
+    ),
+    (
+        AdjustQuantityRequest(name='orgs/main/parts/' + '0' * 24, delta=1, min_quantity=2 ** 63),
+        grpc.StatusCode.INVALID_ARGUMENT
+    ),
+    (
+        AdjustQuantityRequest(name='orgs/main/parts/' + '0' * 24, delta=1, max_quantity=2 ** 63),
+        grpc.StatusCode.INVALID_ARGUMENT
+    )
+])
+def test_AdjustQuantity_returns_errors(service, request_, code):
+    try:
+        service.AdjustQuantity(request_)
+        assert False, 'Should have hit exception!'
+    except grpc.RpcError as error:
+        assert error.code() == code, error.details()
+
+
+def test_BatchAdjustQuantities(service):
+    name = service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=Part(quantity=5))).name
+
+    result = service.BatchAdjustQuantities(BatchAdjustQuantitiesRequest(
+        parent='orgs/main/parts',
+        requests=[
+            AdjustQuantityRequest(name=name, delta=-2),
+            AdjustQuantityRequest(name='orgs/main/parts/notanid', delta=1),
+            AdjustQuantityRequest(name=name, delta=-4),
+            AdjustQuantityRequest(name=name, delta=-3)
+        ]
+    ))
+
+    assert [r.WhichOneof('result') for r in result.results] == ['part', 'status', 'status', 'part']
+    assert result.results[0].part.quantity == 3
+    assert result.results[1].status.code == grpc.StatusCode.INVALID_ARGUMENT.value[0]
+    assert result.results[2].status.code == grpc.StatusCode.FAILED_PRECONDITION.value[0]
+    assert result.results[3].part == service.GetPart(GetPartRequest(name=name)) == Part(name=name, etag='2')
+
+
+def test_BatchCreateParts_returns_same_parts_as_GetPart(service):
+    parts = [
+        Part(manufacturer_part_number='mfg_01', attributes=[PartAttribute(attribute='Resistance', value='10k')]),
+        Part(manufacturer_part_number='mfg_02', suppliers=[PartSupplier(supplier='digikey')])
+    ]
+
+    result = service.BatchCreateParts(BatchCreatePartsRequest(
+        parent='orgs/main/parts',
+        requests=[CreatePartRequest(part=part) for part in parts]
+    ))
+
+    assert len(result.results) == 2
+    for created in result.results:
+        assert created.WhichOneof('result') == 'part'
+        fetched = service.GetPart(GetPartRequest(name=created.part.name))
+        assert created.part.SerializeToString() == fetched.SerializeToString()
+
+
+def test_BatchCreateParts_reports_invalid_parent_per_item(service):
+    result = service.BatchCreateParts(BatchCreatePartsRequest(
+        parent='orgs/main/parts',
+        requests=[
+            CreatePartRequest(parent='orgs/main/parts', part=Part(description='ok')),
+            CreatePartRequest(parent='orgs/wack/parts', part=Part(description='not ok'))
+        ]
+    ))
+
+    assert result.results[0].part.description == 'ok'
+    assert result.results[1].status.code == grpc.StatusCode.INVALID_ARGUMENT.value[0]
+
+
+def test_BatchGetParts_reports_errors_per_item(service):
+    name = service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=Part(description='RES'))).name
+
+    result = service.BatchGetParts(BatchGetPartsRequest(
+        parent='orgs/main/parts',
+        names=[name, 'orgs/main/parts/' + '0' * 24, 'orgs/main/parts/notanid', name]
+    ))
+
+    assert [r.WhichOneof('result') for r in result.results] == ['part', 'status', 'status', 'part']
+    assert result.results[0].part == service.GetPart(GetPartRequest(name=name))
+    assert result.results[1].status.code == grpc.StatusCode.NOT_FOUND.value[0]
+    assert result.results[2].status.code == grpc.StatusCode.INVALID_ARGUMENT.value[0]
+    assert result.results[3].part == result.results[0].part
+
+
+def test_BatchGetParts_returns_invalid_argument_if_parent_invalid(service):
+    try:
+        service.BatchGetParts(BatchGetPartsRequest(parent='orgs/wack/parts', names=[]))
+        assert False, 'Should have hit exception!'
+    except grpc.RpcError as error:
+        assert error.code() == grpc.StatusCode.INVALID_ARGUMENT, error.details()
+
+
+def test_BatchUpdateParts(service):
+    name = service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=Part(description='RES'))).name
+    missing = 'orgs/main/parts/' + '0' * 24
+
+    result = service.BatchUpdateParts(BatchUpdatePartsRequest(
+        parent='orgs/main/parts',
+        requests=[
+            UpdatePartRequest(name=name, part=Part(quantity=4), update_mask=FieldMask(paths=['quantity'])),
+            UpdatePartRequest(name=missing, part=Part(quantity=4), update_mask=FieldMask(paths=['quantity']))
+        ]
+    ))
+
+    assert result.results[0].part == Part(name=name, description='RES', quantity=4, etag='1')
+    assert result.results[0].part == service.GetPart(GetPartRequest(name=name))
+    assert result.results[1].status.code == grpc.StatusCode.NOT_FOUND.value[0]
+
+
+def test_BatchDeleteParts(service):
+    name = service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=Part(description='RES'))).name
+
+    result = service.BatchDeleteParts(BatchDeletePartsRequest(
+        parent='orgs/main/parts',
+        names=[name, 'orgs/main/parts/' + '0' * 24, 'orgs/main/parts/notanid']
+    ))
+
+    assert [status.code for status in result.statuses] == [
+        grpc.StatusCode.OK.value[0], grpc.StatusCode.NOT_FOUND.value[0], grpc.StatusCode.INVALID_ARGUMENT.value[0]
+    ]
+
+    try:
+        service.GetPart(GetPartRequest(name=name))
+        assert False, 'Should have hit exception!'
+    except grpc.RpcError as error:
+        assert error.code() == grpc.StatusCode.NOT_FOUND, error.details()
+
+
+def _create_schema(service):
+    return service.CreatePartSchema(CreatePartSchemaRequest(parent='orgs/main', part_schema=PartSchema(
+        display_name='Resistor',
+        attributes=[
+            PartAttributeSchema(attribute='Resistance', unit='Ohms', type=PartAttributeSchema.NUMERIC),
+            PartAttributeSchema(attribute='Footprint', type=PartAttributeSchema.STRING)
+        ]
+    )))
+
+
+def test_PartSchemas(service):
+    schema = _create_schema(service)
+    assert schema.name.startswith('orgs/main/partschemas/')
+    assert service.GetPartSchema(GetPartSchemaRequest(name=schema.name)) == schema
+
+    other = service.CreatePartSchema(CreatePartSchemaRequest(
+        parent='orgs/main', part_schema=PartSchema(display_name='Capacitor')
+    ))
+    first = service.ListPartSchemas(ListPartSchemaRequest(parent='orgs/main', page_size=1))
+    assert list(first.part_schemas) == [schema]
+    second = service.ListPartSchemas(ListPartSchemaRequest(
+        parent='orgs/main', page_size=1, page_token=first.next_page_token
+    ))
+    assert list(second.part_schemas) == [other]
+    assert second.next_page_token == ''
+
+    updated = service.UpdatePartSchema(UpdatePartSchemaRequest(
+        name=other.name, part_schema=PartSchema(display_name='Capacitors'),
+        update_mask=FieldMask(paths=['display_name'])
+    ))
+    assert updated == PartSchema(name=other.name, display_name='Capacitors')
+    assert service.GetPartSchema(GetPartSchemaRequest(name=other.name)) == updated
+
+    service.DeletePartSchema(DeletePartSchemaRequest(name=other.name))
+    with pytest.raises(grpc.RpcError) as error:
+        service.GetPartSchema(GetPartSchemaRequest(name=other.name))
+    assert error.value.code() == grpc.StatusCode.NOT_FOUND, error.value.details()
+
+
+@pytest.mark.parametrize("request_", [
+    GetPartSchemaRequest(name='orgs/main/partschemas/notanid'),
+    GetPartSchemaRequest(name='orgs/main/parts/' + '0' * 24),
+    CreatePartSchemaRequest(parent='orgs/main/partschemas', part_schema=PartSchema()),
+    CreatePartSchemaRequest(parent='orgs/main', part_schema=PartSchema(attributes=[PartAttributeSchema()])),
+    CreatePartSchemaRequest(parent='orgs/main', part_schema=PartSchema(
+        attributes=[PartAttributeSchema(attribute='Pins'), PartAttributeSchema(attribute='Pins')]
+    ))
+])
+def test_PartSchemas_return_invalid_argument(service, request_):
+    method = service.GetPartSchema if isinstance(request_, GetPartSchemaRequest) else service.CreatePartSchema
+    with pytest.raises(grpc.RpcError) as error:
+        method(request_)
+    assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT, error.value.details()
+
+
+def test_CreatePart_validates_schema(service):
+    schema = _create_schema(service)
+    part = Part(schema_name=schema.name, attributes=[
+        PartAttribute(attribute='Resistance', unit='Ohms', numeric_value=10e3),
+        PartAttribute(attribute='Footprint', value='0402')
+    ])
+    assert service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=part)).schema_name == schema.name
+
+    invalid = [
+        Part(schema_name='orgs/main/partschemas/' + '0' * 24),
+        Part(schema_name=schema.name, attributes=[PartAttribute(attribute='Resistance', unit='kOhm', numeric_value=1)]),
+        Part(schema_name=schema.name, attributes=[PartAttribute(attribute='Resistance', unit='Ohms', value='10k')]),
+        Part(schema_name=schema.name, attributes=[PartAttribute(attribute='Capacitance', numeric_value=1)])
+    ]
+    for part in invalid:
+        with pytest.raises(grpc.RpcError) as error:
+            service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=part))
+        assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT, error.value.details()
+
+    result = service.BatchCreateParts(BatchCreatePartsRequest(
+        parent='orgs/main/parts', requests=[CreatePartRequest(part=invalid[1]), CreatePartRequest(part=Part())]
+    ))
+    assert [result.status.code for result in result.results] == [grpc.StatusCode.INVALID_ARGUMENT.value[0], 0]
+
+
+def test_UpdatePart_validates_schema(service):
+    schema = _create_schema(service)
+    footprint = PartAttribute(attribute='Footprint', value='0402')
+    attributes = [footprint, PartAttribute(attribute='Resistance', unit='Ohms', numeric_value=1)]
+    name = service.CreatePart(CreatePartRequest(
+        parent='orgs/main/parts', part=Part(schema_name=schema.name, attributes=attributes)
+    )).name
+    legacy = service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=Part(
+        schema_name='resistor', attributes=[PartAttribute(attribute='Footprint', value='0603')]
+    ))).name
+
+    def update(name, part, paths):
+        return service.UpdatePart(UpdatePartRequest(name=name, part=part, update_mask=FieldMask(paths=paths)))
+
+    resistance = PartAttribute(attribute='Resistance', unit='Ohms', numeric_value=10e3)
+    paths = ['attributes.1.attribute', 'attributes.1.unit', 'attributes.1.numeric_value']
+    assert list(update(name, Part(schema_name=schema.name, attributes=[footprint, resistance]), paths).attributes) == [
+        footprint, resistance
+    ]
+
+    pins = PartAttribute(attribute='Pins', numeric_value=2)
+    cases = [
+        # Attributes invalid for the schema they name
+        (name, Part(schema_name=schema.name, attributes=[footprint, pins]), paths, grpc.StatusCode.INVALID_ARGUMENT),
+        # Attributes valid for no schema, written to a part following one
+        (name, Part(attributes=[footprint, pins]), paths, grpc.StatusCode.FAILED_PRECONDITION),
+        # Attributes valid for a schema the part does not follow
+        (legacy, Part(schema_name=schema.name, attributes=[footprint]), ['attributes.0.value'],
+         grpc.StatusCode.FAILED_PRECONDITION),
+        # A schema the attributes of the part were not checked against
+        (legacy, Part(schema_name=schema.name), ['schema_name'], grpc.StatusCode.INVALID_ARGUMENT),
+        (legacy, Part(schema_name=schema.name, attributes=[footprint]), ['schema_name', 'attributes.0'],
+         grpc.StatusCode.INVALID_ARGUMENT),
+        # Without mask, the stored attributes past those of the update would be kept unchecked
+        (legacy, Part(schema_name=schema.name, attributes=[footprint]), [], grpc.StatusCode.FAILED_PRECONDITION)
+    ]
+    for target, part, mask, code in cases:
+        with pytest.raises(grpc.RpcError) as error:
+            update(target, part, mask)
+        assert error.value.code() == code, error.value.details()
+
+    assert update(legacy, Part(schema_name=schema.name, attributes=[footprint]), ['schema_name', 'attributes']) == Part(
+        name=legacy, schema_name=schema.name, attributes=[footprint], etag='1'
+    )
+    # Updates without mask of parts following the schema already are checked against it
+    assert update(legacy, Part(schema_name=schema.name, attributes=[footprint]), []).etag == '2'
+    with pytest.raises(grpc.RpcError) as error:
+        update(legacy, Part(schema_name=schema.name, attributes=[pins]), [])
+    assert error.value.code() == grpc.StatusCode.INVALID_ARGUMENT, error.value.details()
+
+    result = service.BatchUpdateParts(BatchUpdatePartsRequest(parent='orgs/main/parts', requests=[
+        UpdatePartRequest(
+            name=name, part=Part(attributes=[footprint]), update_mask=FieldMask(paths=['attributes.0.value'])
+        ),
+        UpdatePartRequest(
+            name=name, part=Part(schema_name=schema.name, attributes=[footprint]),
+            update_mask=FieldMask(paths=['attributes.0.value'])
+        )
+    ]))
+    assert [result.status.code for result in result.results] == [grpc.StatusCode.FAILED_PRECONDITION.value[0], 0]
+
+
+def test_DeletePartSchema_returns_failed_precondition_if_used(service):
+    schema = _create_schema(service)
+    service.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=Part(schema_name=schema.name)))
+
+    with pytest.raises(grpc.RpcError) as error:
+        service.DeletePartSchema(DeletePartSchemaRequest(name=schema.name))
+    assert error.value.code() == grpc.StatusCode.FAILED_PRECONDITION, error.value.details()
+
+
+def test_DeletePartSchema_returns_not_found(service):
+    schema = _create_schema(service)
+    service.DeletePartSchema(DeletePartSchemaRequest(name=schema.name))
+
+    for name in [schema.name, 'orgs/main/partschemas/' + '0' * 24]:
+        with pytest.raises(grpc.RpcError) as error:
+            service.DeletePartSchema(DeletePartSchemaRequest(name=name))
+        assert error.value.code() == grpc.StatusCode.NOT_FOUND, error.value.details()
+
+
+def test_DeletePartSchema_keeps_schemas_used_since_checked(collection, monkeypatch):
+    schemas = collection.database[f'{collection.name}-schemas']
+    service = CatalogService(collection, schemas=schemas)
+    schema = service.schemas.insert(PartSchema(display_name='Resistor'))
+    delete = service.schemas.delete
+
+    def delete_once_used(oid):
+        # A part created with the schema after it was checked
+        service.collection.insert(Part(schema_name=schema.name))
+        return delete(oid)
+
+    def abort(code, details):
+        raise ApiError(code, details)
+
+    monkeypatch.setattr(service.schemas, 'delete', delete_once_used)
+    try:
+        with pytest.raises(ApiError) as err:
+            service.DeletePartSchema(DeletePartSchemaRequest(name=schema.name), types.SimpleNamespace(abort=abort))
+        assert err.value.status == StatusCode.FAILED_PRECONDITION
+
+        oid = schema.name.rsplit('/', 1)[-1]
+        assert service.schemas.get(oid) == schema
+        service.schemas.refresh(force=True)
+        assert service.schemas.get(oid) == schema
+    finally:
+        collection.database.drop_collection(schemas.name)
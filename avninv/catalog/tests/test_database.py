@@ -0,0 +1,91 @@
+import pytest
+from pymongo import read_preferences
+
+from avninv.catalog.cache import PartCache
+from avninv.catalog.database import DatabaseConfig, InvalidDatabaseConfig
+from avninv.catalog.parts_collection import PartCollection
+from avninv.catalog.v1.catalog_pb2 import Part
+
+
+def test_DatabaseConfig_accepts_a_list_of_one_uri():
+    database = DatabaseConfig.from_config(['mongodb://localhost:27017/'])
+
+    assert database.uri == 'mongodb://localhost:27017/'
+    assert database.client_options() == {'retryReads': True, 'retryWrites': True}
+    assert database.reads() is None
+
+
+def test_DatabaseConfig_client_options():
+    database = DatabaseConfig.from_config({
+        'uri': 'mongodb://localhost:27017/',
+        'pool': {'min_size': 2, 'max_idle_ms': 60000, 'wait_queue_timeout_ms': 1000},
+        'connect_timeout_ms': 5000,
+        'compressors': ['zlib'],
+        'retry_writes': False
+    })
+
+    assert database.client_options(threads=16) == {
+        'retryReads': True, 'retryWrites': False, 'maxPoolSize': 16, 'minPoolSize': 2, 'maxIdleTimeMS': 60000,
+        'waitQueueTimeoutMS': 1000, 'connectTimeoutMS': 5000, 'compressors': 'zlib'
+    }
+    # A configured pool size wins over the thread count
+    database.pool['max_size'] = 4
+    assert database.client_options(threads=16)['maxPoolSize'] == 4
+
+
+def test_DatabaseConfig_reads_from_secondaries_with_bounded_staleness():
+    database = DatabaseConfig.from_config({
+        'uri': 'mongodb://localhost:27017/',
+        'reads': {'read_preference': 'secondaryPreferred', 'max_staleness_seconds': 120}
+    })
+
+    assert database.reads() == read_preferences.SecondaryPreferred(max_staleness=120)
+    assert DatabaseConfig.from_config({
+        'uri': 'mongodb://localhost:27017/', 'reads': {'read_preference': 'nearest'}
+    }).reads() == read_preferences.Nearest()
+
+
+@pytest.mark.parametrize('section', [
+    None,
+    [],
+    ['mongodb://a:27017/', 'mongodb://b:27017/'],
+    {'uri': 'http://localhost'},
+    {'uri': 'mongodb://localhost:27017/', 'host': 'localhost'},
+    {'uri': 'mongodb://localhost:27017/', 'pool': {'max_size': 0}},
+    {'uri': 'mongodb://localhost:27017/', 'pool': {'max_connections': 10}},
+    {'uri': 'mongodb://localhost:27017/', 'pool': {'wait_queue_timeout_ms': '1s'}},
+    {'uri': 'mongodb://localhost:27017/', 'connect_timeout_ms': 0},
+    {'uri': 'mongodb://localhost:27017/', 'compressors': 'zlib'},
+    {'uri': 'mongodb://localhost:27017/', 'compressors': ['lz4']},
+    {'uri': 'mongodb://localhost:27017/', 'retry_reads': 'yes'},
+    {'uri': 'mongodb://localhost:27017/', 'reads': {'read_preference': 'secondaries'}},
+    {'uri': 'mongodb://localhost:27017/', 'reads': {'read_preference': 'secondary', 'max_staleness_seconds': 10}},
+    {'uri': 'mongodb://localhost:27017/', 'reads': {'max_staleness_seconds': 120}}
+])
+def test_DatabaseConfig_rejects_invalid_config(section):
+    with pytest.raises(InvalidDatabaseConfig):
+        DatabaseConfig.from_config(section)
+
+
+def test_PartCollection_routes_GetPart_and_ListParts_reads(collection):
+    parts = PartCollection(collection, read_preference=read_preferences.SecondaryPreferred(max_staleness=90))
+    part = parts.insert(Part(description='RES'))
+    oid = part.name.rsplit('/', 1)[-1]
+
+    assert parts.reads.db.read_preference == read_preferences.SecondaryPreferred(max_staleness=90)
+    assert parts.collection.db.read_preference == read_preferences.Primary()
+    # Without secondaries, secondaryPreferred reads fall back to the primary
+    assert parts.get(oid) == part
+    assert parts.list_page(10)[0] == [part]
+
+
+def test_PartCollection_caches_parts_read_from_the_primary(collection, monkeypatch):
+    parts = PartCollection(
+        collection, cache=PartCache(), read_preference=read_preferences.SecondaryPreferred(max_staleness=90)
+    )
+    part = parts.insert(Part(description='RES'))
+    oid = part.name.rsplit('/', 1)[-1]
+
+    monkeypatch.setattr(parts.reads, 'get', lambda *args: pytest.fail('Cached part read with the read preference'))
+    assert parts.get(oid) == part
+    assert len(parts.cache) == 1
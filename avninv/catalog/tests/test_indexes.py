@@ -0,0 +1,73 @@
+import pytest
+
+from avninv.catalog.indexes import InvalidIndexSpec, index_models, reconcile_indexes, summarize_explain
+
+
+def test_index_models():
+    models = index_models([
+        {'fields': ['manufacturer_part_number'], 'unique': True},
+        {'fields': ['attributes.attribute', 'attributes.numeric_value desc']}
+    ])
+
+    assert [model.document for model in models] == [
+        {'key': {'_2': 1}, 'name': 'avninv_manufacturer_part_number_1', 'unique': True},
+        {'key': {'_6._1': 1, '_6._3': -1}, 'name': 'avninv_attributes.attribute_1_attributes.numeric_value_-1'}
+    ]
+
+
+def test_index_models_with_text_index():
+    models = index_models([{
+        'fields': ['manufacturer_part_number text', 'description text'],
+        'weights': {'manufacturer_part_number': 10},
+        'default_language': 'none'
+    }])
+
+    assert [model.document for model in models] == [{
+        'key': {'_2': 'text', '_4': 'text'},
+        'name': 'avninv_manufacturer_part_number_text_description_text',
+        'weights': {'_2': 10},
+        'default_language': 'none'
+    }]
+
+
+@pytest.mark.parametrize('spec', [
+    [{'fields': []}],
+    [{'fields': ['unknown']}],
+    [{'fields': ['quantity up']}],
+    [{'fields': ['description text'], 'weights': {'unknown': 1}}],
+    ['quantity']
+])
+def test_index_models_rejects_invalid_specs(spec):
+    with pytest.raises(InvalidIndexSpec):
+        index_models(spec)
+
+
+def test_reconcile_indexes(collection):
+    collection.create_index('_4', name='manual')
+    collection.create_index('_3', name='avninv_schema_name_1', unique=True)
+    collection.create_index('_5', name='avninv_quantity_1')
+
+    models = index_models([{'fields': ['manufacturer_part_number']}, {'fields': ['schema_name']}])
+
+    assert reconcile_indexes(collection, models) == (
+        ['avninv_manufacturer_part_number_1', 'avninv_schema_name_1'], ['avninv_schema_name_1', 'avninv_quantity_1']
+    )
+    assert reconcile_indexes(collection, models) == ([], [])
+
+    indexes = collection.index_information()
+    assert sorted(indexes) == ['_id_', 'avninv_manufacturer_part_number_1', 'avninv_schema_name_1', 'manual']
+    assert not indexes['avninv_schema_name_1'].get('unique')
+
+
+def test_summarize_explain():
+    explanation = {
+        'queryPlanner': {'winningPlan': {'queryPlan': {
+            'stage': 'LIMIT',
+            'inputStage': {'stage': 'FETCH', 'inputStage': {'stage': 'IXSCAN', 'indexName': 'avninv_schema_name_1'}}
+        }}},
+        'executionStats': {'nReturned': 2, 'totalKeysExamined': 2, 'totalDocsExamined': 2}
+    }
+
+    assert summarize_explain(explanation) == {
+        'plan': 'LIMIT <- FETCH <- IXSCAN avninv_schema_name_1', 'returned': 2, 'keys_examined': 2, 'docs_examined': 2
+    }
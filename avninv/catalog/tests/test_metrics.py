@@ -0,0 +1,179 @@
+import asyncio
+import concurrent.futures
+import types
+import urllib.request
+
+import grpc
+import pytest
+from bson.objectid import ObjectId
+
+from avninv.catalog.cache import PartCache
+from avninv.catalog.catalog import CatalogService
+from avninv.catalog.interceptors import AsyncRpcInterceptor, RpcInterceptor
+from avninv.catalog.metrics import CatalogMetrics, Registry, serve_metrics
+from avninv.catalog.v1.catalog_pb2 import CreatePartRequest, GetPartRequest, Part
+from avninv.catalog.v1.catalog_pb2_grpc import CatalogStub, add_CatalogServicer_to_server
+
+
+def test_Registry_renders_text_format():
+    registry = Registry()
+    counter = registry.counter('requests_total', 'Requests', ['method', 'code'])
+    histogram = registry.histogram('latency_seconds', 'Latency', ['method'], buckets=(0.1, 1))
+    registry.gauge('depth', 'Queue depth', function=lambda: 3)
+
+    counter.inc(('Get', 'OK'))
+    counter.inc(('Get', 'OK'))
+    counter.inc(('Get', 'NOT_FOUND'))
+    histogram.observe(0.05, ('Get',))
+    histogram.observe(0.5, ('Get',))
+    histogram.observe(5, ('Get',))
+
+    assert registry.render().splitlines() == [
+        '# HELP requests_total Requests',
+        '# TYPE requests_total counter',
+        'requests_total{method="Get",code="NOT_FOUND"} 1',
+        'requests_total{method="Get",code="OK"} 2',
+        '# HELP latency_seconds Latency',
+        '# TYPE latency_seconds histogram',
+        'latency_seconds_bucket{method="Get",le="0.1"} 1',
+        'latency_seconds_bucket{method="Get",le="1"} 2',
+        'latency_seconds_bucket{method="Get",le="+Inf"} 3',
+        'latency_seconds_sum{method="Get"} 5.55',
+        'latency_seconds_count{method="Get"} 3',
+        '# HELP depth Queue depth',
+        '# TYPE depth gauge',
+        'depth 3',
+    ]
+
+
+def test_CommandListener_counts_commands_of_the_current_rpc():
+    metrics = CatalogMetrics()
+    event = types.SimpleNamespace(command_name='find', duration_micros=1500)
+
+    started = metrics.start_rpc('GetPart', GetPartRequest())
+    metrics.command_listener.started(event)
+    metrics.command_listener.succeeded(event)
+    metrics.end_rpc('GetPart', started, 'OK')
+
+    # Outside of RPCs, commands are only timed
+    metrics.command_listener.started(event)
+    metrics.command_listener.failed(event)
+
+    text = metrics.registry.render()
+    assert 'catalog_rpc_mongo_round_trips_bucket{method="GetPart",le="1"} 1' in text
+    assert 'catalog_rpc_mongo_round_trips_bucket{method="GetPart",le="0"} 0' in text
+    assert 'catalog_mongo_command_duration_seconds_count{command="find"} 2' in text
+    assert 'catalog_mongo_command_failures_total{command="find"} 1' in text
+    assert 'catalog_rpc_in_flight{method="GetPart"} 0' in text
+
+
+def test_CatalogMetrics_counts_cache_lookups():
+    metrics = CatalogMetrics()
+    cache = PartCache(max_entries=1)
+    metrics.watch_cache(cache)
+
+    first, second = ObjectId(), ObjectId()
+    cache.get(first)
+    cache.put(first, Part(), cache.generation())
+    cache.put(second, Part(), cache.generation())
+    cache.get(second)
+
+    lines = metrics.registry.render().splitlines()
+    assert 'catalog_cache_entries 1' in lines
+    assert '# TYPE catalog_cache_hits_total counter' in lines
+    assert 'catalog_cache_hits_total 1' in lines
+    assert 'catalog_cache_misses_total 1' in lines
+    assert 'catalog_cache_evictions_total 1' in lines
+
+
+@pytest.fixture
+def metrics_service(collection):
+    metrics = CatalogMetrics()
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+    server = grpc.server(executor, interceptors=[RpcInterceptor([metrics])])
+    metrics.watch_executor(executor)
+
+    service = CatalogService(collection, schemas=collection.database[f'{collection.name}-schemas'])
+    add_CatalogServicer_to_server(service, server)
+    port = server.add_insecure_port('127.0.0.1:0')
+    server.start()
+
+    yield metrics, CatalogStub(grpc.insecure_channel(f'127.0.0.1:{port}'))
+
+    server.stop(0)
+    collection.database.drop_collection(f'{collection.name}-schemas')
+
+
+def test_RpcInterceptor_records_rpc_metrics(metrics_service):
+    metrics, stub = metrics_service
+
+    name = stub.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=Part(description='RES'))).name
+    stub.GetPart(GetPartRequest(name=name))
+    with pytest.raises(grpc.RpcError):
+        stub.GetPart(GetPartRequest(name='orgs/main/parts/' + '0' * 24))
+
+    http = serve_metrics(metrics.registry, 0, '127.0.0.1')
+    try:
+        text = urllib.request.urlopen(f'http://127.0.0.1:{http.server_address[1]}/metrics').read().decode()
+    finally:
+        http.shutdown()
+
+    assert 'catalog_rpc_total{method="CreatePart",code="OK"} 1' in text
+    assert 'catalog_rpc_total{method="GetPart",code="NOT_FOUND"} 1' in text
+    assert 'catalog_rpc_total{method="GetPart",code="OK"} 1' in text
+    assert 'catalog_rpc_duration_seconds_count{method="GetPart"} 2' in text
+    assert 'catalog_executor_queue_depth 0' in text
+
+
+class _Codes:
+    def __init__(self):
+        self.codes = []
+
+    def start_rpc(self, method, request):
+        return None
+
+    def end_rpc(self, method, state, code):
+        self.codes.append(code)
+
+
+def _context(active=True, time_remaining=None):
+    return types.SimpleNamespace(
+        code=lambda: None, is_active=lambda: active, time_remaining=lambda: time_remaining
+    )
+
+
+def _stream(request, context):
+    yield 1
+    yield 2
+
+
+def test_RpcInterceptor_records_cancelled_streams():
+    observer = _Codes()
+    handle = RpcInterceptor([observer])._wrap_stream('WatchParts', _stream)
+
+    responses = handle(None, _context())
+    assert list(responses) == [1, 2]
+    # gRPC closes the streams of calls cancelled by their client, or past their deadline
+    for context in (_context(active=False), _context(active=False, time_remaining=0)):
+        responses = handle(None, context)
+        next(responses)
+        responses.close()
+
+    assert observer.codes == ['OK', 'CANCELLED', 'DEADLINE_EXCEEDED']
+
+
+def test_AsyncRpcInterceptor_records_cancelled_calls():
+    observer = _Codes()
+
+    async def wait(request, context):
+        await asyncio.sleep(60)
+
+    async def cancel(call):
+        task = asyncio.ensure_future(call)
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel(AsyncRpcInterceptor([observer])._wrap_unary('GetPart', wait)(None, _context())))
+    assert observer.codes == ['CANCELLED']
@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from avninv.catalog.operation import operation, run, run_async
+
+
+class _Counter:
+    def __init__(self, run_operation, read):
+        self._run = run_operation
+        self.read = read
+
+    @operation
+    def total(self, keys):
+        total = 0
+        for key in keys:
+            try:
+                total += yield self.read(key)
+            except KeyError:
+                total -= 1
+        return total
+
+
+_VALUES = {'a': 1, 'b': 2}
+
+
+def _read(key):
+    return _VALUES[key]
+
+
+async def _read_async(key):
+    await asyncio.sleep(0)
+    return _VALUES[key]
+
+
+def test_run_sends_results_back():
+    assert _Counter(run, _read).total(['a', 'b']) == 3
+
+
+def test_run_async_awaits_results_and_throws_errors():
+    assert asyncio.run(_Counter(run_async, _read_async).total(['a', 'c', 'b'])) == 2
+
+
+def test_run_async_passes_values_through():
+    assert asyncio.run(_Counter(run_async, _read).total(['a', 'b'])) == 3
+
+
+def test_run_async_raises_uncaught_errors():
+    async def read(key):
+        raise ValueError(key)
+
+    with pytest.raises(ValueError):
+        asyncio.run(_Counter(run_async, read).total(['a']))
@@ -0,0 +1,141 @@
+import concurrent.futures
+import os
+import time
+import tracemalloc
+import types
+
+from bson import json_util
+from google.protobuf.field_mask_pb2 import FieldMask
+import grpc
+import pytest
+
+from avninv.catalog.admin import CatalogAdminService
+from avninv.catalog.catalog import CatalogService
+from avninv.catalog.interceptors import RpcInterceptor
+from avninv.catalog.profiling import Profiler
+from avninv.catalog.v1.admin_pb2 import (
+    ProfileCpuRequest, SetSlowRequestThresholdRequest, SnapshotMemoryRequest
+)
+from avninv.catalog.v1.admin_pb2_grpc import CatalogAdminStub, add_CatalogAdminServicer_to_server
+from avninv.catalog.v1.catalog_pb2 import CreatePartRequest, GetPartRequest, Part, UpdatePartRequest
+from avninv.catalog.v1.catalog_pb2_grpc import CatalogStub, add_CatalogServicer_to_server
+from avninv.error.api_error import ApiError, StatusCode
+
+
+@pytest.fixture
+def profiled_service(collection, tmp_path):
+    profiler = Profiler(str(tmp_path), cpu_seconds=0.1, interval=0.001)
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+    server = grpc.server(executor, interceptors=[RpcInterceptor([profiler])])
+
+    service = CatalogService(collection, schemas=collection.database[f'{collection.name}-schemas'])
+    add_CatalogServicer_to_server(service, server)
+    add_CatalogAdminServicer_to_server(CatalogAdminService(profiler), server)
+    port = server.add_insecure_port('127.0.0.1:0')
+    server.start()
+
+    channel = grpc.insecure_channel(f'127.0.0.1:{port}')
+    yield profiler, CatalogStub(channel), CatalogAdminStub(channel)
+
+    server.stop(0)
+    collection.database.drop_collection(f'{collection.name}-schemas')
+
+
+def _slow_requests(directory):
+    with open(os.path.join(directory, f'slow-requests-{os.getpid()}.jsonl')) as log:
+        return [json_util.loads(line) for line in log]
+
+
+def test_slow_requests_are_logged_above_the_threshold(profiled_service):
+    profiler, stub, admin = profiled_service
+
+    name = stub.CreatePart(CreatePartRequest(parent='orgs/main/parts', part=Part(description='RES'))).name
+    assert not os.path.exists(os.path.join(profiler.directory, f'slow-requests-{os.getpid()}.jsonl'))
+
+    admin.SetSlowRequestThreshold(SetSlowRequestThresholdRequest(threshold_ms=0))
+    request = UpdatePartRequest(name=name, part=Part(quantity=3), update_mask=FieldMask(paths=['quantity']))
+    stub.UpdatePart(request)
+    with pytest.raises(grpc.RpcError):
+        stub.GetPart(GetPartRequest(name='orgs/main/parts/' + '0' * 24))
+
+    admin.SetSlowRequestThreshold(SetSlowRequestThresholdRequest())
+    stub.GetPart(GetPartRequest(name=name))
+
+    update, get = _slow_requests(profiler.directory)
+    assert update['method'] == 'UpdatePart'
+    assert update['code'] == 'OK'
+    assert update['request_bytes'] == request.ByteSize()
+    assert update['conversion_ms'] > 0
+    assert update['updates'][0]['$set'] == {'_5': 3}
+    assert get['method'] == 'GetPart'
+    assert get['code'] == 'NOT_FOUND'
+    assert get['updates'] == []
+
+
+def test_SetSlowRequestThreshold_invalid(profiled_service):
+    _, _, admin = profiled_service
+
+    with pytest.raises(grpc.RpcError) as err:
+        admin.SetSlowRequestThreshold(SetSlowRequestThresholdRequest(threshold_ms=-1))
+    assert err.value.code() == grpc.StatusCode.INVALID_ARGUMENT
+
+
+def test_ProfileCpu_writes_folded_stacks(profiled_service):
+    profiler, _, admin = profiled_service
+
+    path = admin.ProfileCpu(ProfileCpuRequest()).path
+    with pytest.raises(grpc.RpcError) as err:
+        admin.ProfileCpu(ProfileCpuRequest())
+    assert err.value.code() == grpc.StatusCode.FAILED_PRECONDITION
+
+    deadline = time.monotonic() + 5
+    while not os.path.exists(path) and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    lines = open(path).read().splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(' ', 1)
+    assert int(count) > 0
+    assert any(line.startswith('MainThread;') for line in lines)
+
+
+def test_ProfileCpu_invalid_duration(tmp_path):
+    with pytest.raises(ApiError) as err:
+        Profiler(str(tmp_path)).profile_cpu(3600)
+    assert err.value.status == StatusCode.INVALID_ARGUMENT
+
+
+def test_SnapshotMemory_starts_tracing_then_dumps(profiled_service):
+    _, _, admin = profiled_service
+    assert not tracemalloc.is_tracing()
+
+    try:
+        assert admin.SnapshotMemory(SnapshotMemoryRequest()).path == ''
+        assert tracemalloc.is_tracing()
+
+        path = admin.SnapshotMemory(SnapshotMemoryRequest()).path
+        assert tracemalloc.Snapshot.load(path).traces
+        assert open(f'{path}.txt').readline().startswith('traced: ')
+
+        admin.SnapshotMemory(SnapshotMemoryRequest(stop=True))
+        assert not tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_CommandListener_times_commands_of_the_current_rpc(tmp_path):
+    profiler = Profiler(str(tmp_path), slow_request_ms=0)
+    event = types.SimpleNamespace(command_name='find', duration_micros=1500)
+
+    started = profiler.start_rpc('GetPart', GetPartRequest())
+    profiler.command_listener.started(event)
+    profiler.command_listener.succeeded(event)
+    profiler.end_rpc('GetPart', started, 'OK')
+
+    # Outside of RPCs, commands are ignored
+    profiler.command_listener.started(event)
+    profiler.command_listener.failed(event)
+
+    entry, = _slow_requests(str(tmp_path))
+    assert entry['mongo_commands'] == 1
+    assert entry['mongo_ms'] == 1.5
@@ -0,0 +1,93 @@
+import pytest
+
+from avninv.catalog.schemas import SchemaRegistry, compile_validator, is_schema_name
+from avninv.catalog.v1.catalog_pb2 import PartAttribute, PartAttributeSchema, PartSchema
+from avninv.error.api_error import ApiError
+
+
+RESISTOR = PartSchema(name='orgs/main/partschemas/0001', attributes=[
+    PartAttributeSchema(attribute='Resistance', unit='Ohms', type=PartAttributeSchema.NUMERIC),
+    PartAttributeSchema(attribute='Pins', type=PartAttributeSchema.INTEGER),
+    PartAttributeSchema(attribute='Footprint', type=PartAttributeSchema.STRING),
+    PartAttributeSchema(attribute='Notes')
+])
+
+
+@pytest.mark.parametrize("name,valid", [
+    ('orgs/main/partschemas/0001', True),
+    ('orgs/main/partschemas/', False),
+    ('orgs/main/parts/0001', False),
+    ('resistor', False),
+    ('', False)
+])
+def test_is_schema_name(name, valid):
+    assert is_schema_name(name) == valid
+
+
+def test_compile_validator_accepts_declared_attributes():
+    compile_validator(RESISTOR)([
+        PartAttribute(attribute='Resistance', unit='Ohms', numeric_value=10e3, value='10k'),
+        PartAttribute(attribute='Pins', numeric_value=2),
+        PartAttribute(attribute='Footprint', value='0402'),
+        PartAttribute(attribute='Notes')
+    ])
+
+
+@pytest.mark.parametrize("attribute", [
+    PartAttribute(attribute='Capacitance', unit='F', numeric_value=1e-6),
+    PartAttribute(attribute='Resistance', unit='kOhms', numeric_value=10),
+    PartAttribute(attribute='Resistance', unit='Ohms', value='10k'),
+    PartAttribute(attribute='Pins', numeric_value=2.5),
+    PartAttribute(attribute='Footprint', numeric_value=402)
+])
+def test_compile_validator_rejects_invalid_attributes(attribute):
+    with pytest.raises(ApiError):
+        compile_validator(RESISTOR)([attribute])
+
+
+def test_SchemaRegistry_validator():
+    registry = SchemaRegistry()
+    registry.replace([RESISTOR])
+
+    assert registry.validator('resistor') is None
+    assert registry.validator(RESISTOR.name) is not None
+    with pytest.raises(ApiError):
+        registry.validator('orgs/main/partschemas/0002')
+
+
+def test_SchemaRegistry_put_and_remove():
+    registry = SchemaRegistry()
+    schema = PartSchema(name='orgs/main/partschemas/0002', display_name='Capacitor')
+
+    registry.put(schema)
+    assert registry.get(schema.name) is schema
+    assert registry.names() == [schema.name]
+
+    registry.remove(schema.name)
+    assert registry.get(schema.name) is None
+    assert len(registry) == 0
+
+
+def test_SchemaRegistry_lists_by_name():
+    registry = SchemaRegistry()
+    registry.replace([PartSchema(name=f'orgs/main/partschemas/000{index}') for index in (3, 1, 2)])
+
+    schemas, more = registry.list(2)
+    assert [schema.name for schema in schemas] == ['orgs/main/partschemas/0001', 'orgs/main/partschemas/0002']
+    assert more
+
+    schemas, more = registry.list(2, after=schemas[-1].name)
+    assert [schema.name for schema in schemas] == ['orgs/main/partschemas/0003']
+    assert not more
+
+
+def test_SchemaRegistry_expires():
+    registry = SchemaRegistry(ttl=60)
+    assert registry.stale()
+
+    registry.replace([])
+    assert not registry.stale()
+
+    registry.ttl = -1
+    registry.replace([])
+    assert registry.stale()
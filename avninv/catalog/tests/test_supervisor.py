@@ -0,0 +1,60 @@
+import multiprocessing
+import threading
+import time
+
+from avninv.catalog.supervisor import Supervisor
+
+
+def _wait_for(predicate, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, 'Timed out'
+        time.sleep(0.05)
+
+
+def test_supervisor_restarts_crashed_workers_and_stops_them():
+    starts = multiprocessing.Value('i', 0)
+
+    def target(index):
+        with starts.get_lock():
+            starts.value += 1
+            crash = starts.value <= 2
+        if crash:
+            raise SystemExit(1)
+        time.sleep(60)
+
+    supervisor = Supervisor(target, workers=2, restart_delay=0.1, shutdown_timeout=5)
+    thread = threading.Thread(target=supervisor.supervise)
+    thread.start()
+
+    # Workers may start before the supervisor records them
+    _wait_for(lambda: starts.value == 4 and len(supervisor._processes) == 2)
+    processes = list(supervisor._processes.values())
+
+    supervisor.stop()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert not any(process.is_alive() for process in processes)
+
+
+def test_supervisor_backs_off_then_gives_up_on_crashing_workers():
+    starts = multiprocessing.Value('i', 0)
+
+    def target(index):
+        with starts.get_lock():
+            starts.value += 1
+        raise SystemExit(1)
+
+    supervisor = Supervisor(target, workers=1, restart_delay=0.01, max_restarts=2, shutdown_timeout=5)
+    assert supervisor.supervise() == 1
+    assert starts.value == 3
+
+
+def test_supervisor_doubles_restart_delays_within_the_window():
+    supervisor = Supervisor(None, workers=2, restart_delay=1, max_restart_delay=3, max_restarts=4, restart_window=60)
+
+    assert [supervisor._restart_delay(0, when) for when in (0, 1, 2, 3, 4)] == [1, 2, 3, 3, None]
+    assert supervisor._restart_delay(1, 4) == 1
+    # Exits older than the window no longer count
+    assert supervisor._restart_delay(0, 63.5) == 2
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: avninv/catalog/v1/admin.proto
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1d\x61vninv/catalog/v1/admin.proto\x12\x11\x61vninv.catalog.v1\"$\n\x11ProfileCpuRequest\x12\x0f\n\x07seconds\x18\x01 \x01(\x01\"%\n\x15SnapshotMemoryRequest\x12\x0c\n\x04stop\x18\x01 \x01(\x08\"L\n\x1eSetSlowRequestThresholdRequest\x12\x19\n\x0cthreshold_ms\x18\x01 \x01(\x01H\x00\x88\x01\x01\x42\x0f\n\r_threshold_ms\"0\n\x0fProfileResponse\x12\x0c\n\x04path\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t2\xb8\x02\n\x0c\x43\x61talogAdmin\x12V\n\nProfileCpu\x12$.avninv.catalog.v1.ProfileCpuRequest\x1a\".avninv.catalog.v1.ProfileResponse\x12^\n\x0eSnapshotMemory\x12(.avninv.catalog.v1.SnapshotMemoryRequest\x1a\".avninv.catalog.v1.ProfileResponse\x12p\n\x17SetSlowRequestThreshold\x12\x31.avninv.catalog.v1.SetSlowRequestThresholdRequest\x1a\".avninv.catalog.v1.ProfileResponseb\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'avninv.catalog.v1.admin_pb2', _globals)
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _globals['_PROFILECPUREQUEST']._serialized_start=52
+  _globals['_PROFILECPUREQUEST']._serialized_end=88
+  _globals['_SNAPSHOTMEMORYREQUEST']._serialized_start=90
+  _globals['_SNAPSHOTMEMORYREQUEST']._serialized_end=127
+  _globals['_SETSLOWREQUESTTHRESHOLDREQUEST']._serialized_start=129
+  _globals['_SETSLOWREQUESTTHRESHOLDREQUEST']._serialized_end=205
+  _globals['_PROFILERESPONSE']._serialized_start=207
+  _globals['_PROFILERESPONSE']._serialized_end=255
+  _globals['_CATALOGADMIN']._serialized_start=258
+  _globals['_CATALOGADMIN']._serialized_end=570
+# @@protoc_insertion_point(module_scope)
@@ -0,0 +1,140 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+
+from avninv.catalog.v1 import admin_pb2 as avninv_dot_catalog_dot_v1_dot_admin__pb2
+
+
+class CatalogAdminStub(object):
+    """* Operations on a single catalog server process, served next to the Catalog service when profiling is configured.
+    Output files are written to the profiling directory of the process answering the call. *
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.ProfileCpu = channel.unary_unary(
+                '/avninv.catalog.v1.CatalogAdmin/ProfileCpu',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_admin__pb2.ProfileCpuRequest.SerializeToString,
+                response_deserializer=avninv_dot_catalog_dot_v1_dot_admin__pb2.ProfileResponse.FromString,
+                )
+        self.SnapshotMemory = channel.unary_unary(
+                '/avninv.catalog.v1.CatalogAdmin/SnapshotMemory',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_admin__pb2.SnapshotMemoryRequest.SerializeToString,
+                response_deserializer=avninv_dot_catalog_dot_v1_dot_admin__pb2.ProfileResponse.FromString,
+                )
+        self.SetSlowRequestThreshold = channel.unary_unary(
+                '/avninv.catalog.v1.CatalogAdmin/SetSlowRequestThreshold',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_admin__pb2.SetSlowRequestThresholdRequest.SerializeToString,
+                response_deserializer=avninv_dot_catalog_dot_v1_dot_admin__pb2.ProfileResponse.FromString,
+                )
+
+
+class CatalogAdminServicer(object):
+    """* Operations on a single catalog server process, served next to the Catalog service when profiling is configured.
+    Output files are written to the profiling directory of the process answering the call. *
+    """
+
+    def ProfileCpu(self, request, context):
+        """Samples the stacks of the process for `seconds`, in the background.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SnapshotMemory(self, request, context):
+        """Starts tracing allocations, then dumps a snapshot of them on each later call.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SetSlowRequestThreshold(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_CatalogAdminServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'ProfileCpu': grpc.unary_unary_rpc_method_handler(
+                    servicer.ProfileCpu,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_admin__pb2.ProfileCpuRequest.FromString,
+                    response_serializer=avninv_dot_catalog_dot_v1_dot_admin__pb2.ProfileResponse.SerializeToString,
+            ),
+            'SnapshotMemory': grpc.unary_unary_rpc_method_handler(
+                    servicer.SnapshotMemory,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_admin__pb2.SnapshotMemoryRequest.FromString,
+                    response_serializer=avninv_dot_catalog_dot_v1_dot_admin__pb2.ProfileResponse.SerializeToString,
+            ),
+            'SetSlowRequestThreshold': grpc.unary_unary_rpc_method_handler(
+                    servicer.SetSlowRequestThreshold,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_admin__pb2.SetSlowRequestThresholdRequest.FromString,
+                    response_serializer=avninv_dot_catalog_dot_v1_dot_admin__pb2.ProfileResponse.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'avninv.catalog.v1.CatalogAdmin', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+
+
+ # This class is part of an EXPERIMENTAL API.
+class CatalogAdmin(object):
+    """* Operations on a single catalog server process, served next to the Catalog service when profiling is configured.
+    Output files are written to the profiling directory of the process answering the call. *
+    """
+
+    @staticmethod
+    def ProfileCpu(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/avninv.catalog.v1.CatalogAdmin/ProfileCpu',
+            avninv_dot_catalog_dot_v1_dot_admin__pb2.ProfileCpuRequest.SerializeToString,
+            avninv_dot_catalog_dot_v1_dot_admin__pb2.ProfileResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def SnapshotMemory(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/avninv.catalog.v1.CatalogAdmin/SnapshotMemory',
+            avninv_dot_catalog_dot_v1_dot_admin__pb2.SnapshotMemoryRequest.SerializeToString,
+            avninv_dot_catalog_dot_v1_dot_admin__pb2.ProfileResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def SetSlowRequestThreshold(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/avninv.catalog.v1.CatalogAdmin/SetSlowRequestThreshold',
+            avninv_dot_catalog_dot_v1_dot_admin__pb2.SetSlowRequestThresholdRequest.SerializeToString,
+            avninv_dot_catalog_dot_v1_dot_admin__pb2.ProfileResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: avninv/catalog/v1/catalog.proto
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+from google.api import annotations_pb2 as google_dot_api_dot_annotations__pb2
+from google.protobuf import empty_pb2 as google_dot_protobuf_dot_empty__pb2
+from google.protobuf import field_mask_pb2 as google_dot_protobuf_dot_field__mask__pb2
+from google.rpc import status_pb2 as google_dot_rpc_dot_status__pb2
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x1f\x61vninv/catalog/v1/catalog.proto\x12\x11\x61vninv.catalog.v1\x1a\x1cgoogle/api/annotations.proto\x1a\x1bgoogle/protobuf/empty.proto\x1a google/protobuf/field_mask.proto\x1a\x17google/rpc/status.proto\"\x99\x01\n\x0fListPartRequest\x12\x0e\n\x06parent\x18\x01 \x01(\t\x12\x11\n\tpage_size\x18\x02 \x01(\x05\x12\x12\n\npage_token\x18\x03 \x01(\t\x12-\n\tread_mask\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.FieldMask\x12\x0e\n\x06\x66ilter\x18\x05 \x01(\t\x12\x10\n\x08order_by\x18\x06 \x01(\t\"S\n\x10ListPartResponse\x12&\n\x05parts\x18\x01 \x03(\x0b\x32\x17.avninv.catalog.v1.Part\x12\x17\n\x0fnext_page_token\x18\x02 \x01(\t\"g\n\x12StreamPartsRequest\x12\x0e\n\x06parent\x18\x01 \x01(\t\x12\x12\n\nchunk_size\x18\x02 \x01(\x05\x12-\n\tread_mask\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.FieldMask\"=\n\x13StreamPartsResponse\x12&\n\x05parts\x18\x01 \x03(\x0b\x32\x17.avninv.catalog.v1.Part\"\x81\x01\n\x12\x41ttributePredicate\x12\x11\n\tattribute\x18\x01 \x01(\t\x12\x0c\n\x04unit\x18\x02 \x01(\t\x12\x16\n\tmin_value\x18\x03 \x01(\x01H\x00\x88\x01\x01\x12\x16\n\tmax_value\x18\x04 \x01(\x01H\x01\x88\x01\x01\x42\x0c\n\n_min_valueB\x0c\n\n_max_value\"\xc4\x01\n\x12SearchPartsRequest\x12\x0e\n\x06parent\x18\x01 \x01(\t\x12\x39\n\npredicates\x18\x02 \x03(\x0b\x32%.avninv.catalog.v1.AttributePredicate\x12\x11\n\tpage_size\x18\x03 \x01(\x05\x12\x12\n\npage_token\x18\x04 \x01(\t\x12-\n\tread_mask\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.FieldMask\x12\r\n\x05query\x18\x06 \x01(\t\"V\n\x13SearchPartsResponse\x12&\n\x05parts\x18\x01 \x03(\x0b\x32\x17.avninv.catalog.v1.Part\x12\x17\n\x0fnext_page_token\x18\x02 \x01(\t\"\xdb\x01\n\x15\x41ggregatePartsRequest\x12\x0e\n\x06parent\x18\x01 \x01(\t\x12\x42\n\x08group_by\x18\x02 \x01(\x0e\x32\x30.avninv.catalog.v1.AggregatePartsRequest.GroupBy\x12\x0e\n\x06\x66ilter\x18\x03 \x01(\t\x12\x1a\n\x12low_stock_quantity\x18\x04 \x01(\x04\"B\n\x07GroupBy\x12\x18\n\x14GROUP_BY_UNSPECIFIED\x10\x00\x12\x0f\n\x0bSCHEMA_NAME\x10\x01\x12\x0c\n\x08SUPPLIER\x10\x02\"a\n\rPartAggregate\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\x12\n\npart_count\x18\x02 \x01(\x04\x12\x16\n\x0etotal_quantity\x18\x03 \x01(\x04\x12\x17\n\x0flow_stock_count\x18\x04 \x01(\x04\"J\n\x16\x41ggregatePartsResponse\x12\x30\n\x06groups\x18\x01 \x03(\x0b\x32 .avninv.catalog.v1.PartAggregate\"9\n\x11WatchPartsRequest\x12\x0e\n\x06parent\x18\x01 \x01(\t\x12\x14\n\x0cresume_token\x18\x02 \x01(\t\"\xe6\x01\n\x12WatchPartsResponse\x12\x43\n\nevent_type\x18\x01 \x01(\x0e\x32/.avninv.catalog.v1.WatchPartsResponse.EventType\x12%\n\x04part\x18\x02 \x01(\x0b\x32\x17.avninv.catalog.v1.Part\x12\x14\n\x0cresume_token\x18\x03 \x01(\t\"N\n\tEventType\x12\x1a\n\x16\x45VENT_TYPE_UNSPECIFIED\x10\x00\x12\x0b\n\x07\x43REATED\x10\x01\x12\x0b\n\x07UPDATED\x10\x02\x12\x0b\n\x07\x44\x45LETED\x10\x03\"d\n\x0eGetPartRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12-\n\tread_mask\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.FieldMask\x12\x15\n\rif_none_match\x18\x03 \x01(\t\"J\n\x11\x43reatePartRequest\x12\x0e\n\x06parent\x18\x01 \x01(\t\x12%\n\x04part\x18\x02 \x01(\x0b\x32\x17.avninv.catalog.v1.Part\"y\n\x11UpdatePartRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12%\n\x04part\x18\x02 \x01(\x0b\x32\x17.avninv.catalog.v1.Part\x12/\n\x0bupdate_mask\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.FieldMask\"\xa5\x01\n\x15\x41\x64justQuantityRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05\x64\x65lta\x18\x02 \x01(\x03\x12\x14\n\x0cmin_quantity\x18\x03 \x01(\x04\x12\x19\n\x0cmax_quantity\x18\x04 \x01(\x04H\x00\x88\x01\x01\x12-\n\tread_mask\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.FieldMaskB\x0f\n\r_max_quantity\"!\n\x11\x44\x65letePartRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\"5\n\x14\x42\x61tchGetPartsRequest\x12\x0e\n\x06parent\x18\x01 \x01(\t\x12\r\n\x05names\x18\x02 \x03(\t\"a\n\x17\x42\x61tchCreatePartsRequest\x12\x0e\n\x06parent\x18\x01 \x01(\t\x12\x36\n\x08requests\x18\x02 \x03(\x0b\x32$.avninv.catalog.v1.CreatePartRequest\"a\n\x17\x42\x61tchUpdatePartsRequest\x12\x0e\n\x06parent\x18\x01 \x01(\t\x12\x36\n\x08requests\x18\x02 \x03(\x0b\x32$.avninv.catalog.v1.UpdatePartRequest\"j\n\x1c\x42\x61tchAdjustQuantitiesRequest\x12\x0e\n\x06parent\x18\x01 \x01(\t\x12:\n\x08requests\x18\x02 \x03(\x0b\x32(.avninv.catalog.v1.AdjustQuantityRequest\"8\n\x17\x42\x61tchDeletePartsRequest\x12\x0e\n\x06parent\x18\x01 \x01(\t\x12\r\n\x05names\x18\x02 \x03(\t\"j\n\x0f\x42\x61tchPartResult\x12\'\n\x04part\x18\x01 \x01(\x0b\x32\x17.avninv.catalog.v1.PartH\x00\x12$\n\x06status\x18\x02 \x01(\x0b\x32\x12.google.rpc.StatusH\x00\x42\x08\n\x06result\"I\n\x12\x42\x61tchPartsResponse\x12\x33\n\x07results\x18\x01 \x03(\x0b\x32\".avninv.catalog.v1.BatchPartResult\"@\n\x18\x42\x61tchDeletePartsResponse\x12$\n\x08statuses\x18\x01 \x03(\x0b\x32\x12.google.rpc.Status\"N\n\x15ListPartSchemaRequest\x12\x0e\n\x06parent\x18\x01 \x01(\t\x12\x11\n\tpage_size\x18\x02 \x01(\x05\x12\x12\n\npage_token\x18\x03 \x01(\t\"f\n\x16ListPartSchemaResponse\x12\x33\n\x0cpart_schemas\x18\x01 \x03(\x0b\x32\x1d.avninv.catalog.v1.PartSchema\x12\x17\n\x0fnext_page_token\x18\x02 \x01(\t\"$\n\x14GetPartSchemaRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\"]\n\x17\x43reatePartSchemaRequest\x12\x0e\n\x06parent\x18\x01 \x01(\t\x12\x32\n\x0bpart_schema\x18\x02 \x01(\x0b\x32\x1d.avninv.catalog.v1.PartSchema\"\x8c\x01\n\x17UpdatePartSchemaRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x32\n\x0bpart_schema\x18\x02 \x01(\x0b\x32\x1d.avninv.catalog.v1.PartSchema\x12/\n\x0bupdate_mask\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.FieldMask\"\'\n\x17\x44\x65letePartSchemaRequest\x12\x0c\n\x04name\x18\x01 \x01(\t\"m\n\rPartAttribute\x12\x11\n\tattribute\x18\x01 \x01(\t\x12\x0c\n\x04unit\x18\x02 \x01(\t\x12\x1a\n\rnumeric_value\x18\x03 \x01(\x01H\x00\x88\x01\x01\x12\r\n\x05value\x18\x04 \x01(\tB\x10\n\x0e_numeric_value\"K\n\x0cPartSupplier\x12\x10\n\x08supplier\x18\x01 \x01(\t\x12\x1c\n\x14supplier_part_number\x18\x02 \x01(\t\x12\x0b\n\x03url\x18\x03 \x01(\t\"\xea\x01\n\x04Part\x12\x0c\n\x04name\x18\x01 \x01(\t\x12 \n\x18manufacturer_part_number\x18\x02 \x01(\t\x12\x13\n\x0bschema_name\x18\x03 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x04 \x01(\t\x12\x10\n\x08quantity\x18\x05 \x01(\x04\x12\x34\n\nattributes\x18\x06 \x03(\x0b\x32 .avninv.catalog.v1.PartAttribute\x12\x32\n\tsuppliers\x18\x07 \x03(\x0b\x32\x1f.avninv.catalog.v1.PartSupplier\x12\x0c\n\x04\x65tag\x18\x08 \x01(\t\"\xb5\x01\n\x13PartAttributeSchema\x12\x11\n\tattribute\x18\x01 \x01(\t\x12\x0c\n\x04unit\x18\x02 \x01(\t\x12\x39\n\x04type\x18\x03 \x01(\x0e\x32+.avninv.catalog.v1.PartAttributeSchema.Type\"B\n\x04Type\x12\x14\n\x10TYPE_UNSPECIFIED\x10\x00\x12\x0b\n\x07NUMERIC\x10\x01\x12\x0b\n\x07INTEGER\x10\x02\x12\n\n\x06STRING\x10\x03\"l\n\nPartSchema\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x14\n\x0c\x64isplay_name\x18\x02 \x01(\t\x12:\n\nattributes\x18\x03 \x03(\x0b\x32&.avninv.catalog.v1.PartAttributeSchema2\xd4\x15\n\x07\x43\x61talog\x12w\n\tListParts\x12\".avninv.catalog.v1.ListPartRequest\x1a#.avninv.catalog.v1.ListPartResponse\"!\x82\xd3\xe4\x93\x02\x1b\x12\x19/v1/{parent=orgs/*}/parts\x12\x88\x01\n\x0bStreamParts\x12%.avninv.catalog.v1.StreamPartsRequest\x1a&.avninv.catalog.v1.StreamPartsResponse\"(\x82\xd3\xe4\x93\x02\"\x12 /v1/{parent=orgs/*}/parts:stream0\x01\x12\x86\x01\n\x0bSearchParts\x12%.avninv.catalog.v1.SearchPartsRequest\x1a&.avninv.catalog.v1.SearchPartsResponse\"(\x82\xd3\xe4\x93\x02\"\x12 /v1/{parent=orgs/*}/parts:search\x12\x92\x01\n\x0e\x41ggregateParts\x12(.avninv.catalog.v1.AggregatePartsRequest\x1a).avninv.catalog.v1.AggregatePartsResponse\"+\x82\xd3\xe4\x93\x02%\x12#/v1/{parent=orgs/*}/parts:aggregate\x12\x84\x01\n\nWatchParts\x12$.avninv.catalog.v1.WatchPartsRequest\x1a%.avninv.catalog.v1.WatchPartsResponse\"\'\x82\xd3\xe4\x93\x02!\x12\x1f/v1/{parent=orgs/*}/parts:watch0\x01\x12h\n\x07GetPart\x12!.avninv.catalog.v1.GetPartRequest\x1a\x17.avninv.catalog.v1.Part\"!\x82\xd3\xe4\x93\x02\x1b\x12\x19/v1/{name=orgs/*/parts/*}\x12t\n\nCreatePart\x12$.avninv.catalog.v1.CreatePartRequest\x1a\x17.avninv.catalog.v1.Part\"\'\x82\xd3\xe4\x93\x02!\"\x19/v1/{parent=orgs/*}/parts:\x04part\x12t\n\nUpdatePart\x12$.avninv.catalog.v1.UpdatePartRequest\x1a\x17.avninv.catalog.v1.Part\"\'\x82\xd3\xe4\x93\x02!2\x19/v1/{name=orgs/*/parts/*}:\x04part\x12\x88\x01\n\x0e\x41\x64justQuantity\x12(.avninv.catalog.v1.AdjustQuantityRequest\x1a\x17.avninv.catalog.v1.Part\"3\x82\xd3\xe4\x93\x02-\"(/v1/{name=orgs/*/parts/*}:adjustQuantity:\x01*\x12m\n\nDeletePart\x12$.avninv.catalog.v1.DeletePartRequest\x1a\x16.google.protobuf.Empty\"!\x82\xd3\xe4\x93\x02\x1b*\x19/v1/{name=orgs/*/parts/*}\x12\x8b\x01\n\rBatchGetParts\x12\'.avninv.catalog.v1.BatchGetPartsRequest\x1a%.avninv.catalog.v1.BatchPartsResponse\"*\x82\xd3\xe4\x93\x02$\x12\"/v1/{parent=orgs/*}/parts:batchGet\x12\x97\x01\n\x10\x42\x61tchCreateParts\x12*.avninv.catalog.v1.BatchCreatePartsRequest\x1a%.avninv.catalog.v1.BatchPartsResponse\"0\x82\xd3\xe4\x93\x02*\"%/v1/{parent=orgs/*}/parts:batchCreate:\x01*\x12\x97\x01\n\x10\x42\x61tchUpdateParts\x12*.avninv.catalog.v1.BatchUpdatePartsRequest\x1a%.avninv.catalog.v1.BatchPartsResponse\"0\x82\xd3\xe4\x93\x02*\"%/v1/{parent=orgs/*}/parts:batchUpdate:\x01*\x12\xab\x01\n\x15\x42\x61tchAdjustQuantities\x12/.avninv.catalog.v1.BatchAdjustQuantitiesRequest\x1a%.avninv.catalog.v1.BatchPartsResponse\":\x82\xd3\xe4\x93\x02\x34\"//v1/{parent=orgs/*}/parts:batchAdjustQuantities:\x01*\x12\x9d\x01\n\x10\x42\x61tchDeleteParts\x12*.avninv.catalog.v1.BatchDeletePartsRequest\x1a+.avninv.catalog.v1.BatchDeletePartsResponse\"0\x82\xd3\xe4\x93\x02*\"%/v1/{parent=orgs/*}/parts:batchDelete:\x01*\x12\x8f\x01\n\x0fListPartSchemas\x12(.avninv.catalog.v1.ListPartSchemaRequest\x1a).avninv.catalog.v1.ListPartSchemaResponse\"\'\x82\xd3\xe4\x93\x02!\x12\x1f/v1/{parent=orgs/*}/partschemas\x12\x80\x01\n\rGetPartSchema\x12\'.avninv.catalog.v1.GetPartSchemaRequest\x1a\x1d.avninv.catalog.v1.PartSchema\"\'\x82\xd3\xe4\x93\x02!\x12\x1f/v1/{name=orgs/*/partschemas/*}\x12\x93\x01\n\x10\x43reatePartSchema\x12*.avninv.catalog.v1.CreatePartSchemaRequest\x1a\x1d.avninv.catalog.v1.PartSchema\"4\x82\xd3\xe4\x93\x02.\"\x1f/v1/{parent=orgs/*}/partschemas:\x0bpart_schema\x12\x93\x01\n\x10UpdatePartSchema\x12*.avninv.catalog.v1.UpdatePartSchemaRequest\x1a\x1d.avninv.catalog.v1.PartSchema\"4\x82\xd3\xe4\x93\x02.2\x1f/v1/{name=orgs/*/partschemas/*}:\x0bpart_schema\x12\x7f\n\x10\x44\x65letePartSchema\x12*.avninv.catalog.v1.DeletePartSchemaRequest\x1a\x16.google.protobuf.Empty\"\'\x82\xd3\xe4\x93\x02!*\x1f/v1/{name=orgs/*/partschemas/*}b\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'avninv.catalog.v1.catalog_pb2', _globals)
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _CATALOG.methods_by_name['ListParts']._options = None
+  _CATALOG.methods_by_name['ListParts']._serialized_options = b'\202\323\344\223\002\033\022\031/v1/{parent=orgs/*}/parts'
+  _CATALOG.methods_by_name['StreamParts']._options = None
+  _CATALOG.methods_by_name['StreamParts']._serialized_options = b'\202\323\344\223\002\"\022 /v1/{parent=orgs/*}/parts:stream'
+  _CATALOG.methods_by_name['SearchParts']._options = None
+  _CATALOG.methods_by_name['SearchParts']._serialized_options = b'\202\323\344\223\002\"\022 /v1/{parent=orgs/*}/parts:search'
+  _CATALOG.methods_by_name['AggregateParts']._options = None
+  _CATALOG.methods_by_name['AggregateParts']._serialized_options = b'\202\323\344\223\002%\022#/v1/{parent=orgs/*}/parts:aggregate'
+  _CATALOG.methods_by_name['WatchParts']._options = None
+  _CATALOG.methods_by_name['WatchParts']._serialized_options = b'\202\323\344\223\002!\022\037/v1/{parent=orgs/*}/parts:watch'
+  _CATALOG.methods_by_name['GetPart']._options = None
+  _CATALOG.methods_by_name['GetPart']._serialized_options = b'\202\323\344\223\002\033\022\031/v1/{name=orgs/*/parts/*}'
+  _CATALOG.methods_by_name['CreatePart']._options = None
+  _CATALOG.methods_by_name['CreatePart']._serialized_options = b'\202\323\344\223\002!\"\031/v1/{parent=orgs/*}/parts:\004part'
+  _CATALOG.methods_by_name['UpdatePart']._options = None
+  _CATALOG.methods_by_name['UpdatePart']._serialized_options = b'\202\323\344\223\002!2\031/v1/{name=orgs/*/parts/*}:\004part'
+  _CATALOG.methods_by_name['AdjustQuantity']._options = None
+  _CATALOG.methods_by_name['AdjustQuantity']._serialized_options = b'\202\323\344\223\002-\"(/v1/{name=orgs/*/parts/*}:adjustQuantity:\001*'
+  _CATALOG.methods_by_name['DeletePart']._options = None
+  _CATALOG.methods_by_name['DeletePart']._serialized_options = b'\202\323\344\223\002\033*\031/v1/{name=orgs/*/parts/*}'
+  _CATALOG.methods_by_name['BatchGetParts']._options = None
+  _CATALOG.methods_by_name['BatchGetParts']._serialized_options = b'\202\323\344\223\002$\022\"/v1/{parent=orgs/*}/parts:batchGet'
+  _CATALOG.methods_by_name['BatchCreateParts']._options = None
+  _CATALOG.methods_by_name['BatchCreateParts']._serialized_options = b'\202\323\344\223\002*\"%/v1/{parent=orgs/*}/parts:batchCreate:\001*'
+  _CATALOG.methods_by_name['BatchUpdateParts']._options = None
+  _CATALOG.methods_by_name['BatchUpdateParts']._serialized_options = b'\202\323\344\223\002*\"%/v1/{parent=orgs/*}/parts:batchUpdate:\001*'
+  _CATALOG.methods_by_name['BatchAdjustQuantities']._options = None
+  _CATALOG.methods_by_name['BatchAdjustQuantities']._serialized_options = b'\202\323\344\223\0024\"//v1/{parent=orgs/*}/parts:batchAdjustQuantities:\001*'
+  _CATALOG.methods_by_name['BatchDeleteParts']._options = None
+  _CATALOG.methods_by_name['BatchDeleteParts']._serialized_options = b'\202\323\344\223\002*\"%/v1/{parent=orgs/*}/parts:batchDelete:\001*'
+  _CATALOG.methods_by_name['ListPartSchemas']._options = None
+  _CATALOG.methods_by_name['ListPartSchemas']._serialized_options = b'\202\323\344\223\002!\022\037/v1/{parent=orgs/*}/partschemas'
+  _CATALOG.methods_by_name['GetPartSchema']._options = None
+  _CATALOG.methods_by_name['GetPartSchema']._serialized_options = b'\202\323\344\223\002!\022\037/v1/{name=orgs/*/partschemas/*}'
+  _CATALOG.methods_by_name['CreatePartSchema']._options = None
+  _CATALOG.methods_by_name['CreatePartSchema']._serialized_options = b'\202\323\344\223\002.\"\037/v1/{parent=orgs/*}/partschemas:\013part_schema'
+  _CATALOG.methods_by_name['UpdatePartSchema']._options = None
+  _CATALOG.methods_by_name['UpdatePartSchema']._serialized_options = b'\202\323\344\223\002.2\037/v1/{name=orgs/*/partschemas/*}:\013part_schema'
+  _CATALOG.methods_by_name['DeletePartSchema']._options = None
+  _CATALOG.methods_by_name['DeletePartSchema']._serialized_options = b'\202\323\344\223\002!*\037/v1/{name=orgs/*/partschemas/*}'
+  _globals['_LISTPARTREQUEST']._serialized_start=173
+  _globals['_LISTPARTREQUEST']._serialized_end=326
+  _globals['_LISTPARTRESPONSE']._serialized_start=328
+  _globals['_LISTPARTRESPONSE']._serialized_end=411
+  _globals['_STREAMPARTSREQUEST']._serialized_start=413
+  _globals['_STREAMPARTSREQUEST']._serialized_end=516
+  _globals['_STREAMPARTSRESPONSE']._serialized_start=518
+  _globals['_STREAMPARTSRESPONSE']._serialized_end=579
+  _globals['_ATTRIBUTEPREDICATE']._serialized_start=582
+  _globals['_ATTRIBUTEPREDICATE']._serialized_end=711
+  _globals['_SEARCHPARTSREQUEST']._serialized_start=714
+  _globals['_SEARCHPARTSREQUEST']._serialized_end=910
+  _globals['_SEARCHPARTSRESPONSE']._serialized_start=912
+  _globals['_SEARCHPARTSRESPONSE']._serialized_end=998
+  _globals['_AGGREGATEPARTSREQUEST']._serialized_start=1001
+  _globals['_AGGREGATEPARTSREQUEST']._serialized_end=1220
+  _globals['_AGGREGATEPARTSREQUEST_GROUPBY']._serialized_start=1154
+  _globals['_AGGREGATEPARTSREQUEST_GROUPBY']._serialized_end=1220
+  _globals['_PARTAGGREGATE']._serialized_start=1222
+  _globals['_PARTAGGREGATE']._serialized_end=1319
+  _globals['_AGGREGATEPARTSRESPONSE']._serialized_start=1321
+  _globals['_AGGREGATEPARTSRESPONSE']._serialized_end=1395
+  _globals['_WATCHPARTSREQUEST']._serialized_start=1397
+  _globals['_WATCHPARTSREQUEST']._serialized_end=1454
+  _globals['_WATCHPARTSRESPONSE']._serialized_start=1457
+  _globals['_WATCHPARTSRESPONSE']._serialized_end=1687
+  _globals['_WATCHPARTSRESPONSE_EVENTTYPE']._serialized_start=1609
+  _globals['_WATCHPARTSRESPONSE_EVENTTYPE']._serialized_end=1687
+  _globals['_GETPARTREQUEST']._serialized_start=1689
+  _globals['_GETPARTREQUEST']._serialized_end=1789
+  _globals['_CREATEPARTREQUEST']._serialized_start=1791
+  _globals['_CREATEPARTREQUEST']._serialized_end=1865
+  _globals['_UPDATEPARTREQUEST']._serialized_start=1867
+  _globals['_UPDATEPARTREQUEST']._serialized_end=1988
+  _globals['_ADJUSTQUANTITYREQUEST']._serialized_start=1991
+  _globals['_ADJUSTQUANTITYREQUEST']._serialized_end=2156
+  _globals['_DELETEPARTREQUEST']._serialized_start=2158
+  _globals['_DELETEPARTREQUEST']._serialized_end=2191
+  _globals['_BATCHGETPARTSREQUEST']._serialized_start=2193
+  _globals['_BATCHGETPARTSREQUEST']._serialized_end=2246
+  _globals['_BATCHCREATEPARTSREQUEST']._serialized_start=2248
+  _globals['_BATCHCREATEPARTSREQUEST']._serialized_end=2345
+  _globals['_BATCHUPDATEPARTSREQUEST']._serialized_start=2347
+  _globals['_BATCHUPDATEPARTSREQUEST']._serialized_end=2444
+  _globals['_BATCHADJUSTQUANTITIESREQUEST']._serialized_start=2446
+  _globals['_BATCHADJUSTQUANTITIESREQUEST']._serialized_end=2552
+  _globals['_BATCHDELETEPARTSREQUEST']._serialized_start=2554
+  _globals['_BATCHDELETEPARTSREQUEST']._serialized_end=2610
+  _globals['_BATCHPARTRESULT']._serialized_start=2612
+  _globals['_BATCHPARTRESULT']._serialized_end=2718
+  _globals['_BATCHPARTSRESPONSE']._serialized_start=2720
+  _globals['_BATCHPARTSRESPONSE']._serialized_end=2793
+  _globals['_BATCHDELETEPARTSRESPONSE']._serialized_start=2795
+  _globals['_BATCHDELETEPARTSRESPONSE']._serialized_end=2859
+  _globals['_LISTPARTSCHEMAREQUEST']._serialized_start=2861
+  _globals['_LISTPARTSCHEMAREQUEST']._serialized_end=2939
+  _globals['_LISTPARTSCHEMARESPONSE']._serialized_start=2941
+  _globals['_LISTPARTSCHEMARESPONSE']._serialized_end=3043
+  _globals['_GETPARTSCHEMAREQUEST']._serialized_start=3045
+  _globals['_GETPARTSCHEMAREQUEST']._serialized_end=3081
+  _globals['_CREATEPARTSCHEMAREQUEST']._serialized_start=3083
+  _globals['_CREATEPARTSCHEMAREQUEST']._serialized_end=3176
+  _globals['_UPDATEPARTSCHEMAREQUEST']._serialized_start=3179
+  _globals['_UPDATEPARTSCHEMAREQUEST']._serialized_end=3319
+  _globals['_DELETEPARTSCHEMAREQUEST']._serialized_start=3321
+  _globals['_DELETEPARTSCHEMAREQUEST']._serialized_end=3360
+  _globals['_PARTATTRIBUTE']._serialized_start=3362
+  _globals['_PARTATTRIBUTE']._serialized_end=3471
+  _globals['_PARTSUPPLIER']._serialized_start=3473
+  _globals['_PARTSUPPLIER']._serialized_end=3548
+  _globals['_PART']._serialized_start=3551
+  _globals['_PART']._serialized_end=3785
+  _globals['_PARTATTRIBUTESCHEMA']._serialized_start=3788
+  _globals['_PARTATTRIBUTESCHEMA']._serialized_end=3969
+  _globals['_PARTATTRIBUTESCHEMA_TYPE']._serialized_start=3903
+  _globals['_PARTATTRIBUTESCHEMA_TYPE']._serialized_end=3969
+  _globals['_PARTSCHEMA']._serialized_start=3971
+  _globals['_PARTSCHEMA']._serialized_end=4079
+  _globals['_CATALOG']._serialized_start=4082
+  _globals['_CATALOG']._serialized_end=6854
+# @@protoc_insertion_point(module_scope)
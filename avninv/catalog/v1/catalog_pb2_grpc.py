@@ -0,0 +1,701 @@
+# Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
+"""Client and server classes corresponding to protobuf-defined services."""
+import grpc
+
+from avninv.catalog.v1 import catalog_pb2 as avninv_dot_catalog_dot_v1_dot_catalog__pb2
+from google.protobuf import empty_pb2 as google_dot_protobuf_dot_empty__pb2
+
+
+class CatalogStub(object):
+    """* Service *
+    """
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.ListParts = channel.unary_unary(
+                '/avninv.catalog.v1.Catalog/ListParts',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.ListPartRequest.SerializeToString,
+                response_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.ListPartResponse.FromString,
+                )
+        self.StreamParts = channel.unary_stream(
+                '/avninv.catalog.v1.Catalog/StreamParts',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.StreamPartsRequest.SerializeToString,
+                response_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.StreamPartsResponse.FromString,
+                )
+        self.SearchParts = channel.unary_unary(
+                '/avninv.catalog.v1.Catalog/SearchParts',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.SearchPartsRequest.SerializeToString,
+                response_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.SearchPartsResponse.FromString,
+                )
+        self.AggregateParts = channel.unary_unary(
+                '/avninv.catalog.v1.Catalog/AggregateParts',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.AggregatePartsRequest.SerializeToString,
+                response_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.AggregatePartsResponse.FromString,
+                )
+        self.WatchParts = channel.unary_stream(
+                '/avninv.catalog.v1.Catalog/WatchParts',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.WatchPartsRequest.SerializeToString,
+                response_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.WatchPartsResponse.FromString,
+                )
+        self.GetPart = channel.unary_unary(
+                '/avninv.catalog.v1.Catalog/GetPart',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.GetPartRequest.SerializeToString,
+                response_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.Part.FromString,
+                )
+        self.CreatePart = channel.unary_unary(
+                '/avninv.catalog.v1.Catalog/CreatePart',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.CreatePartRequest.SerializeToString,
+                response_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.Part.FromString,
+                )
+        self.UpdatePart = channel.unary_unary(
+                '/avninv.catalog.v1.Catalog/UpdatePart',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.UpdatePartRequest.SerializeToString,
+                response_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.Part.FromString,
+                )
+        self.AdjustQuantity = channel.unary_unary(
+                '/avninv.catalog.v1.Catalog/AdjustQuantity',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.AdjustQuantityRequest.SerializeToString,
+                response_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.Part.FromString,
+                )
+        self.DeletePart = channel.unary_unary(
+                '/avninv.catalog.v1.Catalog/DeletePart',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.DeletePartRequest.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                )
+        self.BatchGetParts = channel.unary_unary(
+                '/avninv.catalog.v1.Catalog/BatchGetParts',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchGetPartsRequest.SerializeToString,
+                response_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchPartsResponse.FromString,
+                )
+        self.BatchCreateParts = channel.unary_unary(
+                '/avninv.catalog.v1.Catalog/BatchCreateParts',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchCreatePartsRequest.SerializeToString,
+                response_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchPartsResponse.FromString,
+                )
+        self.BatchUpdateParts = channel.unary_unary(
+                '/avninv.catalog.v1.Catalog/BatchUpdateParts',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchUpdatePartsRequest.SerializeToString,
+                response_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchPartsResponse.FromString,
+                )
+        self.BatchAdjustQuantities = channel.unary_unary(
+                '/avninv.catalog.v1.Catalog/BatchAdjustQuantities',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchAdjustQuantitiesRequest.SerializeToString,
+                response_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchPartsResponse.FromString,
+                )
+        self.BatchDeleteParts = channel.unary_unary(
+                '/avninv.catalog.v1.Catalog/BatchDeleteParts',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchDeletePartsRequest.SerializeToString,
+                response_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchDeletePartsResponse.FromString,
+                )
+        self.ListPartSchemas = channel.unary_unary(
+                '/avninv.catalog.v1.Catalog/ListPartSchemas',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.ListPartSchemaRequest.SerializeToString,
+                response_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.ListPartSchemaResponse.FromString,
+                )
+        self.GetPartSchema = channel.unary_unary(
+                '/avninv.catalog.v1.Catalog/GetPartSchema',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.GetPartSchemaRequest.SerializeToString,
+                response_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.PartSchema.FromString,
+                )
+        self.CreatePartSchema = channel.unary_unary(
+                '/avninv.catalog.v1.Catalog/CreatePartSchema',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.CreatePartSchemaRequest.SerializeToString,
+                response_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.PartSchema.FromString,
+                )
+        self.UpdatePartSchema = channel.unary_unary(
+                '/avninv.catalog.v1.Catalog/UpdatePartSchema',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.UpdatePartSchemaRequest.SerializeToString,
+                response_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.PartSchema.FromString,
+                )
+        self.DeletePartSchema = channel.unary_unary(
+                '/avninv.catalog.v1.Catalog/DeletePartSchema',
+                request_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.DeletePartSchemaRequest.SerializeToString,
+                response_deserializer=google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+                )
+
+
+class CatalogServicer(object):
+    """* Service *
+    """
+
+    def ListParts(self, request, context):
+        """* Parts *
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamParts(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def SearchParts(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def AggregateParts(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def WatchParts(self, request, context):
+        """Events of the parts created, updated and deleted from the start of the call, or after a resume token.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetPart(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CreatePart(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def UpdatePart(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def AdjustQuantity(self, request, context):
+        """Adds a signed delta to the quantity of a part in a single write, rather than reading then updating the part.
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DeletePart(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchGetParts(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchCreateParts(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchUpdateParts(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchAdjustQuantities(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def BatchDeleteParts(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ListPartSchemas(self, request, context):
+        """* PartSchemas *
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetPartSchema(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def CreatePartSchema(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def UpdatePartSchema(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def DeletePartSchema(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+
+def add_CatalogServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+            'ListParts': grpc.unary_unary_rpc_method_handler(
+                    servicer.ListParts,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.ListPartRequest.FromString,
+                    response_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.ListPartResponse.SerializeToString,
+            ),
+            'StreamParts': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamParts,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.StreamPartsRequest.FromString,
+                    response_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.StreamPartsResponse.SerializeToString,
+            ),
+            'SearchParts': grpc.unary_unary_rpc_method_handler(
+                    servicer.SearchParts,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.SearchPartsRequest.FromString,
+                    response_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.SearchPartsResponse.SerializeToString,
+            ),
+            'AggregateParts': grpc.unary_unary_rpc_method_handler(
+                    servicer.AggregateParts,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.AggregatePartsRequest.FromString,
+                    response_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.AggregatePartsResponse.SerializeToString,
+            ),
+            'WatchParts': grpc.unary_stream_rpc_method_handler(
+                    servicer.WatchParts,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.WatchPartsRequest.FromString,
+                    response_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.WatchPartsResponse.SerializeToString,
+            ),
+            'GetPart': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetPart,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.GetPartRequest.FromString,
+                    response_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.Part.SerializeToString,
+            ),
+            'CreatePart': grpc.unary_unary_rpc_method_handler(
+                    servicer.CreatePart,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.CreatePartRequest.FromString,
+                    response_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.Part.SerializeToString,
+            ),
+            'UpdatePart': grpc.unary_unary_rpc_method_handler(
+                    servicer.UpdatePart,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.UpdatePartRequest.FromString,
+                    response_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.Part.SerializeToString,
+            ),
+            'AdjustQuantity': grpc.unary_unary_rpc_method_handler(
+                    servicer.AdjustQuantity,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.AdjustQuantityRequest.FromString,
+                    response_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.Part.SerializeToString,
+            ),
+            'DeletePart': grpc.unary_unary_rpc_method_handler(
+                    servicer.DeletePart,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.DeletePartRequest.FromString,
+                    response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            ),
+            'BatchGetParts': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchGetParts,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchGetPartsRequest.FromString,
+                    response_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchPartsResponse.SerializeToString,
+            ),
+            'BatchCreateParts': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchCreateParts,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchCreatePartsRequest.FromString,
+                    response_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchPartsResponse.SerializeToString,
+            ),
+            'BatchUpdateParts': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchUpdateParts,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchUpdatePartsRequest.FromString,
+                    response_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchPartsResponse.SerializeToString,
+            ),
+            'BatchAdjustQuantities': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchAdjustQuantities,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchAdjustQuantitiesRequest.FromString,
+                    response_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchPartsResponse.SerializeToString,
+            ),
+            'BatchDeleteParts': grpc.unary_unary_rpc_method_handler(
+                    servicer.BatchDeleteParts,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchDeletePartsRequest.FromString,
+                    response_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchDeletePartsResponse.SerializeToString,
+            ),
+            'ListPartSchemas': grpc.unary_unary_rpc_method_handler(
+                    servicer.ListPartSchemas,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.ListPartSchemaRequest.FromString,
+                    response_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.ListPartSchemaResponse.SerializeToString,
+            ),
+            'GetPartSchema': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetPartSchema,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.GetPartSchemaRequest.FromString,
+                    response_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.PartSchema.SerializeToString,
+            ),
+            'CreatePartSchema': grpc.unary_unary_rpc_method_handler(
+                    servicer.CreatePartSchema,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.CreatePartSchemaRequest.FromString,
+                    response_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.PartSchema.SerializeToString,
+            ),
+            'UpdatePartSchema': grpc.unary_unary_rpc_method_handler(
+                    servicer.UpdatePartSchema,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.UpdatePartSchemaRequest.FromString,
+                    response_serializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.PartSchema.SerializeToString,
+            ),
+            'DeletePartSchema': grpc.unary_unary_rpc_method_handler(
+                    servicer.DeletePartSchema,
+                    request_deserializer=avninv_dot_catalog_dot_v1_dot_catalog__pb2.DeletePartSchemaRequest.FromString,
+                    response_serializer=google_dot_protobuf_dot_empty__pb2.Empty.SerializeToString,
+            ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+            'avninv.catalog.v1.Catalog', rpc_method_handlers)
+    server.add_generic_rpc_handlers((generic_handler,))
+
+
+ # This class is part of an EXPERIMENTAL API.
+class Catalog(object):
+    """* Service *
+    """
+
+    @staticmethod
+    def ListParts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/avninv.catalog.v1.Catalog/ListParts',
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.ListPartRequest.SerializeToString,
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.ListPartResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def StreamParts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/avninv.catalog.v1.Catalog/StreamParts',
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.StreamPartsRequest.SerializeToString,
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.StreamPartsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def SearchParts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/avninv.catalog.v1.Catalog/SearchParts',
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.SearchPartsRequest.SerializeToString,
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.SearchPartsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def AggregateParts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/avninv.catalog.v1.Catalog/AggregateParts',
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.AggregatePartsRequest.SerializeToString,
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.AggregatePartsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def WatchParts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(request, target, '/avninv.catalog.v1.Catalog/WatchParts',
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.WatchPartsRequest.SerializeToString,
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.WatchPartsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetPart(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/avninv.catalog.v1.Catalog/GetPart',
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.GetPartRequest.SerializeToString,
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.Part.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def CreatePart(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/avninv.catalog.v1.Catalog/CreatePart',
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.CreatePartRequest.SerializeToString,
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.Part.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def UpdatePart(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/avninv.catalog.v1.Catalog/UpdatePart',
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.UpdatePartRequest.SerializeToString,
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.Part.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def AdjustQuantity(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/avninv.catalog.v1.Catalog/AdjustQuantity',
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.AdjustQuantityRequest.SerializeToString,
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.Part.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def DeletePart(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/avninv.catalog.v1.Catalog/DeletePart',
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.DeletePartRequest.SerializeToString,
+            google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def BatchGetParts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/avninv.catalog.v1.Catalog/BatchGetParts',
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchGetPartsRequest.SerializeToString,
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchPartsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def BatchCreateParts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/avninv.catalog.v1.Catalog/BatchCreateParts',
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchCreatePartsRequest.SerializeToString,
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchPartsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def BatchUpdateParts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/avninv.catalog.v1.Catalog/BatchUpdateParts',
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchUpdatePartsRequest.SerializeToString,
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchPartsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def BatchAdjustQuantities(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/avninv.catalog.v1.Catalog/BatchAdjustQuantities',
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchAdjustQuantitiesRequest.SerializeToString,
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchPartsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def BatchDeleteParts(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/avninv.catalog.v1.Catalog/BatchDeleteParts',
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchDeletePartsRequest.SerializeToString,
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.BatchDeletePartsResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def ListPartSchemas(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/avninv.catalog.v1.Catalog/ListPartSchemas',
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.ListPartSchemaRequest.SerializeToString,
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.ListPartSchemaResponse.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def GetPartSchema(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/avninv.catalog.v1.Catalog/GetPartSchema',
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.GetPartSchemaRequest.SerializeToString,
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.PartSchema.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def CreatePartSchema(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/avninv.catalog.v1.Catalog/CreatePartSchema',
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.CreatePartSchemaRequest.SerializeToString,
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.PartSchema.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def UpdatePartSchema(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/avninv.catalog.v1.Catalog/UpdatePartSchema',
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.UpdatePartSchemaRequest.SerializeToString,
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.PartSchema.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
+
+    @staticmethod
+    def DeletePartSchema(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(request, target, '/avninv.catalog.v1.Catalog/DeletePartSchema',
+            avninv_dot_catalog_dot_v1_dot_catalog__pb2.DeletePartSchemaRequest.SerializeToString,
+            google_dot_protobuf_dot_empty__pb2.Empty.FromString,
+            options, channel_credentials,
+            insecure, call_credentials, compression, wait_for_ready, timeout, metadata)
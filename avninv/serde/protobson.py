@@ -1,9 +1,82 @@
 """Protobuf-to-BSON and BSON-to-Protobuf serde"""
 
+import threading
+
 from google.protobuf.descriptor import FieldDescriptor
 from google.protobuf.reflection import MakeClass
 
 
+class InvalidFieldPath(ValueError):
+    def __init__(self, path):
+        self.path = path
+        self.message = f'"{path}" is not a valid field path'
+
+
+class _FieldPlan:
+    __slots__ = ('descriptor', 'name', 'number', 'key', 'repeated', 'plan')
+
+    def __init__(self, descriptor, plan):
+        self.descriptor = descriptor
+        self.name = descriptor.name
+        self.number = descriptor.number
+        self.key = f'_{descriptor.number}'
+        self.repeated = descriptor.label == FieldDescriptor.LABEL_REPEATED
+        self.plan = plan
+
+
+class _MessagePlan:
+    """Conversion plan for a message descriptor, compiled once and shared by both directions"""
+
+    def __init__(self, descriptor):
+        self.descriptor = descriptor
+        self.by_key = {}
+        self.by_name = {}
+        self.by_number = {}
+        self.id_field = None
+        self._cls = None
+
+    @property
+    def cls(self):
+        if self._cls is None:
+            self._cls = MakeClass(self.descriptor)
+        return self._cls
+
+
+_plans = {}
+_plans_lock = threading.Lock()
+
+
+def _compile_plan(descriptor, pending):
+    plan = _plans.get(descriptor.full_name) or pending.get(descriptor.full_name)
+    if plan is not None:
+        return plan
+
+    plan = pending[descriptor.full_name] = _MessagePlan(descriptor)
+    for field in descriptor.fields:
+        nested = _compile_plan(field.message_type, pending) if field.message_type is not None else None
+        field_plan = _FieldPlan(field, nested)
+
+        plan.by_key[field_plan.key] = field_plan
+        plan.by_name[field_plan.name] = field_plan
+        plan.by_number[field_plan.number] = field_plan
+
+    plan.id_field = _get_id_field_number(descriptor)
+    return plan
+
+
+def _get_plan(descriptor):
+    plan = _plans.get(descriptor.full_name)
+    if plan is not None:
+        return plan
+
+    with _plans_lock:
+        pending = {}
+        plan = _compile_plan(descriptor, pending)
+        # Only publish once the whole (possibly recursive) set of plans is compiled
+        _plans.update(pending)
+    return plan
+
+
 def _get_id_field_number(descriptor):
     for field in descriptor.fields:
         if field.name == 'id' and field.type == FieldDescriptor.TYPE_STRING:
@@ -11,94 +84,176 @@ def _get_id_field_number(descriptor):
     return None
 
 
-def _check_if_field_in_mask(field_name, fields_mask):
-    if not fields_mask:
-        return True
-    for field_mask in fields_mask:
-        if field_name == field_mask or field_mask.startswith(field_name + '.'):
-            return True
-    return False
+class _MaskNode:
+    __slots__ = ('field', 'whole', 'children')
 
+    def __init__(self, field=None):
+        # Field nodes hold their field; the root and the elements of repeated fields hold none
+        self.field = field
+        self.whole = False
+        # Field names, or element indexes under the nodes of repeated fields when the mask is indexed
+        self.children = {}
 
-def _check_if_index_in_mask(field_name, field_index, fields_mask):
-    if not fields_mask:
-        return True
-    for field_mask in fields_mask:
-        if field_mask.startswith(f'{field_name}.{field_index}'):
-            return True
-    return False
 
+class FieldMaskTrie:
+    """Field mask parsed once against a message descriptor into a trie of its paths.
 
-def _subfield_mask(subfield_name, fields_mask, strip_first=False):
-    if not fields_mask:
-        return None
-    offset = 1 if not strip_first else 2
-    return [m.split('.', offset)[offset] for m in fields_mask if m.startswith(subfield_name + '.')]
+    Paths covered by another path of the mask are dropped. Indexed masks, as used by updates, address elements of
+    repeated fields by index (`attributes.3.unit`); other masks traverse repeated message fields without index, the way
+    Mongo paths do. Invalid paths raise InvalidFieldPath.
+    """
 
+    def __init__(self, descriptor, paths, indexed=False):
+        self.descriptor = descriptor
+        self.indexed = indexed
+        self.root = _MaskNode()
 
-def protobuf_to_bson(message, fields_mask=None, preserve_index=False):
+        plan = _get_plan(descriptor)
+        for path in paths:
+            self._insert(plan, path)
+
+    def __bool__(self):
+        return bool(self.root.children)
+
+    def _insert(self, plan, path):
+        node = self.root
+        tokens = iter(path.split('.'))
+
+        for token in tokens:
+            field = plan.by_name.get(token) if plan is not None else None
+            if field is None:
+                raise InvalidFieldPath(path)
+
+            node = node.children.get(token) or node.children.setdefault(token, _MaskNode(field))
+            plan = field.plan
+
+            if field.repeated and self.indexed:
+                index = next(tokens, None)
+                if index is None:
+                    break
+                if not index.isdigit():
+                    raise InvalidFieldPath(path)
+                if node.whole:
+                    return
+                node = node.children.get(int(index)) or node.children.setdefault(int(index), _MaskNode())
+
+            if node.whole:
+                return
+
+        node.whole = True
+        node.children.clear()
+
+    def field(self, name):
+        """Node of the top-level field `name`, None when the mask does not touch it"""
+        return self.root.children.get(name)
+
+
+def _field_mask(descriptor, fields_mask, indexed):
+    if isinstance(fields_mask, FieldMaskTrie):
+        return fields_mask
+    return FieldMaskTrie(descriptor, fields_mask, indexed)
+
+
+def _message_to_bson(plan, message):
     bson = {}
 
     for descriptor, value in message.ListFields():
-        field_id = f'_{descriptor.number}'
+        field = plan.by_number[descriptor.number]
+
+        if field.plan is not None:
+            if field.repeated:
+                bson[field.key] = [_message_to_bson(field.plan, subfield) for subfield in value]
+            else:
+                bson[field.key] = _message_to_bson(field.plan, value)
+        elif field.repeated:
+            bson[field.key] = list(value)
+        else:
+            bson[field.key] = value
 
-        if not _check_if_field_in_mask(descriptor.name, fields_mask):
+    return bson
+
+
+def _element_to_bson(field, element):
+    return _message_to_bson(field.plan, element) if field.plan is not None else element
+
+
+def _field_to_bson(field, value):
+    if field.repeated:
+        return [_element_to_bson(field, element) for element in value]
+    return _element_to_bson(field, value)
+
+
+def _masked_to_bson(plan, message, node, preserve_index):
+    bson = {}
+    values = {descriptor.name: value for descriptor, value in message.ListFields()}
+
+    for name, child in node.children.items():
+        if name not in values:
             continue
 
-        if descriptor.label == FieldDescriptor.LABEL_REPEATED:
+        field, value = child.field, values[name]
+        if child.whole:
+            bson[field.key] = _field_to_bson(field, value)
+        elif field.repeated:
             repeated = []
-            for index, subfield in enumerate(value):
-                if _check_if_index_in_mask(descriptor.name, index, fields_mask):
-                    if descriptor.message_type is not None:
-                        repeated.append(
-                            protobuf_to_bson(subfield, fields_mask=_subfield_mask(descriptor.name, fields_mask, True))
-                        )
-                    else:
-                        repeated.append(subfield)
-                elif preserve_index:
-                    repeated.append(None)
-            bson[field_id] = repeated
-        elif descriptor.message_type is not None:
-            bson[field_id] = protobuf_to_bson(value, fields_mask=_subfield_mask(descriptor.name, fields_mask))
+            for index, element in sorted(child.children.items()):
+                if index >= len(value):
+                    break
+                if preserve_index:
+                    repeated += [None] * (index - len(repeated))
+                if element.whole:
+                    repeated.append(_element_to_bson(field, value[index]))
+                else:
+                    repeated.append(_masked_to_bson(field.plan, value[index], element, preserve_index))
+            bson[field.key] = repeated
         else:
-            bson[field_id] = value
+            bson[field.key] = _masked_to_bson(field.plan, value, child, preserve_index)
 
     return bson
 
 
-def bson_to_protobuf(bson, cls=None, descriptor=None):
-    cls = cls or MakeClass(descriptor)
-    message = cls()
-    fields = {field.number: field for field in cls.DESCRIPTOR.fields}
+def protobuf_to_bson(message, fields_mask=None, preserve_index=False):
+    """Convert `message` to BSON, only the fields in `fields_mask` if any: a list of paths, indexed like update masks,
+    or a FieldMaskTrie. Elements of repeated fields left out by the mask are kept as None with `preserve_index`."""
+    plan = _get_plan(message.DESCRIPTOR)
 
-    id_field = _get_id_field_number(cls.DESCRIPTOR)
+    if not fields_mask:
+        return _message_to_bson(plan, message)
+
+    return _masked_to_bson(plan, message, _field_mask(message.DESCRIPTOR, fields_mask, True).root, preserve_index)
+
+
+def _bson_to_fields(plan, bson):
+    fields = {}
 
-    for key in bson:
-        if key == '_id':
-            if id_field is not None:
-                setattr(message, fields[id_field].name, str(bson[key]))
+    for key, value in bson.items():
+        field = plan.by_key.get(key)
+
+        if field is None:
+            if key == '_id' and plan.id_field is not None:
+                fields[plan.by_number[plan.id_field].name] = str(value)
             continue
 
-        if not key[0] == '_' and not key[1:].isdigit() or int(key[1:]) not in fields:
-            # uh-oh
+        if field.plan is not None:
+            if isinstance(value, list):
+                value = [_bson_to_fields(field.plan, element) for element in value if isinstance(element, dict)]
+            elif isinstance(value, dict):
+                value = _bson_to_fields(field.plan, value)
+            else:
+                continue
+        elif isinstance(value, dict):
             continue
 
-        number = int(key[1:])
-        if isinstance(bson[key], list):
-            repeated = getattr(message, fields[number].name)
-            for subfield in bson[key]:
-                if isinstance(bson[key][0], dict) and fields[number].message_type is not None:
-                    repeated.add().CopyFrom(bson_to_protobuf(subfield, descriptor=fields[number].message_type))
-                else:
-                    repeated.append(subfield)
-        elif isinstance(bson[key], dict):
-            if fields[number].message_type is not None:
-                nested = bson_to_protobuf(bson[key], descriptor=fields[number].message_type)
-                getattr(message, fields[number].name).CopyFrom(nested)
-        else:
-            setattr(message, fields[number].name, bson[key])
+        fields[field.name] = value
+
+    return fields
 
-    return message
+
+def bson_to_protobuf(bson, cls=None, descriptor=None):
+    plan = _get_plan(cls.DESCRIPTOR if cls is not None else descriptor)
+    # Nested messages are passed as dicts too, so the whole message is built by one constructor call in the protobuf
+    # runtime rather than by a Python call per field
+    return (cls or plan.cls)(**_bson_to_fields(plan, bson))
 
 
 def _flatten(bson):
@@ -118,54 +273,204 @@ def _flatten(bson):
             yield (key, bson[key])
 
 
-def _get_field_descriptor_by_name(message_descriptor, name):
-    for descriptor in message_descriptor.fields:
-        if descriptor.name == name:
-            return descriptor
+def _update_paths(plan, message, node, prefix, update):
+    """Add the $set, $unset and $pull of the paths of `node` for `message` to the update document"""
+    to_set, to_unset, to_pull = update['$set'], update['$unset'], update['$pull']
+    values = {descriptor.name: value for descriptor, value in message.ListFields()}
+
+    for name, child in node.children.items():
+        field = child.field
+        key = f'{prefix}{field.key}'
+        value = values.get(name)
 
+        if child.whole:
+            if value is None:
+                to_unset[key] = ''
+            else:
+                to_set[key] = _field_to_bson(field, value)
+        elif field.repeated:
+            value = value or ()
+            for index, element in child.children.items():
+                path = f'{key}.{index}'
+                if index < len(value):
+                    if not element.whole:
+                        _update_paths(field.plan, value[index], element, f'{path}.', update)
+                    else:
+                        to_set[path] = _element_to_bson(field, value[index])
+                elif element.whole:
+                    # Elements missing from the message are removed: unset, then pulled once null
+                    to_unset[path] = ''
+                    to_pull[key] = None
+                else:
+                    _update_paths(field.plan, field.plan.cls(), element, f'{path}.', update)
+        else:
+            _update_paths(field.plan, getattr(message, name), child, f'{key}.', update)
 
-def _proto_mask_to_bson_mask(message_descriptor, fields_mask):
-    for field in fields_mask:
-        tokens = field.split('.')
-        descriptor = _get_field_descriptor_by_name(message_descriptor, tokens[0])
 
-        if not descriptor:
-            continue
+def protobuf_to_update_document(message, fields_mask):
+    """Update document setting the fields of `fields_mask` (paths or an indexed FieldMaskTrie) to their value in
+    `message`, unsetting those it does not set. Without mask, every field set in `message` is written."""
+    update = {'$set': {}, '$unset': {}, '$pull': {}}
+    plan = _get_plan(message.DESCRIPTOR)
 
-        field_id = f'_{descriptor.number}'
+    if not fields_mask:
+        update['$set'] = dict(_flatten(_message_to_bson(plan, message)))
+        return update
 
-        if descriptor.label == FieldDescriptor.LABEL_REPEATED:
-            if len(tokens) < 2 or not tokens[1].isdigit():
-                continue
+    _update_paths(plan, message, _field_mask(message.DESCRIPTOR, fields_mask, True).root, '', update)
+    return update
 
-            if descriptor.message_type is not None and len(tokens) > 2:
-                subfield_mask = _subfield_mask(tokens[0], fields_mask, True)
 
-                for path, indexed in _proto_mask_to_bson_mask(descriptor.message_type, subfield_mask):
-                    yield (f'{field_id}.{tokens[1]}.{path}', indexed)
-            else:
-                yield (f'{field_id}.{tokens[1]}', True)
+def _resolve_path(message_descriptor, path):
+    plan = _get_plan(message_descriptor)
+    fields = []
+
+    for token in path.split('.'):
+        field = plan.by_name.get(token) if plan is not None else None
+        if field is None:
+            raise InvalidFieldPath(path)
+
+        fields.append(field)
+        plan = field.plan
+
+    return fields
+
 
-        elif descriptor.message_type is not None:
-            if len(tokens) == 1:
-                yield (f'{field_id}', False)
+def protobuf_path_to_bson_path(message_descriptor, path):
+    """Translate a dotted path of field names into the matching path of BSON keys.
+
+    Repeated message fields are traversed without an index, matching every element the way Mongo paths do.
+    """
+    return '.'.join(field.key for field in _resolve_path(message_descriptor, path))
+
+
+def _projection_paths(node, prefix):
+    for child in node.children.values():
+        key = f'{prefix}{child.field.key}'
+        if child.whole:
+            yield key
+        else:
+            yield from _projection_paths(child, f'{key}.')
+
+
+def protobuf_mask_to_projection(message_descriptor, fields_mask):
+    # Paths covered by another one are dropped while parsing, as Mongo rejects a path alongside its subpaths
+    return {path: 1 for path in _projection_paths(_field_mask(message_descriptor, fields_mask, False).root, '')}
+
+
+_UNSET = object()
+
+
+def _split_at_array(path):
+    tokens = path.split('.')
+    for depth, token in enumerate(tokens):
+        if token.isdigit():
+            return '.'.join(tokens[:depth]), tokens[depth:]
+    return path, None
+
+
+def _document_expression(current, edits, depth):
+    variable = f'd{depth}'
+    removed, merged, nested = [], {}, {}
+
+    for tokens, value in edits:
+        if len(tokens) == 1:
+            if value is _UNSET:
+                removed.append(tokens[0])
             else:
-                subfield_mask = _subfield_mask(tokens[0], fields_mask)
+                merged[tokens[0]] = {'$literal': value}
+        else:
+            nested.setdefault(tokens[0], []).append((tokens[1:], value))
 
-                for path, indexed in _proto_mask_to_bson_mask(descriptor.message_type, subfield_mask):
-                    yield (f'{field_id}.{path}', indexed)
+    for key, key_edits in nested.items():
+        if key_edits[0][0][0].isdigit():
+            merged[key] = _array_expression(f'$${variable}.{key}', key_edits, depth + 1)
         else:
-            if len(tokens) == 1:
-                yield (f'{field_id}', False)
+            merged[key] = _document_expression(f'$${variable}.{key}', key_edits, depth + 1)
 
+    document = f'$${variable}'
+    if removed:
+        document = {'$arrayToObject': {'$filter': {
+            'input': {'$objectToArray': document},
+            'cond': {'$not': [{'$in': ['$$this.k', removed]}]}
+        }}}
+    if merged:
+        document = {'$mergeObjects': [document, merged]}
 
-def protobuf_to_update_document(message, fields_mask):
-    bson = protobuf_to_bson(message, fields_mask=fields_mask, preserve_index=True)
-    flatbson = {f: k for f, k in _flatten(bson)}
-    fields_id_mask = list(_proto_mask_to_bson_mask(message.DESCRIPTOR, fields_mask))
-
-    return {
-        '$set': flatbson,
-        '$unset': {path: '' for path, _ in fields_id_mask if path not in flatbson},
-        '$pull':  {path.rsplit('.', 1)[0]: None for path, indexed in fields_id_mask if path not in flatbson and indexed}
-    }
+    return {'$let': {'vars': {variable: current}, 'in': document}}
+
+
+def _array_expression(current, edits, depth):
+    index = f'i{depth}'
+    removed, by_index = set(), {}
+
+    for tokens, value in edits:
+        if len(tokens) == 1 and value is _UNSET:
+            removed.add(int(tokens[0]))
+        else:
+            by_index.setdefault(int(tokens[0]), []).append((tokens[1:], value))
+
+    branches, appended = [], []
+    for position, element_edits in sorted(by_index.items()):
+        if position in removed:
+            continue
+
+        element = {'$arrayElemAt': [current, position]}
+        whole = [value for tokens, value in element_edits if not tokens]
+        if whole:
+            expression = {'$literal': whole[-1]}
+        elif element_edits[0][0][0].isdigit():
+            expression = _array_expression(element, element_edits, depth + 1)
+        else:
+            expression = _document_expression(element, element_edits, depth + 1)
+        branches.append({'case': {'$eq': [f'$${index}', position]}, 'then': expression})
+        # $set pads the array with nulls up to a position past its end, and $pull then drops them: elements written
+        # there end up appended in order. Only unsetting fields of such an element writes nothing.
+        if any(value is not _UNSET for _, value in element_edits):
+            appended.append({'$cond': [{'$lt': [position, {'$size': current}]}, [], [expression]]})
+
+    element = {'$arrayElemAt': [current, f'$${index}']}
+    indices = {'$range': [0, {'$size': current}]}
+    if removed:
+        indices = {'$filter': {'input': indices, 'cond': {'$not': [{'$in': ['$$this', sorted(removed)]}]}}}
+
+    array = {'$map': {
+        'input': indices,
+        'as': index,
+        'in': {'$switch': {'branches': branches, 'default': element}} if branches else element
+    }}
+    if appended:
+        array = {'$concatArrays': [array] + appended}
+    return {'$cond': [{'$isArray': current}, array, current]}
+
+
+def update_document_to_pipeline(update_document):
+    """Express an update document as a single update pipeline.
+
+    `$pull` cannot be combined with `$set`/`$unset` on the same array in one update, so the arrays touched
+    by indexed paths are rebuilt element by element instead: unset elements are dropped (what `$pull` did)
+    and the other edits are applied at their original index, or appended for paths past the end of the array.
+    """
+    stage, unset, arrays = {}, [], {}
+
+    edits = [(path, value) for path, value in update_document['$set'].items()]
+    edits += [(path, _UNSET) for path in update_document['$unset']]
+
+    for path, value in edits:
+        prefix, tokens = _split_at_array(path)
+        if tokens is not None:
+            arrays.setdefault(prefix, []).append((tokens, value))
+        elif value is _UNSET:
+            unset.append(path)
+        else:
+            stage[path] = {'$literal': value}
+
+    for prefix, array_edits in arrays.items():
+        stage[prefix] = _array_expression(f'${prefix}', array_edits, 0)
+
+    pipeline = []
+    if stage:
+        pipeline.append({'$set': stage})
+    if unset:
+        pipeline.append({'$unset': unset})
+    return pipeline
@@ -0,0 +1,283 @@
+"""Compiles AIP-160 filters and AIP-132 orderings into Mongo queries and sorts over BSON keys"""
+
+import operator
+import re
+
+from google.protobuf.descriptor import FieldDescriptor
+
+from avninv.serde.protobson import InvalidFieldPath, _resolve_path
+
+
+class InvalidQuery(ValueError):
+    def __init__(self, message):
+        super().__init__(message)
+        self.message = message
+
+
+_TOKEN = re.compile(r'''\s*(?:
+    (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+  | (?P<comparator><=|>=|!=|[=<>:])
+  | (?P<paren>[()])
+  | (?P<text>[^\s"'()<>=!:]+)
+)''', re.VERBOSE)
+
+_OPERATORS = {'=': '$eq', '!=': '$ne', '<': '$lt', '<=': '$lte', '>': '$gt', '>=': '$gte'}
+_EVALUATE = {
+    '=': operator.eq, '!=': operator.ne, '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge
+}
+
+_INTEGERS = (FieldDescriptor.CPPTYPE_INT32, FieldDescriptor.CPPTYPE_INT64)
+_UNSIGNED = (FieldDescriptor.CPPTYPE_UINT32, FieldDescriptor.CPPTYPE_UINT64)
+_FLOATS = (FieldDescriptor.CPPTYPE_FLOAT, FieldDescriptor.CPPTYPE_DOUBLE)
+
+
+def _tokenize(text):
+    tokens = []
+    position = 0
+
+    while text[position:].strip():
+        match = _TOKEN.match(text, position)
+        if match is None:
+            raise InvalidQuery(f'Unexpected character "{text[position:].lstrip()[0]}" in filter')
+
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'string':
+            value = re.sub(r'\\(.)', r'\1', value[1:-1])
+
+        tokens.append((kind, value))
+        position = match.end()
+
+    return tokens
+
+
+def _combine(op, conditions):
+    return conditions[0] if len(conditions) == 1 else {op: conditions}
+
+
+def _resolve(message_descriptor, path, exclude):
+    if path.split('.', 1)[0] in exclude:
+        raise InvalidQuery(f'Field "{path}" is not supported')
+
+    try:
+        return _resolve_path(message_descriptor, path)
+    except InvalidFieldPath:
+        raise InvalidQuery(f'Unknown field "{path}"')
+
+
+def _literal(descriptor, path, text):
+    cpp_type = descriptor.cpp_type
+
+    try:
+        if cpp_type == FieldDescriptor.CPPTYPE_STRING and descriptor.type == FieldDescriptor.TYPE_STRING:
+            return text
+        if cpp_type in _INTEGERS:
+            return int(text)
+        if cpp_type in _UNSIGNED and int(text) >= 0:
+            return int(text)
+        if cpp_type in _FLOATS:
+            return float(text)
+    except ValueError:
+        pass
+
+    if cpp_type == FieldDescriptor.CPPTYPE_BOOL and text in ('true', 'false'):
+        return text == 'true'
+
+    if cpp_type == FieldDescriptor.CPPTYPE_ENUM:
+        value = descriptor.enum_type.values_by_name.get(text)
+        if value is not None:
+            return value.number
+
+    raise InvalidQuery(f'Invalid value "{text}" for field "{path}"')
+
+
+def _prefix_restriction(key, comparator, path, prefix):
+    if '*' in prefix or comparator not in ('=', '!='):
+        raise InvalidQuery(f'Only trailing wildcards compared with = or != are supported on "{path}"')
+
+    # Anchored prefixes can still be answered from an index
+    condition = {'$regex': f'^{re.escape(prefix)}'} if prefix else {'$exists': True}
+    if comparator == '=':
+        return {key: condition} if prefix else {}
+    return {key: {'$not': condition}} if prefix else {'$nor': [{}]}
+
+
+def _restriction(message_descriptor, path, comparator, value, exclude):
+    fields = _resolve(message_descriptor, path, exclude)
+    descriptor = fields[-1].descriptor
+    key = '.'.join(field.key for field in fields)
+    kind, text = value
+
+    # Default values are never stored, so presence means a non-default value
+    if comparator == ':' and kind == 'text' and text == '*':
+        return {key: {'$ne': None}}
+
+    if fields[-1].plan is not None:
+        raise InvalidQuery(f'Field "{path}" can only be tested for presence')
+
+    if comparator == ':':
+        comparator = '='
+
+    if descriptor.type == FieldDescriptor.TYPE_STRING and text.endswith('*'):
+        return _prefix_restriction(key, comparator, path, text[:-1])
+
+    literal = _literal(descriptor, path, text)
+    if descriptor.cpp_type == FieldDescriptor.CPPTYPE_BOOL and comparator not in ('=', '!='):
+        raise InvalidQuery(f'Field "{path}" can only be compared with = or !=')
+
+    # Repeated fields match when any element does, as Mongo does
+    if fields[-1].repeated:
+        return {key: literal} if comparator == '=' else {key: {_OPERATORS[comparator]: literal}}
+
+    # Missing fields hold the default value, so they match whenever the default does, unless presence is tracked:
+    # proto3 scalars only track it as `optional` fields, which protobuf 3.18 describes as members of a oneof
+    matches_default = descriptor.containing_oneof is None and _EVALUATE[comparator](descriptor.default_value, literal)
+    if comparator == '=':
+        return {key: {'$in': [literal, None]}} if matches_default else {key: literal}
+    if comparator == '!=':
+        return {key: {'$ne': literal}} if matches_default else {key: {'$nin': [literal, None]}}
+
+    condition = {key: {_OPERATORS[comparator]: literal}}
+    return {'$or': [condition, {key: None}]} if matches_default else condition
+
+
+class _FilterParser:
+    """Recursive descent parser for the AIP-160 grammar, minus functions and global restrictions.
+
+    As in AIP-160, OR binds tighter than AND, and terms separated by whitespace only are ANDed.
+    """
+
+    def __init__(self, message_descriptor, text, exclude):
+        self.message_descriptor = message_descriptor
+        self.tokens = _tokenize(text)
+        self.position = 0
+        self.exclude = exclude
+
+    def parse(self):
+        if not self.tokens:
+            return {}
+
+        query = self._expression()
+        if self._peek() is not None:
+            raise InvalidQuery(f'Unexpected "{self._peek()[1]}" in filter')
+        return query
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _next(self):
+        token = self._peek()
+        if token is None:
+            raise InvalidQuery('Unexpected end of filter')
+        self.position += 1
+        return token
+
+    def _expression(self):
+        conditions = [self._factor()]
+        while self._peek() not in (None, ('paren', ')')):
+            if self._peek() == ('text', 'AND'):
+                self.position += 1
+            conditions.append(self._factor())
+        return _combine('$and', conditions)
+
+    def _factor(self):
+        conditions = [self._term()]
+        while self._peek() == ('text', 'OR'):
+            self.position += 1
+            conditions.append(self._term())
+        return _combine('$or', conditions)
+
+    def _term(self):
+        kind, text = self._next()
+
+        if (kind, text) in (('text', 'NOT'), ('text', '-')):
+            return {'$nor': [self._simple(self._next())]}
+        if kind == 'text' and text.startswith('-'):
+            return {'$nor': [self._simple(('text', text[1:]))]}
+        return self._simple((kind, text))
+
+    def _simple(self, token):
+        if token == ('paren', '('):
+            query = self._expression()
+            if self._next() != ('paren', ')'):
+                raise InvalidQuery('Unbalanced parentheses in filter')
+            return query
+
+        if token[0] != 'text' or token[1] in ('AND', 'OR', 'NOT'):
+            raise InvalidQuery(f'Expected a field name, got "{token[1]}"')
+
+        comparator = self._next()
+        if comparator[0] != 'comparator':
+            raise InvalidQuery(f'Expected a comparison after "{token[1]}"')
+
+        value = self._next()
+        if value[0] not in ('string', 'text'):
+            raise InvalidQuery(f'Expected a value after "{token[1]} {comparator[1]}"')
+
+        return _restriction(self.message_descriptor, token[1], comparator[1], value, self.exclude)
+
+
+def compile_filter(message_descriptor, text, exclude=()):
+    """Compile an AIP-160 filter on `message_descriptor` fields into a Mongo query on their BSON keys.
+
+    Fields named in `exclude` cannot be filtered on, typically because they are not stored.
+    """
+    return _FilterParser(message_descriptor, text, exclude).parse()
+
+
+def compile_order_by(message_descriptor, text, exclude=()):
+    """Compile an AIP-132 ordering into a Mongo sort, always ending with _id so the order is total"""
+    sort = []
+
+    for item in text.split(',') if text.strip() else []:
+        words = item.split()
+        if len(words) not in (1, 2) or words[1:] not in ([], ['asc'], ['desc']):
+            raise InvalidQuery(f'Invalid ordering "{item.strip()}"')
+
+        fields = _resolve(message_descriptor, words[0], exclude)
+        if fields[-1].plan is not None or any(field.repeated for field in fields):
+            raise InvalidQuery(f'Cannot order by "{words[0]}"')
+
+        key = '.'.join(field.key for field in fields)
+        if any(key == sorted_key for sorted_key, _ in sort):
+            raise InvalidQuery(f'Duplicate ordering on "{words[0]}"')
+
+        sort.append((key, -1 if words[1:] == ['desc'] else 1))
+
+    sort.append(('_id', 1))
+    return sort
+
+
+def sort_position(sort, document):
+    """Values of the sort keys of `document`, None when missing like Mongo sorts them"""
+    position = []
+
+    for key, _ in sort:
+        value = document
+        for token in key.split('.'):
+            value = value.get(token) if isinstance(value, dict) else None
+        position.append(value)
+
+    return position
+
+
+def _after(key, direction, value):
+    # Missing values sort as null, before every other value
+    if direction > 0:
+        return {key: {'$ne': None}} if value is None else {key: {'$gt': value}}
+    if value is None:
+        return None
+    return {'$or': [{key: {'$lt': value}}, {key: None}]}
+
+
+def keyset_query(sort, position):
+    """Query for the documents coming after `position` in `sort` order, as a chain of ties broken by each key"""
+    branches = []
+
+    for index, (key, direction) in enumerate(sort):
+        after = _after(key, direction, position[index])
+        if after is not None:
+            ties = [{tied_key: value} for (tied_key, _), value in zip(sort[:index], position[:index])]
+            branches.append(_combine('$and', ties + [after]))
+
+    return _combine('$or', branches)
@@ -2,8 +2,11 @@
 
 from google.protobuf.json_format import MessageToDict
 
+import pytest
+
 from avninv.serde.protobson import (
-    bson_to_protobuf, protobuf_to_bson, _flatten, _proto_mask_to_bson_mask, protobuf_to_update_document
+    FieldMaskTrie, InvalidFieldPath, bson_to_protobuf, protobuf_to_bson, _flatten, _get_plan,
+    protobuf_mask_to_projection, protobuf_to_update_document, update_document_to_pipeline
 )
 
 from avninv.serde.tests.test_protobson_pb2 import _TestMessage, _OtherTestMessage
@@ -136,6 +139,35 @@ def test_bson_to_protobuf_handles_empty_message():
     assert bson_to_protobuf({}, _TestMessage) == _TestMessage()
 
 
+def test_bson_to_protobuf_from_descriptor():
+    b1 = {'_1': True, '_2': 42}
+
+    message = bson_to_protobuf(b1, descriptor=_TestMessage._NestedTestMessage.DESCRIPTOR)
+    assert message.bool_field_1 is True
+    assert message.int64_field_2 == 42
+
+
+def test_bson_to_protobuf_preserves_empty_nested_message():
+    assert bson_to_protobuf({'_3': {}}, _TestMessage).HasField('message_field_3')
+
+
+def test_bson_to_protobuf_skips_nulls_and_unknown_keys():
+    b1 = {'_1': None, '_3': None, '_4': [None, {'_2': 42}], '_9': 'unknown', 'other': {'_1': 'x'}}
+
+    assert bson_to_protobuf(b1, _TestMessage) == _TestMessage(
+        repeated_nested_field_4=[_TestMessage._NestedTestMessage(int64_field_2=42)]
+    )
+
+
+def test_plans_are_compiled_once_per_descriptor():
+    plan = _get_plan(_TestMessage.DESCRIPTOR)
+
+    assert _get_plan(_TestMessage.DESCRIPTOR) is plan
+    assert plan.by_key['_4'].plan is _get_plan(_TestMessage._NestedTestMessage.DESCRIPTOR)
+    assert plan.by_key['_3'].plan is _get_plan(_OtherTestMessage.DESCRIPTOR)
+    assert plan.by_number[plan.id_field].name == 'id'
+
+
 def test__flatten_bson():
     bson = {
         '_4': [{'_2': 42}],
@@ -149,18 +181,32 @@ def test__flatten_bson():
     ]
 
 
-def test_fields_mask_to_field_id():
-    fields_mask = [
+def test_FieldMaskTrie_parses_paths():
+    mask = FieldMaskTrie(_TestMessage.DESCRIPTOR, [
         'string_field_1',
-        'uint64_field_2',
-        'repeated_nested_field_4.2.bool_field_1'
-    ]
+        'repeated_nested_field_4.2.bool_field_1',
+        'repeated_nested_field_4.10',
+        'repeated_nested_field_4.10.int64_field_2',
+        'message_field_3.bytes_field_2',
+        'message_field_3'
+    ], indexed=True)
+
+    assert mask.field('string_field_1').whole
+    assert mask.field('message_field_3').whole and not mask.field('message_field_3').children
+    elements = mask.field('repeated_nested_field_4').children
+    assert sorted(elements) == [2, 10]
+    assert list(elements[2].children) == ['bool_field_1'] and elements[2].children['bool_field_1'].whole
+    assert elements[10].whole and not elements[10].children
+    assert mask.field('uint64_field_2') is None
 
-    assert list(_proto_mask_to_bson_mask(_TestMessage.DESCRIPTOR, fields_mask)) == [
-        ('_1', False),
-        ('_2', False),
-        ('_4.2._1', False)
-    ]
+
+@pytest.mark.parametrize('path', [
+    'unknown', 'string_field_1.nested', 'message_field_3.unknown', 'repeated_nested_field_4.int64_field_2',
+    'repeated_nested_field_4.0.unknown', 'repeated_string_field_5.0.nested', 'repeated_string_field_5.-1', ''
+])
+def test_FieldMaskTrie_rejects_invalid_indexed_paths(path):
+    with pytest.raises(InvalidFieldPath):
+        FieldMaskTrie(_TestMessage.DESCRIPTOR, [path], indexed=True)
 
 
 def test_protobuf_to_update_document():
@@ -195,3 +241,102 @@ def test_protobuf_to_update_document():
         '$unset': {'_3': '', '_5.2': ''},
         '$pull': {'_5': None}
     }
+
+
+def test_protobuf_to_update_document_replaces_whole_fields():
+    m1 = _TestMessage(
+        message_field_3=_OtherTestMessage(sint64_field_1=-1),
+        repeated_nested_field_4=[
+            _TestMessage._NestedTestMessage(bool_field_1=True),
+            _TestMessage._NestedTestMessage(int64_field_2=42)
+        ]
+    )
+
+    fm = ['message_field_3', 'repeated_nested_field_4', 'repeated_string_field_5']
+    assert protobuf_to_update_document(m1, fm) == {
+        '$set': {'_3': {'_1': -1}, '_4': [{'_1': True}, {'_2': 42}]},
+        '$unset': {'_5': ''},
+        '$pull': {}
+    }
+    assert protobuf_to_update_document(m1, ['repeated_nested_field_4.1', 'repeated_nested_field_4.3.bool_field_1']) == {
+        '$set': {'_4.1': {'_2': 42}},
+        '$unset': {'_4.3._1': ''},
+        '$pull': {}
+    }
+
+
+def test_protobuf_to_update_document_matches_exact_indexes():
+    m1 = _TestMessage(repeated_string_field_5=[str(index) for index in range(1000)])
+
+    # Index 1 must not match the paths of indexes 10 to 19, 100 to 199...
+    assert protobuf_to_update_document(m1, ['repeated_string_field_5.1', 'repeated_string_field_5.1000']) == {
+        '$set': {'_5.1': '1'},
+        '$unset': {'_5.1000': ''},
+        '$pull': {'_5': None}
+    }
+
+
+def test_update_document_to_pipeline():
+    update = {
+        '$set': {'_1': 'alpha', '_4.0._1': True},
+        '$unset': {'_3': '', '_5.1': ''},
+        '$pull': {'_5': None}
+    }
+
+    element = {'$let': {
+        'vars': {'d1': {'$arrayElemAt': ['$_4', 0]}},
+        'in': {'$mergeObjects': ['$$d1', {'_1': {'$literal': True}}]}
+    }}
+    assert update_document_to_pipeline(update) == [
+        {'$set': {
+            '_1': {'$literal': 'alpha'},
+            '_4': {'$cond': [
+                {'$isArray': '$_4'},
+                {'$concatArrays': [
+                    {'$map': {
+                        'input': {'$range': [0, {'$size': '$_4'}]},
+                        'as': 'i0',
+                        'in': {'$switch': {
+                            'branches': [{'case': {'$eq': ['$$i0', 0]}, 'then': element}],
+                            'default': {'$arrayElemAt': ['$_4', '$$i0']}
+                        }}
+                    }},
+                    {'$cond': [{'$lt': [0, {'$size': '$_4'}]}, [], [element]]}
+                ]},
+                '$_4'
+            ]},
+            '_5': {'$cond': [
+                {'$isArray': '$_5'},
+                {'$map': {
+                    'input': {'$filter': {
+                        'input': {'$range': [0, {'$size': '$_5'}]},
+                        'cond': {'$not': [{'$in': ['$$this', [1]]}]}
+                    }},
+                    'as': 'i0',
+                    'in': {'$arrayElemAt': ['$_5', '$$i0']}
+                }},
+                '$_5'
+            ]}
+        }},
+        {'$unset': ['_3']}
+    ]
+
+
+def test_protobuf_mask_to_projection():
+    projection = protobuf_mask_to_projection(_TestMessage.DESCRIPTOR, [
+        'uint64_field_2',
+        'message_field_3.bytes_field_2',
+        'repeated_nested_field_4.int64_field_2',
+        'repeated_string_field_5',
+        'message_field_3'
+    ])
+
+    assert projection == {'_2': 1, '_3': 1, '_4._2': 1, '_5': 1}
+
+
+@pytest.mark.parametrize('path', [
+    'unknown', 'uint64_field_2.nested', 'message_field_3.unknown', 'repeated_string_field_5.0'
+])
+def test_protobuf_mask_to_projection_rejects_invalid_paths(path):
+    with pytest.raises(InvalidFieldPath):
+        protobuf_mask_to_projection(_TestMessage.DESCRIPTOR, [path])
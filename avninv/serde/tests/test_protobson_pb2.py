@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# Generated by the protocol buffer compiler.  DO NOT EDIT!
+# source: avninv/serde/tests/test_protobson.proto
+"""Generated protocol buffer code."""
+from google.protobuf import descriptor as _descriptor
+from google.protobuf import descriptor_pool as _descriptor_pool
+from google.protobuf import symbol_database as _symbol_database
+from google.protobuf.internal import builder as _builder
+# @@protoc_insertion_point(imports)
+
+_sym_db = _symbol_database.Default()
+
+
+
+
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\'avninv/serde/tests/test_protobson.proto\x12\x11\x61vninv.serde.test\"B\n\x11_OtherTestMessage\x12\x16\n\x0esint64_field_1\x18\x01 \x01(\x12\x12\x15\n\rbytes_field_2\x18\x02 \x01(\x0c\"\xc2\x02\n\x0c_TestMessage\x12\x16\n\x0estring_field_1\x18\x01 \x01(\t\x12\x16\n\x0euint64_field_2\x18\x02 \x01(\x04\x12=\n\x0fmessage_field_3\x18\x03 \x01(\x0b\x32$.avninv.serde.test._OtherTestMessage\x12S\n\x17repeated_nested_field_4\x18\x04 \x03(\x0b\x32\x32.avninv.serde.test._TestMessage._NestedTestMessage\x12\x1f\n\x17repeated_string_field_5\x18\x05 \x03(\t\x12\n\n\x02id\x18\n \x01(\t\x1a\x41\n\x12_NestedTestMessage\x12\x14\n\x0c\x62ool_field_1\x18\x01 \x01(\x08\x12\x15\n\rint64_field_2\x18\x02 \x01(\x03\x62\x06proto3')
+
+_globals = globals()
+_builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
+_builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'avninv.serde.tests.test_protobson_pb2', _globals)
+if _descriptor._USE_C_DESCRIPTORS == False:
+
+  DESCRIPTOR._options = None
+  _globals['__OTHERTESTMESSAGE']._serialized_start=62
+  _globals['__OTHERTESTMESSAGE']._serialized_end=128
+  _globals['__TESTMESSAGE']._serialized_start=131
+  _globals['__TESTMESSAGE']._serialized_end=453
+  _globals['__TESTMESSAGE__NESTEDTESTMESSAGE']._serialized_start=388
+  _globals['__TESTMESSAGE__NESTEDTESTMESSAGE']._serialized_end=453
+# @@protoc_insertion_point(module_scope)
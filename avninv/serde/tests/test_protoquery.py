@@ -0,0 +1,83 @@
+"""Test for the AIP-160 filter and AIP-132 ordering compiler"""
+
+import pytest
+
+from avninv.serde.protoquery import InvalidQuery, compile_filter, compile_order_by, keyset_query, sort_position
+
+from avninv.serde.tests.test_protobson_pb2 import _TestMessage
+
+
+@pytest.mark.parametrize('text,query', [
+    ('', {}),
+    ('string_field_1 = "alpha"', {'_1': 'alpha'}),
+    ('string_field_1 = alpha*', {'_1': {'$regex': '^alpha'}}),
+    ('string_field_1 != ""', {'_1': {'$nin': ['', None]}}),
+    ('uint64_field_2 > 10', {'_2': {'$gt': 10}}),
+    ('uint64_field_2 < 10', {'$or': [{'_2': {'$lt': 10}}, {'_2': None}]}),
+    ('uint64_field_2 = 0', {'_2': {'$in': [0, None]}}),
+    ('message_field_3:*', {'_3': {'$ne': None}}),
+    ('message_field_3.sint64_field_1 >= -5', {'$or': [{'_3._1': {'$gte': -5}}, {'_3._1': None}]}),
+    ('repeated_nested_field_4.bool_field_1:true', {'_4._1': True}),
+    ('repeated_string_field_5:beta', {'_5': 'beta'}),
+    ('NOT string_field_1 = a', {'$nor': [{'_1': 'a'}]}),
+    ('-string_field_1 = a', {'$nor': [{'_1': 'a'}]}),
+    ('string_field_1 = a uint64_field_2 > 1', {'$and': [{'_1': 'a'}, {'_2': {'$gt': 1}}]}),
+    (
+        'string_field_1 = a AND uint64_field_2 > 1 OR uint64_field_2 > 5',
+        {'$and': [{'_1': 'a'}, {'$or': [{'_2': {'$gt': 1}}, {'_2': {'$gt': 5}}]}]}
+    ),
+    (
+        '(string_field_1 = a AND uint64_field_2 > 1) OR string_field_1 = "b c"',
+        {'$or': [{'$and': [{'_1': 'a'}, {'_2': {'$gt': 1}}]}, {'_1': 'b c'}]}
+    ),
+])
+def test_compile_filter(text, query):
+    assert compile_filter(_TestMessage.DESCRIPTOR, text) == query
+
+
+@pytest.mark.parametrize('text', [
+    'unknown = 1',
+    'uint64_field_2 = -1',
+    'uint64_field_2 = abc',
+    'message_field_3 = 1',
+    'repeated_nested_field_4.bool_field_1 > true',
+    'string_field_1 = a*b*',
+    'string_field_1 > a*',
+    'string_field_1 =',
+    '(string_field_1 = a',
+    'string_field_1 = a)',
+    'string_field_1',
+    'string_field_1 ! a',
+    'id = a'
+])
+def test_compile_filter_rejects_invalid_filters(text):
+    with pytest.raises(InvalidQuery):
+        compile_filter(_TestMessage.DESCRIPTOR, text, exclude=('id',))
+
+
+def test_compile_order_by():
+    assert compile_order_by(_TestMessage.DESCRIPTOR, '') == [('_id', 1)]
+    assert compile_order_by(_TestMessage.DESCRIPTOR, 'uint64_field_2 desc, message_field_3.sint64_field_1') == [
+        ('_2', -1), ('_3._1', 1), ('_id', 1)
+    ]
+
+
+@pytest.mark.parametrize('text', [
+    'unknown', 'message_field_3', 'repeated_string_field_5', 'repeated_nested_field_4.bool_field_1',
+    'uint64_field_2 down', 'uint64_field_2, uint64_field_2', 'uint64_field_2,'
+])
+def test_compile_order_by_rejects_invalid_orderings(text):
+    with pytest.raises(InvalidQuery):
+        compile_order_by(_TestMessage.DESCRIPTOR, text)
+
+
+def test_keyset_query():
+    sort = [('_2', -1), ('_3._1', 1), ('_id', 1)]
+    position = sort_position(sort, {'_id': 7, '_2': 5})
+
+    assert position == [5, None, 7]
+    assert keyset_query(sort, position) == {'$or': [
+        {'$or': [{'_2': {'$lt': 5}}, {'_2': None}]},
+        {'$and': [{'_2': 5}, {'_3._1': {'$ne': None}}]},
+        {'$and': [{'_2': 5}, {'_3._1': None}, {'_id': {'$gt': 7}}]}
+    ]}
@@ -0,0 +1,2 @@
+"""Benchmarks, run as modules: protobson (conversions), rpc (end-to-end service load) and search_parts (SearchParts
+against growing catalogs). Each takes --output to save its results as JSON, which `benchmarks.compare` diffs."""
@@ -0,0 +1,51 @@
+"""Compare two result files of the same benchmark suite, e.g. measured on two commits
+
+    python -m benchmarks.compare before.json after.json
+
+Prints every timing present in both files, with the relative change from the first to the second.
+"""
+
+import argparse
+import json
+
+
+# Metrics where lower is better; the others, like throughput, are better higher
+_TIMINGS = ('_us', '_ms')
+
+
+def _metrics(results, prefix=''):
+    for key, value in sorted(results.items()):
+        if isinstance(value, dict):
+            yield from _metrics(value, f'{prefix}{key}/')
+        elif isinstance(value, (int, float)) and (key.endswith(_TIMINGS) or key == 'rps'):
+            yield f'{prefix}{key}', value
+
+
+def compare(before, after):
+    after_metrics = dict(_metrics(after['results']))
+    for name, value in _metrics(before['results']):
+        if name in after_metrics and value:
+            yield name, value, after_metrics[name], after_metrics[name] / value - 1
+
+
+def main(args):
+    before, after = (json.load(open(path)) for path in (args.before, args.after))
+    if before['suite'] != after['suite']:
+        print(f'Cannot compare results of {before["suite"]} with results of {after["suite"]}')
+        return -1
+
+    print(f'{before["suite"]}: {before.get("commit")} -> {after.get("commit")}')
+    for name, old, new, change in compare(before, after):
+        flag = ''
+        if abs(change) >= args.threshold:
+            better = change < 0 if name.endswith(_TIMINGS) else change > 0
+            flag = 'better' if better else 'WORSE'
+        print(f'{name:<72} {old:>12.2f} {new:>12.2f} {change:>+8.1%} {flag}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--threshold', type=float, default=0.05, help='relative change flagged as a difference')
+    exit(main(parser.parse_args()) or 0)
@@ -0,0 +1,103 @@
+"""Microbenchmarks of the protobson conversions on realistic Part shapes
+
+    python -m benchmarks.protobson --output protobson.json
+
+Each case is timed with timeit: calls are batched until a batch takes at least 0.2s, and the best and median
+per call times of `--repeat` batches are reported, in microseconds.
+"""
+
+import argparse
+import statistics
+import timeit
+
+from avninv.catalog.v1.catalog_pb2 import Part, PartAttribute, PartSupplier
+from avninv.serde.protobson import bson_to_protobuf, protobuf_to_bson, protobuf_to_update_document
+from benchmarks import results
+
+
+# (attributes, suppliers): from a bare part to a fully characterized one sold everywhere
+SHAPES = [(0, 0), (10, 2), (50, 5), (200, 20), (20, 100)]
+# Paths in the update masks of a 1000 attribute part: the time per path should stay flat as masks grow
+MASK_SIZES = [10, 100, 1000]
+
+
+def make_part(attributes, suppliers):
+    return Part(
+        manufacturer_part_number='RC0402FR-0710KL',
+        schema_name='resistor',
+        description='RES 10K OHM 1% 1/16W 0402',
+        quantity=1200,
+        attributes=[
+            PartAttribute(attribute=f'Attribute {index}', unit='Ohms', numeric_value=index * 1.5, value=f'{index}k')
+            if index % 2 else PartAttribute(attribute=f'Attribute {index}', value=f'value {index}')
+            for index in range(attributes)
+        ],
+        suppliers=[
+            PartSupplier(
+                supplier=f'supplier{index}', supplier_part_number=f'SUP-{index:06d}',
+                url=f'https://supplier{index}.example.com/parts/SUP-{index:06d}'
+            )
+            for index in range(suppliers)
+        ]
+    )
+
+
+def update_masks(attributes, suppliers):
+    """Update masks from a couple of scalar fields to fields deep inside every element of the repeated fields"""
+    masks = {'scalars': ['description', 'quantity']}
+    if attributes:
+        masks['attribute_values'] = [f'attributes.{index}.numeric_value' for index in range(attributes)]
+        masks['attributes_deep'] = [
+            f'attributes.{index}.{field}' for index in range(attributes) for field in ('attribute', 'unit', 'value')
+        ]
+    if suppliers:
+        masks['supplier_urls'] = [f'suppliers.{index}.url' for index in range(suppliers)]
+    return masks
+
+
+def cases():
+    for attributes, suppliers in SHAPES:
+        part = make_part(attributes, suppliers)
+        bson = protobuf_to_bson(part)
+        shape = f'{attributes}a{suppliers}s'
+
+        yield f'protobuf_to_bson/{shape}', lambda part=part: protobuf_to_bson(part)
+        yield f'bson_to_protobuf/{shape}', lambda bson=bson: bson_to_protobuf(bson, Part)
+        for name, mask in update_masks(attributes, suppliers).items():
+            yield f'protobuf_to_update_document/{shape}/{name}', \
+                lambda part=part, mask=mask: protobuf_to_update_document(part, mask)
+
+    part = make_part(max(MASK_SIZES), 0)
+    for size in MASK_SIZES:
+        mask = [f'attributes.{index}.numeric_value' for index in range(size)]
+        yield f'update_mask_scaling/{size}', lambda part=part, mask=mask: protobuf_to_update_document(part, mask)
+
+
+def measure(function, repeat):
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    times = [elapsed / number * 1e6 for elapsed in timer.repeat(repeat=repeat, number=number)]
+    return {'best_us': min(times), 'median_us': statistics.median(times), 'calls': number * repeat}
+
+
+def main(args):
+    measured = {}
+
+    print(f'{"case":<60} {"best us":>10} {"median us":>10}')
+    for name, function in cases():
+        if args.filter and args.filter not in name:
+            continue
+
+        measured[name] = result = measure(function, args.repeat)
+        print(f'{name:<60} {result["best_us"]:>10.2f} {result["median_us"]:>10.2f}')
+
+    if args.output:
+        results.save(args.output, 'protobson', {'repeat': args.repeat}, measured)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--repeat', type=int, default=5, help='batches timed per case')
+    parser.add_argument('--filter', help='only run the cases whose name contains this')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    main(parser.parse_args())
@@ -0,0 +1,53 @@
+"""Latency summaries and JSON results shared by the benchmarks"""
+
+import datetime
+import json
+import platform
+import subprocess
+
+
+def percentile(latencies, fraction):
+    """Value at `fraction` of sorted `latencies`"""
+    return latencies[min(len(latencies) - 1, int(len(latencies) * fraction))]
+
+
+def summarize(latencies, seconds=None):
+    """p50/p99/max of latencies in milliseconds, and the rate they were recorded at over `seconds`"""
+    latencies = sorted(latencies)
+    if not latencies:
+        return {'count': 0}
+
+    summary = {
+        'count': len(latencies),
+        'p50_ms': percentile(latencies, 0.5),
+        'p99_ms': percentile(latencies, 0.99),
+        'max_ms': latencies[-1]
+    }
+    if seconds:
+        summary['rps'] = len(latencies) / seconds
+    return summary
+
+
+def _commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save(path, suite, parameters, results):
+    """Write `results` to `path` along with what they were measured on, so runs of several commits can be compared"""
+    document = {
+        'suite': suite,
+        'commit': _commit(),
+        'time': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'parameters': parameters,
+        'results': results
+    }
+
+    with open(path, 'w') as output:
+        json.dump(document, output, indent=2, sort_keys=True)
@@ -0,0 +1,243 @@
+"""End-to-end load on the catalog gRPC service, served in-process
+
+Starts a CatalogService (or AsyncCatalogService with --async) on a local port against the configured mongod,
+seeds a scratch collection, then drives a mix of RPCs from concurrent clients and reports latencies and
+throughput per RPC:
+
+    python -m benchmarks.rpc -c etc/config.yaml --duration 10 --concurrency 8 --output rpc.json
+
+With --memory, the service runs against mongomock instead of mongod (sync only, with benchmarks/requirements.txt
+installed): figures then measure the service code rather than the database.
+"""
+
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import random
+import threading
+import time
+import uuid
+
+from google.protobuf.field_mask_pb2 import FieldMask
+import grpc
+import pymongo
+import yaml
+
+from avninv.catalog.async_catalog import AsyncCatalogService
+from avninv.catalog.catalog import CatalogService
+from avninv.catalog.database import DatabaseConfig
+from avninv.catalog.indexes import index_models, reconcile_indexes
+from avninv.catalog.v1.catalog_pb2 import (
+    AdjustQuantityRequest, AttributePredicate, BatchCreatePartsRequest, CreatePartRequest, GetPartRequest,
+    ListPartRequest, Part, SearchPartsRequest, UpdatePartRequest
+)
+from avninv.catalog.v1.catalog_pb2_grpc import CatalogStub, add_CatalogServicer_to_server
+from benchmarks import results
+from benchmarks.protobson import make_part
+
+
+PARENT = 'orgs/main/parts'
+DEFAULT_MIX = 'GetPart=50,ListParts=15,SearchParts=10,UpdatePart=15,CreatePart=10'
+
+
+def _get(stub, rng, names):
+    stub.GetPart(GetPartRequest(name=rng.choice(names)))
+
+
+def _list(stub, rng, names):
+    stub.ListParts(ListPartRequest(parent=PARENT, page_size=50))
+
+
+def _search(stub, rng, names):
+    attribute = rng.randrange(1, 20, 2)
+    stub.SearchParts(SearchPartsRequest(parent=PARENT, predicates=[
+        AttributePredicate(attribute=f'Attribute {attribute}', unit='Ohms', min_value=0, max_value=attribute * 2)
+    ]))
+
+
+def _update(stub, rng, names):
+    stub.UpdatePart(UpdatePartRequest(
+        name=rng.choice(names), part=Part(quantity=rng.randrange(1000)), update_mask=FieldMask(paths=['quantity'])
+    ))
+
+
+def _adjust(stub, rng, names):
+    # Takes stock out as often as it puts it back: movements that would go below zero count as FAILED_PRECONDITION
+    stub.AdjustQuantity(AdjustQuantityRequest(name=rng.choice(names), delta=rng.randint(-10, 10)))
+
+
+def _create(stub, rng, names):
+    stub.CreatePart(CreatePartRequest(parent=PARENT, part=make_part(20, 2)))
+
+
+RPCS = {
+    'GetPart': _get, 'ListParts': _list, 'SearchParts': _search, 'UpdatePart': _update, 'AdjustQuantity': _adjust,
+    'CreatePart': _create
+}
+
+
+def parse_mix(text):
+    mix = {}
+    for item in text.split(','):
+        rpc, _, weight = item.partition('=')
+        if rpc not in RPCS:
+            raise ValueError(f'Unknown RPC "{rpc}", expected one of {", ".join(RPCS)}')
+        mix[rpc] = float(weight or 1)
+    return mix
+
+
+class _AsyncServer:
+    """grpc.aio server running an AsyncCatalogService in its own event loop thread"""
+
+    def __init__(self, database_config, database, collection):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+        self.server, self.port = self._run(self._start(database_config, database, collection))
+
+    def _run(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    async def _start(self, database_config, database, collection):
+        import motor.motor_asyncio
+
+        client = motor.motor_asyncio.AsyncIOMotorClient(database_config.uri, **database_config.client_options())
+        server = grpc.aio.server()
+        database = client[database]
+        service = AsyncCatalogService(database[collection], schemas=database[f'{collection}-schemas'])
+        add_CatalogServicer_to_server(service, server)
+        port = server.add_insecure_port('127.0.0.1:0')
+        await server.start()
+        return server, port
+
+    def stop(self):
+        self._run(self.server.stop(0))
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+
+class _Server:
+    def __init__(self, database, collection, workers):
+        self.server = grpc.server(concurrent.futures.ThreadPoolExecutor(max_workers=workers))
+        service = CatalogService(database[collection], schemas=database[f'{collection}-schemas'])
+        add_CatalogServicer_to_server(service, self.server)
+        self.port = self.server.add_insecure_port('127.0.0.1:0')
+        self.server.start()
+
+    def stop(self):
+        self.server.stop(0)
+
+
+def _client(args, database_config):
+    if not args.memory:
+        return pymongo.MongoClient(database_config.uri, **database_config.client_options(args.concurrency))
+
+    try:
+        import mongomock
+    except ImportError:
+        raise SystemExit('--memory needs mongomock: pip install -r benchmarks/requirements.txt')
+    return mongomock.MongoClient()
+
+
+def seed(stub, parts, batch_size=500):
+    names = []
+    for offset in range(0, parts, batch_size):
+        response = stub.BatchCreateParts(BatchCreatePartsRequest(parent=PARENT, requests=[
+            CreatePartRequest(part=make_part(20, 2)) for _ in range(min(batch_size, parts - offset))
+        ]))
+        names += [result.part.name for result in response.results]
+    return names
+
+
+def drive(stub, names, mix, concurrency, duration, seed):
+    """Issue RPCs drawn from `mix` from `concurrency` threads for `duration` seconds"""
+    latencies = collections.defaultdict(list)
+    errors = collections.Counter()
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def run(index):
+        rng = random.Random(seed + index)
+        rpcs, weights = zip(*mix.items())
+        local, failed = collections.defaultdict(list), collections.Counter()
+
+        while time.monotonic() < deadline:
+            rpc = rng.choices(rpcs, weights)[0]
+            start = time.perf_counter()
+            try:
+                RPCS[rpc](stub, rng, names)
+                local[rpc].append((time.perf_counter() - start) * 1e3)
+            except grpc.RpcError as err:
+                failed[f'{rpc}/{err.code().name}'] += 1
+
+        with lock:
+            for rpc, values in local.items():
+                latencies[rpc] += values
+            errors.update(failed)
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return latencies, errors
+
+
+def main(args):
+    config = yaml.load(open(args.config, 'r'), Loader=yaml.CLoader)
+    mix = parse_mix(args.mix)
+    if args.memory and args.use_async:
+        raise SystemExit('--memory only runs the sync service')
+
+    database_config = DatabaseConfig.from_config(config.get('database'))
+    client = _client(args, database_config)
+    database, collection = 'catalog-bench', f'rpc-{uuid.uuid4()}'
+    reconcile_indexes(client[database][collection], index_models((config.get('catalog') or {}).get('indexes')))
+
+    if args.use_async:
+        server = _AsyncServer(database_config, database, collection)
+    else:
+        server = _Server(client[database], collection, args.concurrency)
+
+    try:
+        stub = CatalogStub(grpc.insecure_channel(f'127.0.0.1:{server.port}'))
+        names = seed(stub, args.parts)
+
+        latencies, errors = drive(stub, names, mix, args.concurrency, args.duration, args.seed)
+    finally:
+        server.stop()
+        if not args.keep:
+            client[database].drop_collection(collection)
+            client[database].drop_collection(f'{collection}-schemas')
+
+    measured = {rpc: results.summarize(values, args.duration) for rpc, values in sorted(latencies.items())}
+    print(f'{"rpc":<12} {"count":>8} {"rps":>8} {"p50 ms":>8} {"p99 ms":>8}')
+    for rpc, summary in measured.items():
+        print(f'{rpc:<12} {summary["count"]:>8} {summary["rps"]:>8.1f} {summary["p50_ms"]:>8.2f} '
+              f'{summary["p99_ms"]:>8.2f}')
+    for error, count in sorted(errors.items()):
+        print(f'{error}: {count} errors')
+
+    if args.output:
+        parameters = {
+            'mode': 'async' if args.use_async else 'sync', 'database': 'memory' if args.memory else 'mongod',
+            'parts': args.parts, 'concurrency': args.concurrency, 'duration': args.duration, 'mix': mix
+        }
+        results.save(args.output, 'rpc', parameters, {'rpcs': measured, 'errors': dict(errors)})
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-c', '--config', required=True)
+    parser.add_argument('--async', dest='use_async', action='store_true', help='serve with grpc.aio and motor')
+    parser.add_argument('--memory', action='store_true', help='run against mongomock instead of mongod')
+    parser.add_argument('--parts', type=int, default=10000, help='parts seeded before the load starts')
+    parser.add_argument('--concurrency', type=int, default=8, help='client threads issuing RPCs')
+    parser.add_argument('--duration', type=float, default=10, help='seconds of load')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='weights of the RPCs issued, e.g. GetPart=3,ListParts=1')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--keep', action='store_true', help='keep the seeded collection')
+    main(parser.parse_args())
@@ -0,0 +1,133 @@
+"""SearchParts latency as the catalog grows
+
+Seeds a scratch collection with synthetic parts up to each size, declares the indexes configured in
+`catalog.indexes`, and times the query SearchParts runs for random range predicates:
+
+    python -m benchmarks.search_parts -c etc/config.yaml --sizes 10000,100000,1000000 --output search.json
+
+Examined keys and documents are reported alongside latencies: with the attribute index in place they
+track the number of matching parts, not the size of the catalog.
+"""
+
+import argparse
+import math
+import random
+import time
+import uuid
+
+import pymongo
+import yaml
+
+from avninv.catalog.catalog import DEFAULT_PAGE_SIZE
+from avninv.catalog.database import DatabaseConfig
+from avninv.catalog.indexes import index_models, reconcile_indexes, summarize_explain
+from avninv.catalog.parts_collection import PartCollection
+from avninv.catalog.v1.catalog_pb2 import AttributePredicate, Part, PartAttribute
+from avninv.serde.protobson import protobuf_to_bson
+from benchmarks import results
+
+
+# Attribute, unit and range of the values, drawn log-uniformly like component values are spread
+KINDS = [
+    ('Resistance', 'Ohms', 1, 1e7),
+    ('Capacitance', 'F', 1e-12, 1e-3),
+    ('Inductance', 'H', 1e-9, 1),
+    ('Voltage', 'V', 1, 1e3),
+    ('Power', 'W', 1e-2, 1e2)
+]
+
+SEARCH_INDEX = {'fields': ['attributes.attribute', 'attributes.unit', 'attributes.numeric_value']}
+
+
+def _log_uniform(rng, low, high):
+    return math.exp(rng.uniform(math.log(low), math.log(high)))
+
+
+def _part(rng, index):
+    kinds = rng.sample(KINDS, 3)
+    return Part(
+        manufacturer_part_number=f'MPN{index:08d}',
+        schema_name=kinds[0][0].lower(),
+        quantity=rng.randrange(1000),
+        attributes=[
+            PartAttribute(attribute=attribute, unit=unit, numeric_value=_log_uniform(rng, low, high))
+            for attribute, unit, low, high in kinds
+        ]
+    )
+
+
+def _seed(collection, rng, start, stop, batch_size=10000):
+    for offset in range(start, stop, batch_size):
+        bsons = [protobuf_to_bson(_part(rng, index)) for index in range(offset, min(offset + batch_size, stop))]
+        collection.insert_many(bsons, ordered=False)
+
+
+def _predicate(rng, window):
+    attribute, unit, low, high = rng.choice(KINDS)
+    center = _log_uniform(rng, low, high)
+    return AttributePredicate(
+        attribute=attribute, unit=unit, min_value=center * (1 - window), max_value=center * (1 + window)
+    )
+
+
+def measure(parts, rng, queries, window):
+    latencies = []
+    for _ in range(queries):
+        predicates = [_predicate(rng, window)]
+        start = time.perf_counter()
+        parts.search_page(DEFAULT_PAGE_SIZE, predicates)
+        latencies.append((time.perf_counter() - start) * 1e3)
+
+    latencies.sort()
+    explanation = parts.collection.list(
+        limit=DEFAULT_PAGE_SIZE + 1, query=parts._search_query(predicates)
+    ).explain()
+
+    return {
+        'p50_ms': results.percentile(latencies, 0.5),
+        'p99_ms': results.percentile(latencies, 0.99),
+        **summarize_explain(explanation)
+    }
+
+
+def main(args):
+    config = yaml.load(open(args.config, 'r'), Loader=yaml.CLoader)
+    database_config = DatabaseConfig.from_config(config.get('database'))
+    client = pymongo.MongoClient(database_config.uri, **database_config.client_options())
+    collection = client['catalog-bench'][f'parts-{uuid.uuid4()}']
+    rng = random.Random(args.seed)
+
+    spec = (config.get('catalog') or {}).get('indexes') or [SEARCH_INDEX]
+    reconcile_indexes(collection, index_models(spec))
+    parts = PartCollection(collection)
+
+    measured = {}
+    try:
+        size = 0
+        print(f'{"parts":>10} {"p50 ms":>8} {"p99 ms":>8} {"keys":>8} {"docs":>8}  plan')
+        for target in sorted(int(size) for size in args.sizes.split(',')):
+            _seed(collection, rng, size, target)
+            size = target
+
+            measured[str(size)] = result = measure(parts, rng, args.queries, args.window)
+            print(f'{size:>10} {result["p50_ms"]:>8.2f} {result["p99_ms"]:>8.2f} {result["keys_examined"]:>8} '
+                  f'{result["docs_examined"]:>8}  {result["plan"]}')
+    finally:
+        if not args.keep:
+            collection.drop()
+
+    if args.output:
+        parameters = {'queries': args.queries, 'window': args.window, 'seed': args.seed}
+        results.save(args.output, 'search_parts', parameters, measured)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-c', '--config', required=True)
+    parser.add_argument('--sizes', default='1000,10000,100000,1000000', help='comma separated catalog sizes')
+    parser.add_argument('--queries', type=int, default=200, help='searches timed at each size')
+    parser.add_argument('--window', type=float, default=0.05, help='relative half width of the searched ranges')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--keep', action='store_true', help='keep the seeded collection')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    main(parser.parse_args())